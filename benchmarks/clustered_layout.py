@@ -0,0 +1,165 @@
+"""
+Benchmark del layout clusterizado de los Parquet de procesados.
+
+Genera un lote sintético, lo procesa con el layout por defecto (orden de
+llegada) y con el layout clusterizado de la configuración, y ejecuta
+consultas típicas con el LakehouseReader sobre un S3 en memoria para
+comparar cuántos row groups se leen y cuántos se descartan.
+
+Uso (desde la raíz del repositorio):
+
+    PYTHONPATH=src python benchmarks/clustered_layout.py --rows 200000
+"""
+
+import argparse
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from processors.batch_processor import BatchProcessor, OutputLayout
+from services.lakehouse_reader import LakehouseReader, RowFilter
+from services.s3_service import S3ObjectInfo
+from utils.disk_cache import DiskCache
+
+BARRIOS = [
+    "Palermo",
+    "Recoleta",
+    "San Telmo",
+    "Belgrano",
+    "Puerto Madero",
+    "Retiro",
+    "Almagro",
+    "Balvanera",
+]
+INGESTION_DATE = date(2026, 2, 16)
+PARTITION_KEY = "processed/ingestion_date=2026-02-16/lote.parquet"
+
+
+class InMemoryS3:
+    """S3 en memoria con las operaciones que usa el LakehouseReader."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.range_requests = 0
+        self.bytes_read = 0
+
+    def list_objects_metadata(self, bucket: str, prefix: str) -> list[S3ObjectInfo]:
+        return [
+            S3ObjectInfo(key=key, size=len(body), etag=f'"{id(body)}"')
+            for key, body in self.objects.items()
+            if key.startswith(prefix)
+        ]
+
+    def get_object_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        self.range_requests += 1
+        self.bytes_read += length
+        return self.objects[key][start : start + length]
+
+
+def generate_batch(rows: int, seed: int = 7) -> pd.DataFrame:
+    """Genera un lote crudo sintético con el formato del scraper."""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(rows):
+        # Cada hotel tiene un barrio fijo y aparece con varias fechas de estadía
+        hotel = rng.randrange(rows // 5 or 1)
+        barrio = BARRIOS[hotel % len(BARRIOS)]
+        checkin = INGESTION_DATE + timedelta(days=rng.randint(0, 90))
+        noches = rng.randint(1, 7)
+        precio_final = float(rng.randint(20_000, 400_000) * noches)
+        records.append(
+            {
+                "nombre_hotel": f"Hotel {hotel:06d}",
+                "ubicacion": f"{barrio}, Buenos Aires",
+                "checkin_date": checkin.isoformat(),
+                "checkout_date": (checkin + timedelta(days=noches)).isoformat(),
+                "precio_inicial": precio_final * 0.8,
+                "precio_impuesto": precio_final * 0.2,
+                "precio_final": precio_final,
+                "calificacion": "Muy bueno",
+                "puntaje": str(round(rng.uniform(5, 10), 1)),
+                "cantidad_reviews": str(rng.randint(0, 2000)),
+                # Identificadores no correlacionados con el número de hotel
+                "link_detalle": "https://www.booking.com/hotel/ar/"
+                f"h{hotel * 7919 % 1_000_003:07d}.html",
+            }
+        )
+    return pd.DataFrame(records)
+
+
+def run_query(
+    parquet: bytes,
+    filters: list[RowFilter],
+    columns: Optional[list[str]] = None,
+) -> dict[str, int]:
+    """Ejecuta una consulta sobre un archivo y devuelve sus métricas de lectura."""
+    s3 = InMemoryS3()
+    s3.objects[PARTITION_KEY] = parquet
+    with tempfile.TemporaryDirectory() as cache_dir:
+        reader = LakehouseReader(s3, "bench", cache=DiskCache(cache_dir, 10**9))
+        result = reader.read(INGESTION_DATE, INGESTION_DATE, columns, filters)
+    return {
+        "filas": len(result),
+        "leidos": reader.row_groups_read,
+        "descartados": reader.row_groups_skipped,
+        "por_bloom": reader.bloom_filter_skips,
+        "bytes_leidos": s3.bytes_read,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    raw = generate_batch(args.rows)
+    clustered = OutputLayout.from_settings()
+    layouts = {
+        # Mismo tamaño de row group, para aislar el efecto del orden
+        "orden de llegada": BatchProcessor(
+            layout=OutputLayout(row_group_rows=clustered.row_group_rows)
+        ),
+        "clusterizado": BatchProcessor(layout=clustered),
+    }
+    outputs = {
+        name: processor.process([raw], INGESTION_DATE).processed
+        for name, processor in layouts.items()
+    }
+
+    hotels = raw.drop_duplicates("nombre_hotel").iloc[[10, 20]]
+    queries: dict[str, list[RowFilter]] = {
+        "barrio == Recoleta": [("barrio", "==", "Recoleta")],
+        "barrio == Retiro y checkin en 7 días": [
+            ("barrio", "==", "Retiro"),
+            ("checkin_date", ">=", date(2026, 3, 1)),
+            ("checkin_date", "<", date(2026, 3, 8)),
+        ],
+        "link_detalle == <un hotel>": [
+            ("link_detalle", "==", hotels["link_detalle"].iloc[0])
+        ],
+        "nombre_hotel in <dos hoteles>": [
+            ("nombre_hotel", "in", hotels["nombre_hotel"].tolist())
+        ],
+    }
+
+    print(f"Lote sintético: {args.rows} filas")
+    for name, parquet in outputs.items():
+        print(f"\n== Layout: {name} ({len(parquet) / 1024 / 1024:.1f} MiB)")
+        print(
+            f"{'consulta':<40}{'filas':>8}{'leídos':>9}"
+            f"{'descart.':>10}{'bloom':>7}{'MiB leídos':>12}"
+        )
+        for query, filters in queries.items():
+            metrics = run_query(parquet, filters, columns=["nombre_hotel", "barrio"])
+            print(
+                f"{query:<40}{metrics['filas']:>8}{metrics['leidos']:>9}"
+                f"{metrics['descartados']:>10}{metrics['por_bloom']:>7}"
+                f"{metrics['bytes_leidos'] / 1024 / 1024:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
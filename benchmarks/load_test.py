@@ -0,0 +1,394 @@
+"""
+Prueba de carga de `lambda_handler` ante ráfagas de lotes concurrentes.
+
+Simula que el scraper deposita muchos directorios de ingesta a la vez:
+genera los CSVs de cada lote en un S3 en proceso (con latencia inyectable),
+invoca `lambda_handler` concurrentemente con un evento por lote y reporta
+throughput, latencia por lote (p50/p95/p99), cantidad de requests a S3
+por operación y memoria pico. Como en un contenedor "caliente", todas las
+invocaciones comparten el mismo S3Service.
+
+Los resultados se guardan como JSON en `benchmarks/results/` identificados
+por la revisión de git, y `--compare` muestra las diferencias contra un
+resultado anterior.
+
+Uso (desde la raíz del repositorio):
+
+    PYTHONPATH=src python benchmarks/load_test.py --batches 48 --concurrency 16 \\
+        --latency-ms 20 --compare benchmarks/results/<anterior>.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Optional
+
+import pyarrow as pa
+from botocore.exceptions import ClientError
+
+import lambda_function
+from config import settings
+from services.s3_service import S3Service
+from utils.disk_cache import DiskCache
+
+BUCKET = "load-test"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BARRIOS = ["Palermo", "Recoleta", "San Telmo", "Belgrano", "Retiro", "Almagro"]
+
+
+class InProcessS3Client:
+    """
+    Sustituto en memoria del cliente de boto3 para S3.
+
+    Implementa las operaciones que usa S3Service, con las mismas
+    respuestas y errores (NoSuchKey, 304, PreconditionFailed), escrituras
+    condicionales atómicas y una latencia configurable por request.
+    """
+
+    def __init__(
+        self, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0
+    ) -> None:
+        self._objects: dict[tuple[str, str], tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+        self._latency = latency_ms / 1000
+        self._jitter = jitter_ms / 1000
+        self._random = random.Random(seed)
+        self._versions = 0
+        self.requests: Counter[str] = Counter()
+
+    def _request(self, operation: str) -> None:
+        with self._lock:
+            self.requests[operation] += 1
+            delay = self._latency + self._random.uniform(0, self._jitter)
+        if delay:
+            time.sleep(delay)
+
+    def _store(self, bucket: str, key: str, body: bytes) -> None:
+        with self._lock:
+            self._versions += 1
+            self._objects[(bucket, key)] = (body, f'"v{self._versions}"')
+
+    def seed_object(self, bucket: str, key: str, body: bytes) -> None:
+        """Carga un objeto sin contarlo como request."""
+        self._store(bucket, key, body)
+
+    def get_object(self, Bucket: str, Key: str, **kwargs: Any) -> dict[str, Any]:
+        self._request("GetObject")
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise _client_error("NoSuchKey", "GetObject")
+        body, etag = entry
+        if kwargs.get("IfNoneMatch") == etag:
+            raise _client_error("304", "GetObject")
+        if "Range" in kwargs:
+            start, end = kwargs["Range"].removeprefix("bytes=").split("-")
+            body = body[int(start) : int(end) + 1]
+        return {"Body": io.BytesIO(body), "ContentLength": len(body), "ETag": etag}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs: Any) -> None:
+        self._request("PutObject")
+        with self._lock:
+            current = self._objects.get((Bucket, Key))
+            if (kwargs.get("IfNoneMatch") == "*" and current is not None) or (
+                "IfMatch" in kwargs
+                and (current is None or current[1] != kwargs["IfMatch"])
+            ):
+                self.requests["PutObject:PreconditionFailed"] += 1
+                raise _client_error("PreconditionFailed", "PutObject")
+            self._versions += 1
+            self._objects[(Bucket, Key)] = (bytes(Body), f'"v{self._versions}"')
+
+    def upload_fileobj(self, fileobj: BinaryIO, bucket: str, key: str) -> None:
+        self._request("PutObject")
+        self._store(bucket, key, fileobj.read())
+
+    def download_fileobj(self, bucket: str, key: str, fileobj: BinaryIO) -> None:
+        fileobj.write(self.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+    def delete_objects(self, Bucket: str, Delete: dict[str, Any]) -> None:
+        self._request("DeleteObjects")
+        with self._lock:
+            for obj in Delete["Objects"]:
+                self._objects.pop((Bucket, obj["Key"]), None)
+
+    def get_paginator(self, operation: str) -> "InProcessS3Client":
+        return self
+
+    def paginate(self, Bucket: str, Prefix: str) -> list[dict[str, Any]]:
+        self._request("ListObjectsV2")
+        with self._lock:
+            contents = [
+                {"Key": key, "Size": len(body), "ETag": etag}
+                for (bucket, key), (body, etag) in sorted(self._objects.items())
+                if bucket == Bucket and key.startswith(Prefix)
+            ]
+        return [{"Contents": contents}]
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code}}, operation)
+
+
+def synthesize_batches(
+    client: InProcessS3Client,
+    batches: int,
+    files_per_batch: int,
+    rows_per_file: int,
+    days: int,
+    seed: int = 7,
+) -> list[dict[str, Any]]:
+    """Genera los CSVs crudos de cada lote y devuelve sus eventos S3."""
+    rng = random.Random(seed)
+    start = datetime(2026, 2, 16, 0, 0, 0)
+    events = []
+    for index in range(batches):
+        ingestion = start + timedelta(days=index % days, seconds=index)
+        prefix = f"{settings.RAW_PREFIX}ingestion_{ingestion:%Y%m%d_%H%M%S}/"
+        for file_index in range(files_per_batch):
+            lines = [
+                "nombre_hotel,ubicacion,checkin_date,checkout_date,precio_inicial,"
+                "precio_impuesto,precio_final,calificacion,puntaje,"
+                "cantidad_reviews,link_detalle"
+            ]
+            for _ in range(rows_per_file):
+                hotel = rng.randrange(2000)
+                checkin = ingestion.date() + timedelta(days=rng.randint(0, 60))
+                noches = rng.randint(1, 5)
+                precio = rng.randint(20_000, 300_000) * noches
+                lines.append(
+                    f"Hotel {hotel},\"{rng.choice(BARRIOS)}, Buenos Aires\","
+                    f"{checkin},{checkin + timedelta(days=noches)},"
+                    f"{precio * 0.8},{precio * 0.2},{precio},Muy bueno,"
+                    f"{rng.uniform(0, 11):.1f},{rng.randint(0, 900)},"
+                    f"https://www.booking.com/hotel/ar/h{hotel}.html"
+                )
+            client.seed_object(
+                BUCKET,
+                f"{prefix}hoteles_{file_index}.csv",
+                ("\n".join(lines) + "\n").encode("utf-8"),
+            )
+        events.append(
+            {
+                "Records": [
+                    {
+                        "s3": {
+                            "bucket": {"name": BUCKET},
+                            "object": {"key": f"{prefix}hoteles_0.csv"},
+                        }
+                    }
+                ]
+            }
+        )
+    return events
+
+
+def run_load_test(args: argparse.Namespace) -> dict[str, Any]:
+    """Ejecuta la ráfaga de invocaciones y calcula sus métricas."""
+    client = InProcessS3Client(args.latency_ms, args.jitter_ms)
+    events = synthesize_batches(
+        client, args.batches, args.files_per_batch, args.rows_per_file, args.days
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = None
+        if args.s3_cache:
+            cache = DiskCache(cache_dir, settings.S3_CACHE_MAX_BYTES)
+        lambda_function._s3_service = S3Service(cache=cache, client=client)
+
+        latencies: list[float] = []
+        errors: list[str] = []
+        results_lock = threading.Lock()
+
+        def invoke(event: dict[str, Any]) -> None:
+            started = time.perf_counter()
+            try:
+                response = lambda_function.lambda_handler(event, None)
+                if response["statusCode"] != 200 or "lote" not in response["body"]:
+                    raise RuntimeError(f"Respuesta inesperada: {response}")
+            except Exception as e:  # noqa: BLE001 - se reporta cualquier fallo
+                with results_lock:
+                    errors.append(f"{type(e).__name__}: {e}")
+                return
+            with results_lock:
+                latencies.append(time.perf_counter() - started)
+
+        client.requests.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(invoke, events))
+        elapsed = time.perf_counter() - started
+        lambda_function._s3_service = None
+
+    rows = args.batches * args.files_per_batch * args.rows_per_file
+    return {
+        "revision": _git_revision(),
+        "fecha": datetime.now(timezone.utc).isoformat(),
+        "parametros": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("compare", "no_save", "verbose")
+        },
+        "lotes_ok": len(latencies),
+        "errores": len(errors),
+        "errores_ejemplo": sorted(set(errors))[:5],
+        "duracion_s": round(elapsed, 3),
+        "lotes_por_s": round(len(latencies) / elapsed, 3),
+        "filas_por_s": round(rows / elapsed, 1),
+        "latencia_s": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(max(latencies), 4) if latencies else None,
+        },
+        "requests_s3": dict(sorted(client.requests.items())),
+        "requests_s3_por_lote": round(
+            sum(client.requests.values()) / max(args.batches, 1), 2
+        ),
+        "memoria_pico_mb": {
+            "rss": round(_peak_rss_mb(), 1),
+            "arrow": round(pa.default_memory_pool().max_memory() / 2**20, 1),
+        },
+    }
+
+
+def _percentile(values: list[float], percentile: float) -> Optional[float]:
+    """Percentil por interpolación lineal entre rangos."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    value = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+    return round(value, 4)
+
+
+def _peak_rss_mb() -> float:
+    """Memoria residente pico del proceso (ru_maxrss está en KiB en Linux)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _git_revision() -> str:
+    """Revisión de git del árbol (con sufijo '-dirty' si hay cambios)."""
+    try:
+        revision = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = "desconocida"
+    return revision
+
+
+def _save(result: dict[str, Any]) -> str:
+    """Guarda el resultado en RESULTS_DIR y devuelve su ruta."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    name = f"load_test-{result['revision']}-{timestamp}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2, ensure_ascii=False)
+    return path
+
+
+def _print_report(result: dict[str, Any], baseline: Optional[dict[str, Any]]) -> None:
+    """Imprime el resultado y, si hay línea base, la variación de cada métrica."""
+    metrics = {
+        "lotes/s": ("lotes_por_s",),
+        "filas/s": ("filas_por_s",),
+        "latencia p50 (s)": ("latencia_s", "p50"),
+        "latencia p95 (s)": ("latencia_s", "p95"),
+        "latencia p99 (s)": ("latencia_s", "p99"),
+        "requests S3 por lote": ("requests_s3_por_lote",),
+        "RSS pico (MB)": ("memoria_pico_mb", "rss"),
+        "Arrow pico (MB)": ("memoria_pico_mb", "arrow"),
+    }
+    print(
+        f"Revisión {result['revision']}: {result['lotes_ok']} lotes ok, "
+        f"{result['errores']} errores, {result['duracion_s']} s"
+    )
+    for error in result["errores_ejemplo"]:
+        print(f"  error: {error}")
+    header = f"{'métrica':<24}{'actual':>12}"
+    if baseline:
+        header += f"{baseline['revision']:>16}{'variación':>12}"
+    print(header)
+    for name, path in metrics.items():
+        value = _lookup(result, path)
+        line = f"{name:<24}{_format(value):>12}"
+        if baseline:
+            previous = _lookup(baseline, path)
+            change = (
+                f"{(value - previous) / previous:+.1%}"
+                if value is not None and previous
+                else "-"
+            )
+            line += f"{_format(previous):>16}{change:>12}"
+        print(line)
+    print(f"requests S3: {result['requests_s3']}")
+
+
+def _lookup(result: dict[str, Any], path: tuple[str, ...]) -> Any:
+    value: Any = result
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def _format(value: Any) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=48)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--files-per-batch", type=int, default=3)
+    parser.add_argument("--rows-per-file", type=int, default=2000)
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=1,
+        help="Fechas de ingesta distintas (lotes del mismo día comparten catálogo).",
+    )
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--s3-cache", action="store_true")
+    parser.add_argument("--compare", help="Resultado JSON anterior a comparar.")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Muestra los logs.")
+    args = parser.parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+    else:
+        # lambda_function fija su logger en INFO; se silencia hasta WARNING
+        logging.disable(logging.WARNING)
+
+    result = run_load_test(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    _print_report(result, baseline)
+    if not args.no_save:
+        print(f"Resultado guardado en {_save(result)}")
+
+
+if __name__ == "__main__":
+    main()
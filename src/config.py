@@ -2,7 +2,9 @@
 Módulo que contiene la configuración centralizada del sistema.
 """
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -14,6 +16,143 @@ class Settings:
     RAW_PREFIX: str = "raw/"
     PROCESSED_PREFIX: str = "processed/"
     REJECTED_PREFIX: str = "rejected/"
+    AGGREGATES_PREFIX: str = "aggregates/"
+
+    # -- Planificación de la ejecución --
+    # Estrategia forzada ("in_memory", "chunked", "spill"); None = automática
+    EXECUTION_STRATEGY: Optional[str] = field(
+        default_factory=lambda: os.environ.get("EXECUTION_STRATEGY") or None
+    )
+    # Memoria disponible para el proceso (la Lambda expone su configuración)
+    MEMORY_LIMIT_MB: int = field(
+        default_factory=lambda: int(
+            os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "1024")
+        )
+    )
+    # Expansión estimada de un CSV sin comprimir al cargarse en pandas
+    CSV_MEMORY_EXPANSION: float = 6.0
+    # Relación de descompresión estimada para CSVs comprimidos
+    COMPRESSED_CSV_RATIO: float = 8.0
+    # Fracciones de la memoria disponible que delimitan cada estrategia
+    IN_MEMORY_MAX_FRACTION: float = 0.5
+    CHUNKED_MAX_FRACTION: float = 4.0
+    # Filas por chunk en las estrategias de streaming
+    CSV_CHUNK_ROWS: int = 100_000
+    # Directorio de almacenamiento efímero para spill
+    SPILL_DIR: str = "/tmp"
+
+    # -- Catálogo de lotes --
+    # Nombre del catálogo dentro de cada partición de procesados
+    CATALOG_FILENAME: str = "_catalog.jsonl"
+    # Columnas cuyo mínimo/máximo se registra por lote
+    CATALOG_STATS_COLUMNS: tuple[str, ...] = (
+        "checkin_date",
+        "checkout_date",
+        "precio_final",
+        "precio_por_noche",
+    )
+    # Reintentos ante escrituras concurrentes del catálogo
+    CATALOG_MAX_RETRIES: int = 20
+
+    # -- Escrituras condicionales sobre objetos compartidos --
+    # Backoff exponencial con jitter entre reintentos: la espera máxima del
+    # intento n es min(BASE * 2^(n-1), MAX)
+    CONDITIONAL_WRITE_BACKOFF_BASE_MS: int = 50
+    CONDITIONAL_WRITE_BACKOFF_MAX_MS: int = 2000
+
+    # -- Caché de objetos S3 entre invocaciones --
+    # Las cachés en disco comparten /tmp con el spill: sus máximos dejan
+    # libre la mayor parte de los 512 MB de almacenamiento efímero que
+    # Lambda asigna por defecto
+    S3_CACHE_ENABLED: bool = field(
+        default_factory=lambda: os.environ.get("S3_CACHE_ENABLED", "").lower()
+        in ("1", "true", "yes")
+    )
+    S3_CACHE_DIR: str = "/tmp/s3-object-cache"
+    S3_CACHE_MAX_BYTES: int = 128 * 1024 * 1024
+
+    # -- Layout de salida de procesados --
+    # Ordena (clusteriza) las filas antes de escribir para que las
+    # estadísticas mínimo/máximo de cada row group sean selectivas
+    OUTPUT_CLUSTERING_ENABLED: bool = field(
+        default_factory=lambda: os.environ.get("OUTPUT_CLUSTERING_ENABLED", "").lower()
+        in ("1", "true", "yes")
+    )
+    OUTPUT_SORT_KEYS: tuple[str, ...] = ("barrio", "checkin_date", "precio_por_noche")
+    OUTPUT_ROW_GROUP_ROWS: int = 10_000
+    # Bloom filters para búsquedas puntuales sobre columnas de alta cardinalidad
+    OUTPUT_BLOOM_FILTER_COLUMNS: tuple[str, ...] = ("link_detalle", "nombre_hotel")
+    OUTPUT_BLOOM_FILTER_FPP: float = 0.01
+    # Tamaño objetivo de cada Parquet de procesados y rechazados; al
+    # superarlo la salida continúa en `<lote>-00001.parquet`, etc. 0 = un
+    # único archivo por lote
+    OUTPUT_TARGET_FILE_MB: int = field(
+        default_factory=lambda: int(os.environ.get("OUTPUT_TARGET_FILE_MB", "0"))
+    )
+    # Columna por cuyo hash se reparten las filas entre archivos; None = sin reparto
+    OUTPUT_DISTRIBUTION_KEY: Optional[str] = field(
+        default_factory=lambda: os.environ.get("OUTPUT_DISTRIBUTION_KEY") or None
+    )
+    # Grupos de hash (archivos abiertos a la vez) al repartir por clave
+    OUTPUT_DISTRIBUTION_BUCKETS: int = 8
+
+    # -- Tabla histórica de precios --
+    PRICE_HISTORY_ENABLED: bool = field(
+        default_factory=lambda: os.environ.get("PRICE_HISTORY_ENABLED", "").lower()
+        in ("1", "true", "yes")
+    )
+    PRICE_HISTORY_PREFIX: str = "price_history/"
+    # Buckets por hash de link_detalle en que se dividen las filas vigentes
+    # de cada mes de estadía. Un lote suele tocar todos los buckets de sus
+    # meses, por lo que más buckets solo acotan el tamaño de cada objeto a
+    # costa de más requests por lote
+    PRICE_HISTORY_BUCKETS: int = 4
+    PRICE_HISTORY_MAX_RETRIES: int = 20
+
+    # -- Dimensión de hoteles --
+    # Separa los atributos del hotel de los procesados: los hechos llevan
+    # solo hotel_id y columnas numéricas y de fecha
+    HOTEL_DIMENSION_ENABLED: bool = field(
+        default_factory=lambda: os.environ.get("HOTEL_DIMENSION_ENABLED", "").lower()
+        in ("1", "true", "yes")
+    )
+    HOTEL_DIMENSION_PREFIX: str = "dimensions/hotel/"
+    # Cantidad de buckets por hash de hotel_id en que se divide la dimensión
+    HOTEL_DIMENSION_BUCKETS: int = 8
+    HOTEL_DIMENSION_MAX_RETRIES: int = 20
+
+    # -- Modo distribuido (coordinador / workers / reductor) --
+    # Memoria estimada objetivo por shard asignado a un worker
+    FANOUT_SHARD_TARGET_MB: int = field(
+        default_factory=lambda: int(os.environ.get("FANOUT_SHARD_TARGET_MB", "256"))
+    )
+    # Prefijo de las salidas parciales de los workers
+    FANOUT_WORK_PREFIX: str = "fanout/"
+
+    # -- Perfilado bajo demanda --
+    PROFILING_ENABLED: bool = field(
+        default_factory=lambda: os.environ.get("PROFILING_ENABLED", "").lower()
+        in ("1", "true", "yes")
+    )
+    # Etapas a perfilar: "invocation", "process_batch", "apply_transformations"
+    PROFILING_STAGES: tuple[str, ...] = field(
+        default_factory=lambda: tuple(
+            stage.strip()
+            for stage in os.environ.get("PROFILING_STAGES", "invocation").split(",")
+            if stage.strip()
+        )
+    )
+    # Prefijo S3 (en el mismo bucket) o ruta local absoluta para los reportes
+    PROFILING_OUTPUT: str = field(
+        default_factory=lambda: os.environ.get("PROFILING_OUTPUT", "profiles/")
+    )
+    PROFILING_TOP_N: int = 30
+
+    # -- Lectura del lakehouse --
+    # Caché local de rangos leídos (row groups y footers de Parquet). Junto
+    # con S3_CACHE_MAX_BYTES deja unos 320 MB de /tmp para el spill
+    READER_CACHE_DIR: str = "/tmp/lakehouse-reader-cache"
+    READER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
 
 
 settings = Settings()
@@ -3,25 +3,61 @@ Módulo que contiene el handler principal de la función Lambda.
 
 Orquesta el flujo de procesamiento: lectura de CSVs desde S3,
 transformación de datos de hoteles y escritura de resultados
-en formato Parquet particionado.
+en formato Parquet particionado. Incluye además los handlers del modo
+distribuido (coordinador, workers y reductor) para lotes que exceden
+la memoria o el tiempo máximo de una única invocación.
 """
 
 import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date, datetime
+from functools import partial
 from io import BytesIO
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterator, Optional
 
 import pandas as pd
 
 from config import settings
-from processors.batch_processor import BatchProcessor
-from services.s3_service import S3Service
+from processors.batch_processor import (
+    BatchProcessor,
+    BatchResult,
+    OutputFiles,
+    OutputLayout,
+    StreamResult,
+)
+from processors.execution_planner import (
+    ExecutionPlan,
+    ExecutionStrategy,
+    plan_execution,
+    plan_shards,
+)
+from services.catalog_service import CatalogService, build_catalog_entry
+from services.hotel_dimension_service import HotelDimensionService
+from services.price_history_service import PriceHistoryService
+from services.s3_service import S3ObjectInfo, S3Service
+from utils.compression_utils import (
+    detect_compression,
+    is_csv_key,
+    open_decompressed_stream,
+)
+from utils.disk_cache import DiskCache
 from utils.ingestion_utils import extract_ingestion_datetime
-from utils.partition_utils import build_partitioned_key
+from utils.partition_utils import build_part_key, build_partitioned_key
+from utils.profiling import StageProfiler, build_profiler
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Estado compartido entre invocaciones de un mismo contenedor
+_s3_service: Optional[S3Service] = None
+_s3_service_lock = threading.Lock()
+
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
@@ -30,19 +66,427 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     Procesa archivos CSV de hoteles depositados en un directorio de
     ingestion dentro del bucket S3, aplica transformaciones y reglas
     de validación, y escribe los resultados (procesados y rechazados)
-    como archivos Parquet particionados por fecha de ingesta.
+    como archivos Parquet particionados por fecha de ingesta (divididos en
+    varios archivos si OUTPUT_TARGET_FILE_MB u OUTPUT_DISTRIBUTION_KEY están
+    configurados). Si HOTEL_DIMENSION_ENABLED está activo, los procesados
+    llevan solo hotel_id y columnas numéricas y de fecha, y los atributos
+    de los hoteles se mantienen en la dimensión de hoteles. Cada lote
+    procesado se registra en el catálogo de su partición y, si
+    PRICE_HISTORY_ENABLED está activo, actualiza la tabla histórica de precios.
 
     Args:
         event: Evento S3 con la información del objeto que disparó la Lambda.
+            Puede incluir "execution_strategy" para forzar la estrategia de
+            ejecución ("in_memory", "chunked" o "spill") y "profiling" para
+            perfilar la invocación (true, o {"stages": [...]}).
         context: Contexto de ejecución proporcionado por AWS Lambda.
 
     Returns:
         Diccionario con statusCode y body indicando el resultado de la operación.
 
     """
-    s3 = S3Service()
-    processor = BatchProcessor()
+    profiler = build_profiler(event)
+    if not profiler.enabled:
+        return _process_event(event, profiler)
+
+    try:
+        with profiler.stage("invocation"):
+            return _process_event(event, profiler)
+    finally:
+        _publish_profile(event, profiler)
+
+
+def _process_event(event: dict[str, Any], profiler: StageProfiler) -> dict[str, Any]:
+    """Procesa el lote indicado por el evento S3."""
+    s3 = _get_s3_service()
+    layout = _output_layout()
+    processor = BatchProcessor(
+        profiler=profiler,
+        layout=layout,
+        hotel_dimension=settings.HOTEL_DIMENSION_ENABLED,
+        price_history=settings.PRICE_HISTORY_ENABLED,
+    )
+
+    batch = _resolve_batch(event)
+    if isinstance(batch, dict):
+        return batch
+    bucket, prefix, ingestion_dt = batch
+
+    batch_name = prefix.split("/")[-2]
+    logger.info("Procesando lote '%s' del bucket '%s'.", batch_name, bucket)
+
+    processed_key, rejected_key, aggregates_key = _output_keys(
+        ingestion_dt, batch_name
+    )
+
+    objects = [
+        obj for obj in s3.list_objects_metadata(bucket, prefix) if is_csv_key(obj.key)
+    ]
+
+    if not objects:
+        logger.warning("No se encontraron archivos CSV en '%s'.", prefix)
+        return {"statusCode": 200, "body": "No se encontraron archivos CSV"}
+
+    plan = plan_execution(objects, override=event.get("execution_strategy"))
+
+    before_publish = None
+    if settings.HOTEL_DIMENSION_ENABLED:
+        before_publish = partial(_upsert_hotels, s3, bucket, batch_name)
+
+    with profiler.stage("process_batch"):
+        result, processed_files, rejected_files = _run_batch(
+            s3,
+            processor,
+            bucket,
+            objects,
+            plan,
+            ingestion_dt.date(),
+            processed_key,
+            rejected_key,
+            split=layout.splits_files,
+            before_publish=before_publish,
+        )
+
+    s3.put_object(bucket, aggregates_key, result.aggregates)
+
+    _register_batch(
+        s3,
+        bucket,
+        ingestion_dt,
+        batch_name,
+        objects,
+        result,
+        processed_files,
+        rejected_files,
+        aggregates_key,
+    )
+
+    if result.observations is not None:
+        PriceHistoryService(s3).upsert(
+            bucket, result.observations, ingestion_dt, batch_name
+        )
+
+    if settings.S3_CACHE_ENABLED:
+        logger.info(
+            "Caché de objetos S3 (acumulado del contenedor): %d aciertos, %d fallos.",
+            s3.cache_hits,
+            s3.cache_misses,
+        )
+
+    logger.info(
+        "Lote '%s' procesado. Procesados: %d archivo(s) en '%s', "
+        "Rechazados: %d archivo(s) en '%s', Agregados: '%s'.",
+        batch_name,
+        len(processed_files),
+        processed_files[0][0],
+        len(rejected_files),
+        rejected_files[0][0],
+        aggregates_key,
+    )
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "lote": batch_name,
+                **_keys_field("clave_procesados", processed_files),
+                **_keys_field("clave_rechazados", rejected_files),
+                "clave_agregados": aggregates_key,
+            }
+        ),
+    }
+
+
+def coordinator_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    Punto de entrada del coordinador del modo distribuido.
+
+    Lista el lote indicado por el evento S3 y reparte sus archivos en
+    shards contiguos. Devuelve un evento por worker y el evento base del
+    reductor, pensados para un orquestador que ejecute los workers en
+    paralelo (por ejemplo, un estado Map de Step Functions) y luego
+    invoque al reductor con los resultados de todos los workers en
+    "shards".
+
+    Args:
+        event: Evento S3 con la información del objeto que disparó la Lambda.
+            Puede incluir "execution_strategy", que se propaga a los workers,
+            y "shard_target_mb" para fijar la memoria estimada por shard.
+        context: Contexto de ejecución proporcionado por AWS Lambda.
+
+    Returns:
+        Diccionario con statusCode, el nombre del lote, los eventos de los
+        workers en "workers" y el evento base del reductor en "reducer".
+    """
+    s3 = _get_s3_service()
+
+    batch = _resolve_batch(event)
+    if isinstance(batch, dict):
+        return batch
+    bucket, prefix, _ = batch
+    batch_name = prefix.split("/")[-2]
+
+    objects = [
+        obj for obj in s3.list_objects_metadata(bucket, prefix) if is_csv_key(obj.key)
+    ]
+    if not objects:
+        logger.warning("No se encontraron archivos CSV en '%s'.", prefix)
+        return {"statusCode": 200, "body": "No se encontraron archivos CSV"}
+
+    workers = []
+    shards = plan_shards(objects, shard_target_mb=event.get("shard_target_mb"))
+    for index, shard in enumerate(shards):
+        worker_event: dict[str, Any] = {
+            "bucket": bucket,
+            "prefix": prefix,
+            "shard": index,
+            "objects": [
+                {"key": obj.key, "size": obj.size, "etag": obj.etag} for obj in shard
+            ],
+        }
+        if event.get("execution_strategy"):
+            worker_event["execution_strategy"] = event["execution_strategy"]
+        workers.append(worker_event)
+
+    logger.info(
+        "Lote '%s' coordinado: %d archivos en %d shards.",
+        batch_name,
+        len(objects),
+        len(workers),
+    )
+    return {
+        "statusCode": 200,
+        "lote": batch_name,
+        "workers": workers,
+        "reducer": {"bucket": bucket, "prefix": prefix},
+    }
+
+
+def worker_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    Punto de entrada de un worker del modo distribuido.
+
+    Aplica las transformaciones y validaciones sobre los archivos de su
+    shard, con la misma planificación de ejecución que el handler
+    principal, y escribe Parquet parciales de procesados, rechazados y
+    agregados bajo FANOUT_WORK_PREFIX.
+
+    Args:
+        event: Evento generado por el coordinador para el shard.
+        context: Contexto de ejecución proporcionado por AWS Lambda.
+
+    Returns:
+        Evento recibido, completado con statusCode y las claves de las
+        salidas parciales, listo para pasarse al reductor.
+    """
+    s3 = _get_s3_service()
+    processor = BatchProcessor(layout=_output_layout())
+
+    bucket: str = event["bucket"]
+    prefix: str = event["prefix"]
+    shard: int = event["shard"]
+    objects = [S3ObjectInfo(**obj) for obj in event["objects"]]
+    ingestion_dt = extract_ingestion_datetime(prefix)
+    batch_name = prefix.split("/")[-2]
+
+    work_prefix = f"{settings.FANOUT_WORK_PREFIX}{batch_name}/shard-{shard:05d}/"
+    processed_key = f"{work_prefix}processed.parquet"
+    rejected_key = f"{work_prefix}rejected.parquet"
+    aggregates_key = f"{work_prefix}aggregates.parquet"
+
+    plan = plan_execution(objects, override=event.get("execution_strategy"))
+    result, _, _ = _run_batch(
+        s3,
+        processor,
+        bucket,
+        objects,
+        plan,
+        ingestion_dt.date(),
+        processed_key,
+        rejected_key,
+    )
+    s3.put_object(bucket, aggregates_key, result.aggregates)
+
+    logger.info(
+        "Shard %d del lote '%s' procesado: %d válidos, %d rechazados.",
+        shard,
+        batch_name,
+        result.processed_stats.rows,
+        result.rejected_stats.rows,
+    )
+    return {
+        **event,
+        "statusCode": 200,
+        "clave_procesados": processed_key,
+        "clave_rechazados": rejected_key,
+        "clave_agregados": aggregates_key,
+    }
+
+
+def reducer_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    Punto de entrada del reductor del modo distribuido.
+
+    Combina, en orden de shard, las salidas parciales de los workers en
+    los Parquet finales de procesados, rechazados y agregados del lote
+    (las mismas claves que escribe el handler principal), registra el
+    lote en el catálogo y elimina las salidas parciales. Los workers
+    escriben los procesados completos; la separación en hechos y
+    dimensión de hoteles, si está habilitada, se hace al combinarlos, y
+    los hechos se suben recién después de actualizar la dimensión.
+
+    Args:
+        event: Evento base del coordinador con los resultados de todos los
+            workers en "shards".
+        context: Contexto de ejecución proporcionado por AWS Lambda.
+
+    Returns:
+        Diccionario con statusCode y body indicando el resultado de la operación.
+    """
+    s3 = _get_s3_service()
+    layout = _output_layout()
+    processor = BatchProcessor(
+        layout=layout,
+        hotel_dimension=settings.HOTEL_DIMENSION_ENABLED,
+        price_history=settings.PRICE_HISTORY_ENABLED,
+    )
+
+    bucket: str = event["bucket"]
+    prefix: str = event["prefix"]
+    shards = sorted(event["shards"], key=lambda shard: shard["shard"])
+    ingestion_dt = extract_ingestion_datetime(prefix)
+    batch_name = prefix.split("/")[-2]
 
+    processed_key, rejected_key, aggregates_key = _output_keys(
+        ingestion_dt, batch_name
+    )
+
+    parts = (
+        _iter_parts(s3, bucket, [s["clave_procesados"] for s in shards]),
+        _iter_parts(s3, bucket, [s["clave_rechazados"] for s in shards]),
+        (
+            pd.read_parquet(BytesIO(s3.get_object(bucket, s["clave_agregados"])))
+            for s in shards
+        ),
+        ingestion_dt.date(),
+    )
+    # Los hechos se publican recién con sus hoteles ya en la dimensión
+    if layout.splits_files:
+        processed_files: list[tuple[str, int]] = []
+        rejected_files: list[tuple[str, int]] = []
+        pending: Optional[list[tuple[str, str]]] = None
+        if settings.HOTEL_DIMENSION_ENABLED:
+            pending = []
+        try:
+            result = processor.merge_parts(
+                *parts,
+                _output_files(
+                    s3,
+                    bucket,
+                    processed_key,
+                    ExecutionStrategy.SPILL,
+                    processed_files,
+                    pending,
+                ),
+                _output_files(
+                    s3, bucket, rejected_key, ExecutionStrategy.SPILL, rejected_files
+                ),
+            )
+            _upsert_hotels(s3, bucket, batch_name, result)
+            if pending:
+                _upload_pending(s3, bucket, pending, processed_files)
+        finally:
+            _discard_pending(pending)
+    else:
+        with _open_sinks(ExecutionStrategy.SPILL) as (processed_sink, rejected_sink):
+            result = processor.merge_parts(*parts, processed_sink, rejected_sink)
+            rejected_files = [
+                (rejected_key, _upload_sink(s3, bucket, rejected_key, rejected_sink))
+            ]
+            _upsert_hotels(s3, bucket, batch_name, result)
+            processed_files = [
+                (processed_key, _upload_sink(s3, bucket, processed_key, processed_sink))
+            ]
+
+    s3.put_object(bucket, aggregates_key, result.aggregates)
+
+    objects = [S3ObjectInfo(**obj) for shard in shards for obj in shard["objects"]]
+    _register_batch(
+        s3,
+        bucket,
+        ingestion_dt,
+        batch_name,
+        objects,
+        result,
+        sorted(processed_files),
+        sorted(rejected_files),
+        aggregates_key,
+    )
+
+    if result.observations is not None:
+        PriceHistoryService(s3).upsert(
+            bucket, result.observations, ingestion_dt, batch_name
+        )
+
+    s3.delete_objects(
+        bucket,
+        [
+            shard[name]
+            for shard in shards
+            for name in ("clave_procesados", "clave_rechazados", "clave_agregados")
+        ],
+    )
+
+    logger.info(
+        "Lote '%s' reducido desde %d shards. Procesados: %d archivo(s), "
+        "Rechazados: %d archivo(s).",
+        batch_name,
+        len(shards),
+        len(processed_files),
+        len(rejected_files),
+    )
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "lote": batch_name,
+                **_keys_field("clave_procesados", sorted(processed_files)),
+                **_keys_field("clave_rechazados", sorted(rejected_files)),
+                "clave_agregados": aggregates_key,
+                "shards": len(shards),
+            }
+        ),
+    }
+
+
+def _output_layout() -> OutputLayout:
+    """Devuelve el layout de salida según la configuración.
+
+    Incluye el layout clusterizado si está habilitado y la división de la
+    salida en archivos si hay un tamaño objetivo o una clave de distribución.
+    """
+    layout = OutputLayout()
+    if settings.OUTPUT_CLUSTERING_ENABLED:
+        layout = OutputLayout.from_settings()
+    if settings.OUTPUT_TARGET_FILE_MB or settings.OUTPUT_DISTRIBUTION_KEY:
+        layout = replace(
+            layout,
+            target_file_bytes=settings.OUTPUT_TARGET_FILE_MB * 1024 * 1024 or None,
+            distribution_key=settings.OUTPUT_DISTRIBUTION_KEY,
+            distribution_buckets=settings.OUTPUT_DISTRIBUTION_BUCKETS,
+        )
+    return layout
+
+
+def _resolve_batch(
+    event: dict[str, Any],
+) -> tuple[str, str, datetime] | dict[str, Any]:
+    """Obtiene bucket, prefijo y fecha de ingesta del lote de un evento S3.
+
+    Si el objeto que disparó el evento no pertenece a un directorio de
+    ingesta, devuelve directamente la respuesta de evento ignorado.
+    """
     record = event["Records"][0]
     bucket: str = record["s3"]["bucket"]["name"]
     key: str = record["s3"]["object"]["key"]
@@ -60,50 +504,401 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         )
         return {"statusCode": 200, "body": "Ignorado: no es directorio de ingesta"}
 
-    batch_name = prefix.split("/")[-2]
-    logger.info("Procesando lote '%s' del bucket '%s'.", batch_name, bucket)
+    return bucket, prefix, ingestion_dt
+
 
+def _output_keys(ingestion_dt: datetime, batch_name: str) -> tuple[str, str, str]:
+    """Construye las claves de procesados, rechazados y agregados de un lote."""
     processed_key = build_partitioned_key(
         settings.PROCESSED_PREFIX, ingestion_dt, batch_name
     )
+    rejected_key = processed_key.replace(
+        settings.PROCESSED_PREFIX, settings.REJECTED_PREFIX
+    )
+    aggregates_key = processed_key.replace(
+        settings.PROCESSED_PREFIX, settings.AGGREGATES_PREFIX
+    )
+    return processed_key, rejected_key, aggregates_key
 
-    file_keys = s3.list_objects(bucket, prefix)
 
-    dataframes: list[pd.DataFrame] = []
-    for file_key in file_keys:
-        if not file_key.endswith(".csv"):
-            continue
-        content_bytes = s3.get_object(bucket, file_key)
-        df = pd.read_csv(BytesIO(content_bytes))
-        dataframes.append(df)
+def _run_batch(
+    s3: S3Service,
+    processor: BatchProcessor,
+    bucket: str,
+    objects: list[S3ObjectInfo],
+    plan: ExecutionPlan,
+    ingestion_date: date,
+    processed_key: str,
+    rejected_key: str,
+    split: bool = False,
+    before_publish: Optional[Callable[[BatchResult | StreamResult], None]] = None,
+) -> tuple[BatchResult | StreamResult, list[tuple[str, int]], list[tuple[str, int]]]:
+    """Procesa los CSVs según el plan y sube procesados y rechazados.
 
-    if not dataframes:
-        logger.warning("No se encontraron archivos CSV en '%s'.", prefix)
-        return {"statusCode": 200, "body": "No se encontraron archivos CSV"}
+    Con `split`, cada salida se divide en varios archivos según el layout
+    del procesador (claves `<lote>-NNNNN.parquet`), que se suben de a uno
+    a medida que se completan.
 
-    processed_bytes, rejected_bytes = processor.process_batch(dataframes)
+    Si se indica `before_publish`, se llama con el resultado antes de subir
+    los procesados (ej: para actualizar la dimensión de hoteles a la que
+    apuntan sus hechos). Si falla, los procesados no se suben; con `split`
+    se retienen hasta entonces en SPILL_DIR.
 
-    s3.put_object(bucket, processed_key, processed_bytes)
+    Returns:
+        Tupla con (resultado, archivos_procesados, archivos_rechazados),
+        donde cada archivo es una tupla (clave, bytes) y están ordenados
+        por clave.
+    """
+    if split:
+        processed_files: list[tuple[str, int]] = []
+        rejected_files: list[tuple[str, int]] = []
+        pending: Optional[list[tuple[str, str]]] = None
+        if before_publish is not None:
+            pending = []
+        try:
+            result = _process_objects(
+                s3,
+                processor,
+                bucket,
+                objects,
+                plan,
+                ingestion_date,
+                _output_files(
+                    s3, bucket, processed_key, plan.strategy, processed_files, pending
+                ),
+                _output_files(s3, bucket, rejected_key, plan.strategy, rejected_files),
+            )
+            if before_publish is not None:
+                before_publish(result)
+            if pending:
+                _upload_pending(s3, bucket, pending, processed_files)
+        finally:
+            _discard_pending(pending)
+        return result, sorted(processed_files), sorted(rejected_files)
 
-    rejected_key = processed_key.replace(
-        settings.PROCESSED_PREFIX, settings.REJECTED_PREFIX
-    )
-    s3.put_object(bucket, rejected_key, rejected_bytes)
+    if plan.strategy is ExecutionStrategy.IN_MEMORY:
+        dataframes = [_read_csv_object(s3, bucket, obj) for obj in objects]
+        result = processor.process(dataframes, ingestion_date)
+        s3.put_object(bucket, rejected_key, result.rejected)
+        if before_publish is not None:
+            before_publish(result)
+        s3.put_object(bucket, processed_key, result.processed)
+        return (
+            result,
+            [(processed_key, len(result.processed))],
+            [(rejected_key, len(result.rejected))],
+        )
 
-    logger.info(
-        "Lote '%s' procesado. Procesados: '%s', Rechazados: '%s'.",
-        batch_name,
-        processed_key,
-        rejected_key,
+    with _open_sinks(plan.strategy) as (processed_sink, rejected_sink):
+        result = _process_objects(
+            s3,
+            processor,
+            bucket,
+            objects,
+            plan,
+            ingestion_date,
+            processed_sink,
+            rejected_sink,
+        )
+        rejected_size = _upload_sink(s3, bucket, rejected_key, rejected_sink)
+        if before_publish is not None:
+            before_publish(result)
+        processed_size = _upload_sink(s3, bucket, processed_key, processed_sink)
+    return result, [(processed_key, processed_size)], [(rejected_key, rejected_size)]
+
+
+def _process_objects(
+    s3: S3Service,
+    processor: BatchProcessor,
+    bucket: str,
+    objects: list[S3ObjectInfo],
+    plan: ExecutionPlan,
+    ingestion_date: date,
+    processed_sink: BinaryIO | OutputFiles,
+    rejected_sink: BinaryIO | OutputFiles,
+) -> StreamResult:
+    """Procesa los CSVs según el plan escribiendo sobre los destinos de salida."""
+    if plan.strategy is ExecutionStrategy.IN_MEMORY:
+        dataframes = [_read_csv_object(s3, bucket, obj) for obj in objects]
+        return processor.process_stream(
+            [pd.concat(dataframes, ignore_index=True)],
+            ingestion_date,
+            processed_sink,
+            rejected_sink,
+        )
+
+    chunks = _iter_csv_chunks(s3, bucket, objects)
+    if plan.strategy is ExecutionStrategy.SPILL:
+        return processor.process_spilled(
+            chunks,
+            ingestion_date,
+            processed_sink,
+            rejected_sink,
+            spill_dir=settings.SPILL_DIR,
+        )
+    return processor.process_stream(
+        chunks, ingestion_date, processed_sink, rejected_sink
     )
 
-    return {
-        "statusCode": 200,
-        "body": json.dumps(
+
+def _upsert_hotels(
+    s3: S3Service, bucket: str, batch_name: str, result: BatchResult | StreamResult
+) -> None:
+    """Actualiza la dimensión de hoteles con los hoteles del lote, si los hay."""
+    if result.hotels is not None:
+        HotelDimensionService(s3).upsert(bucket, result.hotels, batch_name)
+
+
+def _register_batch(
+    s3: S3Service,
+    bucket: str,
+    ingestion_dt: datetime,
+    batch_name: str,
+    objects: list[S3ObjectInfo],
+    result: BatchResult | StreamResult,
+    processed: list[tuple[str, int]],
+    rejected: list[tuple[str, int]],
+    aggregates_key: str,
+) -> None:
+    """Registra un lote en el catálogo de su partición.
+
+    `processed` y `rejected` son los archivos (clave, bytes) de cada salida.
+    Una salida de un único archivo se registra con "clave"; una dividida,
+    con la lista "claves". En ambos casos "bytes" es el total.
+    """
+    CatalogService(s3).register(
+        bucket,
+        ingestion_dt,
+        build_catalog_entry(
+            batch_name,
+            ingestion_dt,
+            objects,
             {
-                "lote": batch_name,
-                "clave_procesados": processed_key,
-                "clave_rechazados": rejected_key,
-            }
+                "procesados": {
+                    **_keys_field("clave", processed),
+                    "registros": result.processed_stats.rows,
+                    "bytes": sum(size for _, size in processed),
+                    "min_max": result.processed_stats.min_max,
+                },
+                "rechazados": {
+                    **_keys_field("clave", rejected),
+                    "registros": result.rejected_stats.rows,
+                    "bytes": sum(size for _, size in rejected),
+                    "min_max": result.rejected_stats.min_max,
+                },
+                "agregados": {
+                    "clave": aggregates_key,
+                    "bytes": len(result.aggregates),
+                },
+            },
         ),
-    }
+    )
+
+
+def _keys_field(name: str, files: list[tuple[str, int]]) -> dict[str, Any]:
+    """Devuelve la clave de una salida de un único archivo, o la lista de claves.
+
+    Para varios archivos el nombre del campo se pasa a plural
+    (ej: "clave_procesados" -> "claves_procesados").
+    """
+    if len(files) == 1:
+        return {name: files[0][0]}
+    return {name.replace("clave", "claves", 1): [key for key, _ in files]}
+
+
+def _publish_profile(event: dict[str, Any], profiler: StageProfiler) -> None:
+    """Escribe los reportes del perfilado de la invocación.
+
+    Los reportes se guardan bajo PROFILING_OUTPUT, en una carpeta por lote
+    y marca de tiempo. Si PROFILING_OUTPUT es una ruta absoluta se escriben
+    en disco local; si no, se usa como prefijo dentro del bucket del evento.
+    Un fallo al publicar no interrumpe la invocación.
+    """
+    reports = profiler.render()
+    if not reports:
+        return
+
+    try:
+        record = event["Records"][0]
+        bucket = record["s3"]["bucket"]["name"]
+        key = record["s3"]["object"]["key"]
+    except (KeyError, IndexError):
+        bucket, key = None, "sin-lote/"
+    batch_name = (key.split("/")[-2] if "/" in key else None) or "sin-lote"
+    folder = f"{batch_name}/{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}"
+
+    output = settings.PROFILING_OUTPUT
+    try:
+        if output.startswith("/"):
+            directory = os.path.join(output, folder)
+            os.makedirs(directory, exist_ok=True)
+            for name, content in reports.items():
+                with open(os.path.join(directory, name), "wb") as file:
+                    file.write(content)
+            location = directory
+        elif bucket is not None:
+            for name, content in reports.items():
+                _get_s3_service().put_object(bucket, f"{output}{folder}/{name}", content)
+            location = f"s3://{bucket}/{output}{folder}/"
+        else:
+            logger.warning("Perfilado sin bucket de destino. Reportes descartados.")
+            return
+    except Exception:
+        logger.exception("No se pudieron publicar los reportes de perfilado.")
+        return
+
+    logger.info("Reportes de perfilado publicados en '%s'.", location)
+
+
+def _get_s3_service() -> S3Service:
+    """Devuelve el S3Service compartido entre invocaciones del contenedor.
+
+    Reutilizar el cliente (y su caché en disco, si está habilitada) en
+    contenedores "calientes" evita recrear conexiones y volver a descargar
+    objetos que no cambiaron. La creación está protegida con un lock.
+    """
+    global _s3_service
+    with _s3_service_lock:
+        if _s3_service is None:
+            cache = None
+            if settings.S3_CACHE_ENABLED:
+                cache = DiskCache(settings.S3_CACHE_DIR, settings.S3_CACHE_MAX_BYTES)
+            _s3_service = S3Service(cache=cache)
+        return _s3_service
+
+
+def _read_csv_object(s3: S3Service, bucket: str, obj: S3ObjectInfo) -> pd.DataFrame:
+    """Lee un CSV crudo (opcionalmente comprimido) desde S3 como DataFrame."""
+    with _open_csv_object(s3, bucket, obj) as stream:
+        return pd.read_csv(stream)
+
+
+def _iter_csv_chunks(
+    s3: S3Service, bucket: str, objects: list[S3ObjectInfo]
+) -> Iterator[pd.DataFrame]:
+    """Lee los CSVs crudos de un lote como una secuencia de chunks."""
+    for obj in objects:
+        with _open_csv_object(s3, bucket, obj) as stream:
+            yield from pd.read_csv(stream, chunksize=settings.CSV_CHUNK_ROWS)
+
+
+@contextmanager
+def _open_csv_object(
+    s3: S3Service, bucket: str, obj: S3ObjectInfo
+) -> Iterator[BinaryIO]:
+    """Abre un CSV crudo de S3 como stream descomprimido.
+
+    El contenido se descomprime como stream directamente hacia el parser,
+    sin mantener en memoria el archivo comprimido ni el descomprimido.
+    Al cerrarse, registra la relación de compresión del archivo.
+    """
+    compression = detect_compression(obj.key)
+    body, compressed_size = s3.get_object_stream(bucket, obj.key, etag=obj.etag)
+
+    with open_decompressed_stream(body, compression) as stream:
+        yield stream
+
+    if compression is not None:
+        ratio = stream.bytes_read / compressed_size if compressed_size else 0.0
+        logger.info(
+            "Archivo '%s' descomprimido (%s): %d -> %d bytes (ratio %.2fx).",
+            obj.key,
+            compression,
+            compressed_size,
+            stream.bytes_read,
+            ratio,
+        )
+
+
+@contextmanager
+def _open_sinks(strategy: ExecutionStrategy) -> Iterator[tuple[BinaryIO, BinaryIO]]:
+    """Abre los destinos de escritura de procesados y rechazados.
+
+    En modo chunked la salida se mantiene en memoria; en modo spill se
+    escribe en archivos temporales del almacenamiento efímero.
+    """
+    if strategy is ExecutionStrategy.SPILL:
+        with (
+            tempfile.TemporaryFile(dir=settings.SPILL_DIR) as processed_sink,
+            tempfile.TemporaryFile(dir=settings.SPILL_DIR) as rejected_sink,
+        ):
+            yield processed_sink, rejected_sink
+    else:
+        yield BytesIO(), BytesIO()
+
+
+def _output_files(
+    s3: S3Service,
+    bucket: str,
+    key: str,
+    strategy: ExecutionStrategy,
+    uploaded: list[tuple[str, int]],
+    pending: Optional[list[tuple[str, str]]] = None,
+) -> OutputFiles:
+    """Crea el destino de una salida dividida en archivos.
+
+    Cada archivo se escribe en memoria, o en el almacenamiento efímero en
+    modo spill, y se sube a `<key sin extensión>-NNNNN.parquet` apenas se
+    completa. Las claves y tamaños subidos se agregan a `uploaded`.
+
+    Con `pending`, los archivos no se suben al completarse: se escriben en
+    SPILL_DIR y cada uno se agrega a `pending` como (clave, ruta) al
+    abrirse, para subirlos con `_upload_pending` o descartarlos con
+    `_discard_pending`.
+    """
+
+    def open_file() -> BinaryIO:
+        if pending is not None:
+            stream = tempfile.NamedTemporaryFile(dir=settings.SPILL_DIR, delete=False)
+            pending.append((build_part_key(key, len(pending)), stream.name))
+            return stream
+        if strategy is ExecutionStrategy.SPILL:
+            return tempfile.TemporaryFile(dir=settings.SPILL_DIR)
+        return BytesIO()
+
+    def publish_file(index: int, stream: BinaryIO) -> None:
+        if pending is not None:
+            return
+        part_key = build_part_key(key, index)
+        uploaded.append((part_key, _upload_sink(s3, bucket, part_key, stream)))
+
+    return OutputFiles(open_file, publish_file)
+
+
+def _upload_pending(
+    s3: S3Service,
+    bucket: str,
+    pending: list[tuple[str, str]],
+    uploaded: list[tuple[str, int]],
+) -> None:
+    """Sube los archivos retenidos por `_output_files` y los elimina del disco."""
+    while pending:
+        part_key, path = pending[0]
+        with open(path, "rb") as file:
+            uploaded.append((part_key, _upload_sink(s3, bucket, part_key, file)))
+        os.remove(path)
+        pending.pop(0)
+
+
+def _discard_pending(pending: Optional[list[tuple[str, str]]]) -> None:
+    """Elimina del disco los archivos retenidos que no llegaron a subirse."""
+    for _, path in pending or []:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _iter_parts(s3: S3Service, bucket: str, keys: list[str]) -> Iterator[BinaryIO]:
+    """Descarga de a uno los Parquet parciales de un lote a archivos temporales."""
+    for key in keys:
+        with tempfile.TemporaryFile(dir=settings.SPILL_DIR) as part:
+            s3.download_fileobj(bucket, key, part)
+            part.seek(0)
+            yield part
+
+
+def _upload_sink(s3: S3Service, bucket: str, key: str, sink: BinaryIO) -> int:
+    """Sube a S3 el contenido escrito en un destino de salida y devuelve su tamaño."""
+    size = sink.seek(0, os.SEEK_END)
+    sink.seek(0)
+    s3.upload_fileobj(bucket, key, sink)
+    return size
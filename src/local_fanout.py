@@ -0,0 +1,58 @@
+"""
+Driver local del modo distribuido.
+
+Ejecuta coordinador, workers y reductor en la máquina local, usando un
+pool de procesos en lugar de invocaciones de Lambda. Cada worker corre
+en un proceso nuevo (como una invocación en frío), por lo que el estado
+compartido con los workers debe pasar por S3.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Optional
+
+from lambda_function import coordinator_handler, reducer_handler, worker_handler
+
+logger = logging.getLogger(__name__)
+
+
+def run_fanout(
+    event: dict[str, Any],
+    max_workers: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+) -> dict[str, Any]:
+    """
+    Procesa un lote en modo distribuido con un pool de procesos local.
+
+    Args:
+        event: Evento S3 con la información del objeto que disparó el lote.
+        max_workers: Cantidad máxima de procesos worker simultáneos.
+        initializer: Función ejecutada al iniciar cada proceso worker; por
+            ejemplo, para configurar el S3Service que usan los handlers.
+        initargs: Argumentos de `initializer`.
+
+    Returns:
+        Respuesta del reductor, o la del coordinador si el lote fue ignorado.
+    """
+    coordination = coordinator_handler(event, None)
+    if "workers" not in coordination:
+        return coordination
+
+    workers = coordination["workers"]
+    logger.info(
+        "Ejecutando %d workers del lote '%s' en procesos locales.",
+        len(workers),
+        coordination["lote"],
+    )
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    ) as pool:
+        results = list(pool.map(worker_handler, workers, repeat(None)))
+
+    return reducer_handler({**coordination["reducer"], "shards": results}, None)
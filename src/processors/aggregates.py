@@ -0,0 +1,235 @@
+"""
+Módulo de agregados parciales (capa gold) por barrio y fecha de ingesta.
+
+Cada lote produce agregados parciales "mergeables" (conteos, sumas,
+mínimos/máximos y un sketch de cuantiles) que luego pueden combinarse en
+rollups diarios o mensuales sin volver a leer los datos de detalle.
+
+El sketch de cuantiles utiliza buckets logarítmicos con error relativo
+acotado (al estilo DDSketch): cada valor positivo se asigna al bucket
+ceil(log_gamma(x)) y la combinación de sketches es la suma de conteos
+por bucket.
+"""
+
+import math
+from collections import Counter
+from datetime import date
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+# Error relativo máximo de los cuantiles estimados por el sketch
+SKETCH_RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Columnas de los registros válidos necesarias para calcular los agregados
+AGGREGATE_INPUT_COLUMNS = [
+    "barrio",
+    "precio_por_noche",
+    "noches",
+    "checkin_date",
+    "checkout_date",
+    "puntaje",
+    "cantidad_reviews",
+]
+
+# Columnas que identifican a un agregado
+GROUP_COLUMNS = ["ingestion_date", "barrio"]
+
+# Columnas mergeables y la función con la que se combinan
+_SUM_COLUMNS = [
+    "registros",
+    "precio_por_noche_suma",
+    "noches_suma",
+    "puntaje_registros",
+    "puntaje_suma",
+    "reviews_suma",
+]
+_MIN_COLUMNS = ["precio_por_noche_min", "noches_min", "checkin_min", "puntaje_min"]
+_MAX_COLUMNS = ["precio_por_noche_max", "noches_max", "checkout_max", "puntaje_max"]
+
+
+def compute_partial_aggregates(
+    df: pd.DataFrame, ingestion_date: date
+) -> pd.DataFrame:
+    """
+    Calcula los agregados parciales por barrio de un lote ya validado.
+
+    Args:
+        df: DataFrame transformado con los registros válidos del lote.
+        ingestion_date: Fecha de ingesta del lote.
+
+    Returns:
+        DataFrame con una fila por barrio y las columnas mergeables
+        (conteos, sumas, mínimos/máximos y sketch de precio_por_noche).
+    """
+    rows = []
+    for barrio, group in df.groupby("barrio", dropna=False, sort=True):
+        precios = group["precio_por_noche"].to_numpy(dtype=float)
+        puntajes = group["puntaje"].dropna()
+        sketch_indices, sketch_counts = _build_sketch(precios)
+        rows.append(
+            {
+                "ingestion_date": ingestion_date,
+                "barrio": None if pd.isna(barrio) else barrio,
+                "registros": len(group),
+                "precio_por_noche_suma": float(precios.sum()),
+                "precio_por_noche_min": float(precios.min()),
+                "precio_por_noche_max": float(precios.max()),
+                "noches_suma": int(group["noches"].sum()),
+                "noches_min": int(group["noches"].min()),
+                "noches_max": int(group["noches"].max()),
+                "checkin_min": group["checkin_date"].min(),
+                "checkout_max": group["checkout_date"].max(),
+                "puntaje_registros": len(puntajes),
+                "puntaje_suma": float(puntajes.sum()),
+                "puntaje_min": float(puntajes.min()) if len(puntajes) else np.nan,
+                "puntaje_max": float(puntajes.max()) if len(puntajes) else np.nan,
+                "reviews_suma": float(group["cantidad_reviews"].sum()),
+                "sketch_indices": sketch_indices,
+                "sketch_counts": sketch_counts,
+            }
+        )
+
+    columns = [
+        *GROUP_COLUMNS,
+        *_SUM_COLUMNS,
+        *_MIN_COLUMNS,
+        *_MAX_COLUMNS,
+        "sketch_indices",
+        "sketch_counts",
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def merge_partial_aggregates(
+    partials: list[pd.DataFrame], granularity: Literal["day", "month"] = "day"
+) -> pd.DataFrame:
+    """
+    Combina agregados parciales en rollups diarios o mensuales.
+
+    El resultado conserva las columnas mergeables, por lo que puede volver
+    a combinarse (por ejemplo, rollups diarios en un rollup mensual).
+
+    Args:
+        partials: Lista de DataFrames de agregados parciales o rollups previos.
+        granularity: "day" agrupa por fecha de ingesta, "month" por el
+            primer día del mes de ingesta.
+
+    Returns:
+        DataFrame con una fila por período y barrio.
+
+    Raises:
+        ValueError: Si la granularidad no es soportada.
+    """
+    if granularity not in ("day", "month"):
+        raise ValueError(f"Granularidad no soportada: '{granularity}'.")
+
+    combined = pd.concat(partials, ignore_index=True)
+    combined["ingestion_date"] = pd.to_datetime(combined["ingestion_date"])
+    if granularity == "month":
+        combined["ingestion_date"] = combined["ingestion_date"].dt.to_period(
+            "M"
+        ).dt.to_timestamp()
+    combined["ingestion_date"] = combined["ingestion_date"].dt.date
+    combined["barrio"] = combined["barrio"].astype(object)
+
+    grouped = combined.groupby(GROUP_COLUMNS, dropna=False, sort=True)
+    merged = grouped.agg(
+        {
+            **{column: "sum" for column in _SUM_COLUMNS},
+            **{column: "min" for column in _MIN_COLUMNS},
+            **{column: "max" for column in _MAX_COLUMNS},
+        }
+    )
+
+    sketches = grouped.apply(
+        lambda group: _merge_sketches(group["sketch_indices"], group["sketch_counts"]),
+        include_groups=False,
+    )
+    merged["sketch_indices"] = [indices for indices, _ in sketches]
+    merged["sketch_counts"] = [counts for _, counts in sketches]
+
+    return merged.reset_index()
+
+
+def summarize_aggregates(aggregates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deriva las métricas finales de consumo a partir de agregados mergeables.
+
+    Args:
+        aggregates: DataFrame de agregados parciales o de un rollup.
+
+    Returns:
+        DataFrame con período, barrio y métricas de precio, estadía y reviews.
+    """
+    summary = aggregates[GROUP_COLUMNS].copy()
+    summary["registros"] = aggregates["registros"]
+    summary["precio_por_noche_promedio"] = (
+        aggregates["precio_por_noche_suma"] / aggregates["registros"]
+    )
+    summary["precio_por_noche_mediana"] = [
+        sketch_quantile(indices, counts, 0.5)
+        for indices, counts in zip(
+            aggregates["sketch_indices"], aggregates["sketch_counts"]
+        )
+    ]
+    summary["precio_por_noche_min"] = aggregates["precio_por_noche_min"]
+    summary["precio_por_noche_max"] = aggregates["precio_por_noche_max"]
+    summary["noches_promedio"] = aggregates["noches_suma"] / aggregates["registros"]
+    summary["checkin_min"] = aggregates["checkin_min"]
+    summary["checkout_max"] = aggregates["checkout_max"]
+    summary["puntaje_promedio"] = aggregates["puntaje_suma"] / aggregates[
+        "puntaje_registros"
+    ].replace(0, np.nan)
+    summary["reviews_suma"] = aggregates["reviews_suma"]
+    return summary
+
+
+def sketch_quantile(indices, counts, quantile: float) -> float:
+    """
+    Estima un cuantil a partir de un sketch de buckets logarítmicos.
+
+    Args:
+        indices: Índices de bucket del sketch.
+        counts: Cantidad de valores en cada bucket.
+        quantile: Cuantil a estimar, entre 0 y 1.
+
+    Returns:
+        Valor estimado del cuantil, o NaN si el sketch está vacío.
+    """
+    total = int(np.sum(counts)) if len(counts) else 0
+    if total == 0:
+        return float("nan")
+
+    order = np.argsort(indices)
+    sorted_indices = np.asarray(indices)[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    rank = quantile * (total - 1)
+    position = int(np.searchsorted(cumulative, rank, side="right"))
+    index = int(sorted_indices[min(position, len(sorted_indices) - 1)])
+    return 2 * _GAMMA**index / (_GAMMA + 1)
+
+
+def _build_sketch(values: np.ndarray) -> tuple[list[int], list[int]]:
+    """Construye el sketch de buckets logarítmicos de valores positivos."""
+    values = values[np.isfinite(values) & (values > 0)]
+    if len(values) == 0:
+        return [], []
+    bucket_indices = np.ceil(np.log(values) / _LOG_GAMMA).astype(np.int64)
+    unique, counts = np.unique(bucket_indices, return_counts=True)
+    return unique.tolist(), counts.tolist()
+
+
+def _merge_sketches(
+    indices_series: pd.Series, counts_series: pd.Series
+) -> tuple[list[int], list[int]]:
+    """Combina varios sketches sumando los conteos por bucket."""
+    merged: Counter[int] = Counter()
+    for indices, counts in zip(indices_series, counts_series):
+        for index, count in zip(indices, counts):
+            merged[int(index)] += int(count)
+    ordered = sorted(merged)
+    return ordered, [merged[index] for index in ordered]
@@ -4,11 +4,176 @@ Combina múltiples DataFrames, aplica transformaciones y separa
 registros válidos de rechazados según reglas de calidad de datos.
 """
 
+import inspect
+import logging
+from dataclasses import dataclass, field, replace
+from datetime import date
+from functools import partial
 from io import BytesIO
+from typing import Any, BinaryIO, Callable, Iterable, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-from processors.transformations import apply_transformations
+from config import settings
+from processors.aggregates import (
+    AGGREGATE_INPUT_COLUMNS,
+    compute_partial_aggregates,
+    merge_partial_aggregates,
+)
+from processors.hotel_dimension import (
+    FACT_SCHEMA,
+    HOTEL_DIMENSION_SCHEMA,
+    deduplicate_hotels,
+    fact_column,
+    fact_sort_keys,
+    split_hotels,
+)
+from processors.price_history import OBSERVATION_COLUMNS
+from processors.spill import ArrowSpillFile
+from processors.transformations import (
+    TRANSFORMED_SCHEMA,
+    apply_transformations,
+    to_arrow_table,
+)
+from utils.partition_utils import assign_buckets
+from utils.profiling import NULL_PROFILER, StageProfiler
+
+logger = logging.getLogger(__name__)
+
+# Row groups por archivo al dividir la salida sin un tamaño de row group fijo
+_ROW_GROUPS_PER_TARGET_FILE = 4
+
+# Los bloom filters requieren una versión de pyarrow que los soporte al escribir
+_SUPPORTS_BLOOM_FILTERS = (
+    "bloom_filter_options" in inspect.signature(pq.ParquetWriter.__init__).parameters
+)
+
+
+@dataclass(frozen=True)
+class OutputLayout:
+    """
+    Layout físico de los Parquet de salida.
+
+    Ordenar por columnas de filtrado frecuente y acotar el tamaño de los
+    row groups hace que sus estadísticas mínimo/máximo cubran rangos
+    estrechos, de modo que los lectores puedan descartar row groups. Los
+    bloom filters permiten descartarlos también en búsquedas por igualdad
+    sobre columnas de alta cardinalidad, donde mínimo/máximo no sirven.
+
+    Al escribir sobre un destino OutputFiles, la salida se divide en
+    archivos de `target_file_bytes` como máximo (aproximado, al cierre de
+    un row group) y, con `distribution_key`, las filas se reparten por hash
+    de esa columna entre `distribution_buckets` grupos de archivos.
+    """
+
+    sort_keys: tuple[str, ...] = ()
+    row_group_rows: Optional[int] = None
+    bloom_filter_columns: tuple[str, ...] = ()
+    bloom_filter_fpp: float = 0.01
+    target_file_bytes: Optional[int] = None
+    distribution_key: Optional[str] = None
+    distribution_buckets: int = 1
+
+    @property
+    def splits_files(self) -> bool:
+        """Indica si la salida se divide en varios archivos."""
+        return self.target_file_bytes is not None or self.distribution_key is not None
+
+    @classmethod
+    def from_settings(cls) -> "OutputLayout":
+        """Construye el layout clusterizado definido en la configuración."""
+        return cls(
+            sort_keys=settings.OUTPUT_SORT_KEYS,
+            row_group_rows=settings.OUTPUT_ROW_GROUP_ROWS,
+            bloom_filter_columns=settings.OUTPUT_BLOOM_FILTER_COLUMNS,
+            bloom_filter_fpp=settings.OUTPUT_BLOOM_FILTER_FPP,
+        )
+
+
+class OutputFiles:
+    """
+    Destino de una salida dividida en varios archivos Parquet.
+
+    Cada archivo se escribe sobre un stream creado por `open_file` y, al
+    completarse, se entrega a `publish_file` junto con su número (desde 0,
+    en orden de apertura) para que pueda subirse y descartarse sin esperar
+    al resto del lote. El stream se cierra después de publicarlo.
+    """
+
+    def __init__(
+        self,
+        open_file: Callable[[], BinaryIO],
+        publish_file: Callable[[int, BinaryIO], None],
+    ) -> None:
+        """
+        Args:
+            open_file: Crea el stream de escritura de un archivo nuevo.
+            publish_file: Recibe el número y el stream de un archivo completo.
+        """
+        self._open_file = open_file
+        self._publish_file = publish_file
+        self.files_opened = 0
+
+    def open(self) -> tuple[int, BinaryIO]:
+        """Abre el siguiente archivo y devuelve su número y su stream."""
+        index = self.files_opened
+        self.files_opened += 1
+        return index, self._open_file()
+
+    def publish(self, index: int, stream: BinaryIO) -> None:
+        """Publica un archivo completo y cierra su stream."""
+        try:
+            stream.seek(0)
+            self._publish_file(index, stream)
+        finally:
+            stream.close()
+
+
+@dataclass(frozen=True)
+class OutputStats:
+    """
+    Estadísticas de una salida del lote: cantidad de filas y mínimo/máximo
+    de las columnas configuradas en CATALOG_STATS_COLUMNS.
+    """
+
+    rows: int = 0
+    min_max: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StreamResult:
+    """
+    Resultado del procesamiento de un lote escrito sobre streams de salida.
+    """
+
+    aggregates: bytes
+    processed_stats: OutputStats
+    rejected_stats: OutputStats
+    # Hoteles del lote (HOTEL_DIMENSION_SCHEMA), con la dimensión habilitada
+    hotels: Optional[pa.Table] = None
+    # Precios de los procesados (OBSERVATION_COLUMNS), con la tabla histórica
+    observations: Optional[pa.Table] = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    Resultado del procesamiento de un lote en formato Parquet.
+    """
+
+    processed: bytes
+    rejected: bytes
+    aggregates: bytes
+    processed_stats: OutputStats
+    rejected_stats: OutputStats
+    # Hoteles del lote (HOTEL_DIMENSION_SCHEMA), con la dimensión habilitada
+    hotels: Optional[pa.Table] = None
+    # Precios de los procesados (OBSERVATION_COLUMNS), con la tabla histórica
+    observations: Optional[pa.Table] = None
 
 
 class BatchProcessor:
@@ -16,6 +181,50 @@ class BatchProcessor:
     Procesador que unifica, transforma y clasifica lotes de datos hoteleros.
     """
 
+    def __init__(
+        self,
+        profiler: StageProfiler = NULL_PROFILER,
+        layout: Optional[OutputLayout] = None,
+        hotel_dimension: bool = False,
+        price_history: bool = False,
+    ) -> None:
+        """
+        Args:
+            profiler: Perfilador de la invocación. Mide la etapa
+                "apply_transformations" si fue solicitada.
+            layout: Layout de los Parquet de salida. None escribe las filas
+                en orden de llegada, con los row groups por defecto.
+            hotel_dimension: Si es True, los procesados se escriben como
+                hechos (FACT_SCHEMA: hotel_id y columnas numéricas y de
+                fecha) y los atributos de los hoteles del lote se devuelven
+                en el campo `hotels` del resultado. No aplica a
+                `process_batch`. En los hechos, las claves de orden que son
+                atributos del hotel pasan a hotel_id, al igual que las de
+                bloom filters y distribución que referencian link_detalle;
+                las demás se omiten.
+            price_history: Si es True, el resultado incluye en `observations`
+                las columnas de precios de los procesados (OBSERVATION_COLUMNS)
+                para actualizar la tabla histórica sin releer la salida.
+
+        Raises:
+            ValueError: Si la clave de distribución del layout es un
+                atributo del hotel sin equivalente en los hechos.
+        """
+        self._profiler = profiler
+        self._layout = layout or OutputLayout()
+        self._hotel_dimension = hotel_dimension
+        self._price_history = price_history
+        distribution_key = self._layout.distribution_key
+        if hotel_dimension and distribution_key and not fact_column(distribution_key):
+            raise ValueError(
+                f"La clave de distribución '{distribution_key}' no existe en los "
+                "hechos de la dimensión de hoteles."
+            )
+        if self._layout.bloom_filter_columns and not _SUPPORTS_BLOOM_FILTERS:
+            logger.warning(
+                "La versión de pyarrow no soporta bloom filters. Se omiten."
+            )
+
     def process_batch(self, dataframes: list[pd.DataFrame]) -> tuple[bytes, bytes]:
         """
         Procesa un lote de DataFrames aplicando transformaciones y reglas de rechazo.
@@ -31,26 +240,539 @@ class BatchProcessor:
             Tupla con (bytes_procesados_parquet, bytes_rechazados_parquet).
         """
         combined_df = pd.concat(dataframes, ignore_index=True)
-        transformed_df = apply_transformations(combined_df)
-
-        # Reglas de rechazo: precio positivo, al menos 1 noche,
-        # y puntaje dentro de rango válido (0-10) o ausente
-        valid_mask = (
-            (transformed_df["precio_final"] > 0)
-            & (transformed_df["noches"] > 0)
-            & (
-                transformed_df["puntaje"].isna()
-                | ((transformed_df["puntaje"] >= 0) & (transformed_df["puntaje"] <= 10))
+        table = self._transform(combined_df)
+        processed_table, rejected_table = _split(self._cluster(table))
+        return (
+            self._table_to_parquet_bytes(processed_table),
+            self._table_to_parquet_bytes(rejected_table),
+        )
+
+    def process(
+        self, dataframes: list[pd.DataFrame], ingestion_date: date
+    ) -> BatchResult:
+        """
+        Procesa un lote y calcula sus agregados parciales en la misma pasada.
+
+        Además de separar registros válidos y rechazados, calcula sobre los
+        registros válidos los agregados parciales por barrio (capa gold),
+        que luego pueden combinarse sin releer los datos de detalle.
+
+        Args:
+            dataframes: Lista de DataFrames con datos crudos de hoteles.
+            ingestion_date: Fecha de ingesta del lote.
+
+        Returns:
+            BatchResult con los Parquet de procesados, rechazados y agregados,
+            y las estadísticas de procesados y rechazados.
+        """
+        combined_df = pd.concat(dataframes, ignore_index=True)
+        processed_sink = BytesIO()
+        rejected_sink = BytesIO()
+
+        result = self.process_stream(
+            [combined_df], ingestion_date, processed_sink, rejected_sink
+        )
+
+        return BatchResult(
+            processed=processed_sink.getvalue(),
+            rejected=rejected_sink.getvalue(),
+            aggregates=result.aggregates,
+            processed_stats=result.processed_stats,
+            rejected_stats=result.rejected_stats,
+            hotels=result.hotels,
+            observations=result.observations,
+        )
+
+    def process_stream(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        ingestion_date: date,
+        processed_sink: BinaryIO | OutputFiles,
+        rejected_sink: BinaryIO | OutputFiles,
+    ) -> StreamResult:
+        """
+        Procesa un lote recibido en chunks escribiendo la salida incrementalmente.
+
+        Cada chunk se transforma, valida y escribe como row group en los
+        Parquet de procesados y rechazados, por lo que en memoria solo se
+        mantiene un chunk a la vez. Los agregados parciales de cada chunk se
+        combinan al final. Con un layout ordenado, cada chunk se ordena por
+        separado.
+
+        Args:
+            chunks: Iterable de DataFrames con datos crudos de hoteles.
+            ingestion_date: Fecha de ingesta del lote.
+            processed_sink: Stream de escritura para el Parquet de procesados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+            rejected_sink: Stream de escritura para el Parquet de rechazados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+
+        Returns:
+            StreamResult con los agregados parciales del lote y las
+            estadísticas de procesados y rechazados.
+        """
+        tables = (self._transform(chunk) for chunk in chunks)
+        return self._write_outputs(tables, ingestion_date, processed_sink, rejected_sink)
+
+    def process_spilled(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        ingestion_date: date,
+        processed_sink: BinaryIO | OutputFiles,
+        rejected_sink: BinaryIO | OutputFiles,
+        spill_dir: str,
+    ) -> StreamResult:
+        """
+        Procesa un lote con spill intermedio a Arrow IPC en almacenamiento efímero.
+
+        En una primera pasada cada chunk se transforma y se vuelca a un
+        archivo Arrow IPC en `spill_dir`. En la segunda, la validación y la
+        escritura de los Parquet leen ese archivo mediante memory mapping,
+        por lo que el consumo de memoria queda acotado al tamaño de un chunk.
+        La salida es equivalente a la de `process_stream`, salvo que con un
+        layout ordenado el orden es global al lote y no por chunk.
+
+        Args:
+            chunks: Iterable de DataFrames con datos crudos de hoteles.
+            ingestion_date: Fecha de ingesta del lote.
+            processed_sink: Stream de escritura para el Parquet de procesados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+            rejected_sink: Stream de escritura para el Parquet de rechazados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+            spill_dir: Directorio de almacenamiento efímero para el spill.
+
+        Returns:
+            StreamResult con los agregados parciales del lote y las
+            estadísticas de procesados y rechazados.
+        """
+        with ArrowSpillFile(spill_dir) as spill:
+            for chunk in chunks:
+                spill.write(self._transform(chunk))
+
+            if self._layout.sort_keys:
+                # Orden global sobre el archivo mapeado, sin cargarlo en memoria
+                tables = spill.iter_sorted_batches(
+                    self._layout.sort_keys,
+                    self._layout.row_group_rows or settings.CSV_CHUNK_ROWS,
+                )
+            else:
+                tables = spill.iter_batches()
+
+            return self._write_outputs(
+                tables, ingestion_date, processed_sink, rejected_sink, presorted=True
+            )
+
+    def merge_parts(
+        self,
+        processed_parts: Iterable[BinaryIO],
+        rejected_parts: Iterable[BinaryIO],
+        aggregate_parts: Iterable[pd.DataFrame],
+        ingestion_date: date,
+        processed_sink: BinaryIO | OutputFiles,
+        rejected_sink: BinaryIO | OutputFiles,
+    ) -> StreamResult:
+        """
+        Combina las salidas parciales de varios shards de un mismo lote.
+
+        Los row groups de cada Parquet parcial se copian en orden a la
+        salida final, sin volver a transformar ni validar, y las
+        estadísticas se recalculan durante la copia. Los agregados
+        parciales se combinan como los de los chunks de un único proceso.
+
+        Args:
+            processed_parts: Parquet parciales de procesados, en orden de shard.
+            rejected_parts: Parquet parciales de rechazados, en orden de shard.
+            aggregate_parts: Agregados parciales de cada shard.
+            ingestion_date: Fecha de ingesta del lote.
+            processed_sink: Stream de escritura para el Parquet de procesados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+            rejected_sink: Stream de escritura para el Parquet de rechazados,
+                u OutputFiles para dividirlo en varios archivos según el layout.
+
+        Returns:
+            StreamResult con los agregados del lote y las estadísticas de
+            procesados y rechazados.
+        """
+        processed_stats = _StatsAccumulator(settings.CATALOG_STATS_COLUMNS)
+        rejected_stats = _StatsAccumulator(settings.CATALOG_STATS_COLUMNS)
+        hotel_parts: list[pa.Table] = []
+        observation_parts: list[pa.Table] = []
+        with self._open_output(
+            processed_sink, self._processed_schema
+        ) as processed_writer:
+            _copy_parts(
+                processed_parts,
+                processed_writer,
+                processed_stats,
+                partial(
+                    self._to_output,
+                    hotel_parts=hotel_parts,
+                    observation_parts=observation_parts,
+                ),
             )
+        with self._open_output(rejected_sink) as rejected_writer:
+            _copy_parts(rejected_parts, rejected_writer, rejected_stats)
+
+        aggregates_df = _combine_partials(list(aggregate_parts), ingestion_date)
+        return StreamResult(
+            aggregates=_to_parquet_bytes(aggregates_df),
+            processed_stats=processed_stats.result(),
+            rejected_stats=rejected_stats.result(),
+            hotels=self._combine_hotels(hotel_parts),
+            observations=self._combine_observations(observation_parts),
+        )
+
+    @property
+    def _processed_schema(self) -> pa.Schema:
+        """Esquema de los Parquet de procesados."""
+        return FACT_SCHEMA if self._hotel_dimension else TRANSFORMED_SCHEMA
+
+    def _to_output(
+        self,
+        table: pa.Table,
+        hotel_parts: list[pa.Table],
+        observation_parts: list[pa.Table],
+    ) -> pa.Table:
+        """Prepara procesados para escribirse, guardando precios y hoteles.
+
+        Guarda las observaciones de precios si la tabla histórica está
+        habilitada y, con la dimensión de hoteles, convierte los procesados
+        en hechos (ordenados por las claves de `fact_sort_keys`) y guarda
+        sus hoteles.
+        """
+        if self._price_history:
+            observation_parts.append(table.select(OBSERVATION_COLUMNS))
+        if not self._hotel_dimension:
+            return table
+        facts, hotels = split_hotels(table)
+        hotel_parts.append(hotels)
+        if self._layout.sort_keys:
+            facts = facts.sort_by(
+                [(key, "ascending") for key in fact_sort_keys(self._layout.sort_keys)]
+            )
+        return facts
+
+    def _combine_hotels(self, hotel_parts: list[pa.Table]) -> Optional[pa.Table]:
+        """Combina los hoteles de cada chunk en los del lote."""
+        if not self._hotel_dimension:
+            return None
+        if not hotel_parts:
+            return HOTEL_DIMENSION_SCHEMA.empty_table()
+        return deduplicate_hotels(pa.concat_tables(hotel_parts))
+
+    def _combine_observations(
+        self, observation_parts: list[pa.Table]
+    ) -> Optional[pa.Table]:
+        """Combina las observaciones de precios de cada chunk en las del lote."""
+        if not self._price_history:
+            return None
+        if not observation_parts:
+            return TRANSFORMED_SCHEMA.empty_table().select(OBSERVATION_COLUMNS)
+        return pa.concat_tables(observation_parts)
+
+    def _cluster(self, table: pa.Table) -> pa.Table:
+        """Ordena una tabla por las claves del layout, si las hay."""
+        if not self._layout.sort_keys:
+            return table
+        return table.sort_by([(key, "ascending") for key in self._layout.sort_keys])
+
+    def _open_writer(
+        self, sink: BinaryIO, schema: pa.Schema = TRANSFORMED_SCHEMA
+    ) -> pq.ParquetWriter:
+        """Abre un writer Parquet con el esquema indicado y el layout configurado."""
+        options: dict[str, Any] = {}
+        layout = self._layout
+        to_column = fact_column if schema is FACT_SCHEMA else (lambda column: column)
+
+        sort_keys = layout.sort_keys
+        if schema is FACT_SCHEMA:
+            sort_keys = fact_sort_keys(sort_keys)
+        if sort_keys:
+            options["sorting_columns"] = [
+                pq.SortingColumn(schema.get_field_index(key)) for key in sort_keys
+            ]
+
+        bloom_filter_columns = [
+            column
+            for column in map(to_column, layout.bloom_filter_columns)
+            if column is not None
+        ]
+        if bloom_filter_columns and _SUPPORTS_BLOOM_FILTERS:
+            bloom_filter: dict[str, Any] = {"fpp": layout.bloom_filter_fpp}
+            if layout.row_group_rows:
+                bloom_filter["ndv"] = layout.row_group_rows
+            options["bloom_filter_options"] = {
+                column: bloom_filter for column in bloom_filter_columns
+            }
+        return pq.ParquetWriter(sink, schema, **options)
+
+    def _open_output(
+        self, sink: BinaryIO | OutputFiles, schema: pa.Schema = TRANSFORMED_SCHEMA
+    ) -> "pq.ParquetWriter | _SplitWriter":
+        """Abre el writer de una salida: un único Parquet o varios archivos."""
+        if not isinstance(sink, OutputFiles):
+            return self._open_writer(sink, schema)
+        layout = self._layout
+        if schema is FACT_SCHEMA and layout.distribution_key:
+            layout = replace(
+                layout, distribution_key=fact_column(layout.distribution_key)
+            )
+        return _SplitWriter(sink, layout, partial(self._open_writer, schema=schema))
+
+    def _table_to_parquet_bytes(self, table: pa.Table) -> bytes:
+        """Serializa una tabla Arrow a Parquet en memoria según el layout."""
+        buffer = BytesIO()
+        with self._open_writer(buffer) as writer:
+            writer.write_table(table, row_group_size=self._layout.row_group_rows)
+        return buffer.getvalue()
+
+    def _transform(self, df: pd.DataFrame) -> pa.Table:
+        """Aplica las transformaciones de negocio y convierte a tabla Arrow."""
+        with self._profiler.stage("apply_transformations"):
+            return to_arrow_table(apply_transformations(df))
+
+    def _write_outputs(
+        self,
+        tables: Iterable[pa.Table],
+        ingestion_date: date,
+        processed_sink: BinaryIO | OutputFiles,
+        rejected_sink: BinaryIO | OutputFiles,
+        presorted: bool = False,
+    ) -> StreamResult:
+        """Valida tablas transformadas y escribe procesados, rechazados y agregados.
+
+        Salvo que `presorted` indique que ya vienen ordenadas, cada tabla se
+        ordena según el layout antes de escribirse.
+        """
+        partials: list[pd.DataFrame] = []
+        hotel_parts: list[pa.Table] = []
+        observation_parts: list[pa.Table] = []
+        processed_stats = _StatsAccumulator(settings.CATALOG_STATS_COLUMNS)
+        rejected_stats = _StatsAccumulator(settings.CATALOG_STATS_COLUMNS)
+
+        with (
+            self._open_output(
+                processed_sink, self._processed_schema
+            ) as processed_writer,
+            self._open_output(rejected_sink) as rejected_writer,
+        ):
+            for table in tables:
+                if not presorted:
+                    table = self._cluster(table)
+                processed_table, rejected_table = _split(table)
+                processed_stats.update(processed_table)
+                rejected_stats.update(rejected_table)
+                partials.append(
+                    compute_partial_aggregates(
+                        processed_table.select(AGGREGATE_INPUT_COLUMNS).to_pandas(),
+                        ingestion_date,
+                    )
+                )
+                _write_table(
+                    processed_writer,
+                    self._to_output(processed_table, hotel_parts, observation_parts),
+                    self._layout.row_group_rows,
+                )
+                _write_table(
+                    rejected_writer, rejected_table, self._layout.row_group_rows
+                )
+
+        aggregates_df = _combine_partials(partials, ingestion_date)
+        return StreamResult(
+            aggregates=_to_parquet_bytes(aggregates_df),
+            processed_stats=processed_stats.result(),
+            rejected_stats=rejected_stats.result(),
+            hotels=self._combine_hotels(hotel_parts),
+            observations=self._combine_observations(observation_parts),
         )
 
-        processed_df = transformed_df[valid_mask]
-        rejected_df = transformed_df[~valid_mask]
 
-        processed_buffer = BytesIO()
-        rejected_buffer = BytesIO()
+class _StatsAccumulator:
+    """Acumula filas y mínimo/máximo por columna a lo largo de varios chunks."""
+
+    def __init__(self, columns: tuple[str, ...]) -> None:
+        self._columns = columns
+        self._rows = 0
+        self._min_max: dict[str, tuple[Any, Any]] = {}
+
+    def update(self, table: pa.Table) -> None:
+        self._rows += table.num_rows
+        for column in self._columns:
+            chunk_min_max = pc.min_max(table[column]).as_py()
+            low, high = chunk_min_max["min"], chunk_min_max["max"]
+            if low is None:
+                continue
+            if column in self._min_max:
+                current_low, current_high = self._min_max[column]
+                low, high = min(low, current_low), max(high, current_high)
+            self._min_max[column] = (low, high)
+
+    def result(self) -> OutputStats:
+        return OutputStats(rows=self._rows, min_max=dict(self._min_max))
+
+
+class _SplitWriter:
+    """Writer que reparte una salida en archivos Parquet de tamaño objetivo.
+
+    Expone `write_table` como ParquetWriter. Cada grupo de hash mantiene
+    un archivo abierto; cuando su tamaño escrito alcanza el objetivo, el
+    archivo se cierra y se publica, y el siguiente row group del grupo
+    abre uno nuevo. Así, todas las filas de un mismo valor de la clave de
+    distribución quedan en archivos de un único grupo.
+    """
+
+    def __init__(
+        self,
+        files: OutputFiles,
+        layout: OutputLayout,
+        open_writer: Callable[[BinaryIO], pq.ParquetWriter],
+    ) -> None:
+        self._files = files
+        self._open_writer = open_writer
+        self._target_bytes = layout.target_file_bytes
+        self._key = layout.distribution_key
+        self._buckets = layout.distribution_buckets if layout.distribution_key else 1
+        self._current: dict[int, tuple[int, BinaryIO, pq.ParquetWriter]] = {}
+        self._bytes_per_row: Optional[float] = None
+
+    def write_table(
+        self, table: pa.Table, row_group_size: Optional[int] = None
+    ) -> None:
+        if self._key is None or self._buckets == 1:
+            self._write_bucket(0, table, row_group_size)
+            return
+        buckets = assign_buckets(table[self._key].to_pandas(), self._buckets)
+        for bucket in np.unique(buckets):
+            rows = table.filter(pa.array(buckets == bucket))
+            self._write_bucket(int(bucket), rows, row_group_size)
+
+    def close(self) -> None:
+        if not self._files.files_opened:
+            # Salida sin filas: se publica un único Parquet vacío
+            self._open(0)
+        for bucket in sorted(self._current):
+            self._close(bucket)
+
+    def __enter__(self) -> "_SplitWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Ante un error no se publican archivos incompletos
+        for _, stream, writer in self._current.values():
+            writer.close()
+            stream.close()
+        self._current.clear()
+
+    def _write_bucket(
+        self, bucket: int, table: pa.Table, row_group_size: Optional[int]
+    ) -> None:
+        offset = 0
+        while offset < table.num_rows:
+            step = row_group_size or self._estimate_row_group_rows(table)
+            rows = table.slice(offset, step)
+            _, stream, writer = self._current.get(bucket) or self._open(bucket)
+            start = stream.tell()
+            writer.write_table(rows, row_group_size=step)
+            self._bytes_per_row = (stream.tell() - start) / rows.num_rows
+            offset += step
+            if self._target_bytes and stream.tell() >= self._target_bytes:
+                self._close(bucket)
+
+    def _estimate_row_group_rows(self, table: pa.Table) -> int:
+        """Filas por row group cuando el layout no las fija.
+
+        Los archivos solo pueden cerrarse entre row groups, por lo que con
+        un tamaño objetivo la tabla se divide en row groups de una fracción
+        del objetivo. Los bytes por fila se toman del último row group
+        escrito o, antes del primero, del tamaño en memoria de la tabla.
+        """
+        if not self._target_bytes:
+            return table.num_rows
+        bytes_per_row = self._bytes_per_row or table.nbytes / table.num_rows
+        target_group_bytes = self._target_bytes / _ROW_GROUPS_PER_TARGET_FILE
+        return max(int(target_group_bytes / max(bytes_per_row, 1)), 1)
+
+    def _open(self, bucket: int) -> tuple[int, BinaryIO, pq.ParquetWriter]:
+        index, stream = self._files.open()
+        self._current[bucket] = (index, stream, self._open_writer(stream))
+        return self._current[bucket]
+
+    def _close(self, bucket: int) -> None:
+        index, stream, writer = self._current.pop(bucket)
+        writer.close()
+        self._files.publish(index, stream)
+
+
+def _split(table: pa.Table) -> tuple[pa.Table, pa.Table]:
+    """Separa los registros válidos de los rechazados de una tabla transformada."""
+    # Reglas de rechazo: precio positivo, al menos 1 noche,
+    # y puntaje dentro de rango válido (0-10) o ausente
+    puntaje = table["puntaje"]
+    valid_mask = pc.and_kleene(
+        pc.and_kleene(
+            pc.greater(table["precio_final"], 0), pc.greater(table["noches"], 0)
+        ),
+        pc.or_kleene(
+            pc.is_null(puntaje, nan_is_null=True),
+            pc.and_kleene(
+                pc.greater_equal(puntaje, 0), pc.less_equal(puntaje, 10)
+            ),
+        ),
+    )
+    # Un valor ausente en precio o noches invalida el registro
+    valid_mask = pc.fill_null(valid_mask, False)
+
+    return table.filter(valid_mask), table.filter(pc.invert(valid_mask))
+
+
+def _write_table(
+    writer: pq.ParquetWriter | _SplitWriter,
+    table: pa.Table,
+    row_group_rows: Optional[int] = None,
+) -> None:
+    """Escribe una tabla en el writer omitiendo chunks vacíos."""
+    if table.num_rows:
+        writer.write_table(table, row_group_size=row_group_rows)
+
+
+def _copy_parts(
+    parts: Iterable[BinaryIO],
+    writer: pq.ParquetWriter | _SplitWriter,
+    stats: _StatsAccumulator,
+    transform: Optional[Callable[[pa.Table], pa.Table]] = None,
+) -> None:
+    """Copia los row groups de varios Parquet parciales a la salida final.
+
+    Las estadísticas se calculan sobre cada row group leído; `transform`
+    se aplica después, antes de escribirlo.
+    """
+    for part in parts:
+        parquet_file = pq.ParquetFile(part)
+        for index in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(index)
+            stats.update(table)
+            _write_table(writer, transform(table) if transform else table)
+
+
+def _combine_partials(
+    partials: list[pd.DataFrame], ingestion_date: date
+) -> pd.DataFrame:
+    """Combina los agregados parciales de cada chunk en los del lote."""
+    non_empty = [partial for partial in partials if not partial.empty]
+    if len(non_empty) == 1:
+        return non_empty[0]
+    if not non_empty:
+        return compute_partial_aggregates(
+            pd.DataFrame(columns=AGGREGATE_INPUT_COLUMNS), ingestion_date
+        )
+    return merge_partial_aggregates(non_empty, granularity="day")
 
-        processed_df.to_parquet(processed_buffer, index=False)
-        rejected_df.to_parquet(rejected_buffer, index=False)
 
-        return processed_buffer.getvalue(), rejected_buffer.getvalue()
+def _to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Serializa un DataFrame a Parquet en memoria."""
+    buffer = BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
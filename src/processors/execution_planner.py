@@ -0,0 +1,161 @@
+"""
+Módulo que contiene el planificador de ejecución de lotes.
+
+Decide, a partir del tamaño de los objetos de entrada informado por el
+listado de S3, si un lote se procesa completamente en memoria, en chunks
+por streaming o con spill a almacenamiento efímero en /tmp. En el modo
+distribuido, además reparte los archivos de un lote en shards.
+"""
+
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from config import settings
+from services.s3_service import S3ObjectInfo
+from utils.compression_utils import detect_compression
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionStrategy(str, Enum):
+    """Estrategias de ejecución disponibles para un lote."""
+
+    IN_MEMORY = "in_memory"
+    CHUNKED = "chunked"
+    SPILL = "spill"
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    Plan de ejecución de un lote y la estimación que lo justifica.
+    """
+
+    strategy: ExecutionStrategy
+    input_bytes: int
+    estimated_memory_bytes: int
+    memory_limit_bytes: int
+    overridden: bool = False
+
+
+def estimate_memory_bytes(obj: S3ObjectInfo) -> int:
+    """
+    Estima la memoria que ocuparía un CSV crudo una vez cargado en pandas.
+
+    Args:
+        obj: Metadatos del objeto en S3.
+
+    Returns:
+        Cantidad estimada de bytes en memoria.
+    """
+    expansion = settings.CSV_MEMORY_EXPANSION
+    if detect_compression(obj.key) is not None:
+        expansion *= settings.COMPRESSED_CSV_RATIO
+    return int(obj.size * expansion)
+
+
+def plan_execution(
+    objects: list[S3ObjectInfo],
+    memory_limit_mb: Optional[int] = None,
+    override: Optional[str] = None,
+) -> ExecutionPlan:
+    """
+    Elige la estrategia de ejecución de un lote según su tamaño estimado.
+
+    Reglas:
+        - En memoria si la estimación no supera IN_MEMORY_MAX_FRACTION de
+          la memoria disponible.
+        - Chunked si no supera CHUNKED_MAX_FRACTION (en streaming solo se
+          mantiene en memoria un chunk y el Parquet de salida comprimido).
+        - Spill a /tmp en cualquier otro caso.
+
+    Args:
+        objects: Metadatos de los CSVs crudos del lote.
+        memory_limit_mb: Memoria disponible en MB. Por defecto, la configurada.
+        override: Estrategia forzada. Por defecto, la configurada (si existe).
+
+    Returns:
+        ExecutionPlan con la estrategia elegida y la estimación utilizada.
+
+    Raises:
+        ValueError: Si la estrategia forzada no existe.
+    """
+    memory_limit_bytes = (memory_limit_mb or settings.MEMORY_LIMIT_MB) * 1024 * 1024
+    input_bytes = sum(obj.size for obj in objects)
+    estimated = sum(estimate_memory_bytes(obj) for obj in objects)
+
+    override = override or settings.EXECUTION_STRATEGY
+    if override:
+        strategy = ExecutionStrategy(override)
+    elif estimated <= memory_limit_bytes * settings.IN_MEMORY_MAX_FRACTION:
+        strategy = ExecutionStrategy.IN_MEMORY
+    elif estimated <= memory_limit_bytes * settings.CHUNKED_MAX_FRACTION:
+        strategy = ExecutionStrategy.CHUNKED
+    else:
+        strategy = ExecutionStrategy.SPILL
+
+    plan = ExecutionPlan(
+        strategy=strategy,
+        input_bytes=input_bytes,
+        estimated_memory_bytes=estimated,
+        memory_limit_bytes=memory_limit_bytes,
+        overridden=bool(override),
+    )
+    logger.info(
+        "Plan de ejecución: '%s' (entrada: %d bytes en %d archivos, "
+        "memoria estimada: %d bytes, límite: %d bytes, forzado: %s).",
+        plan.strategy.value,
+        plan.input_bytes,
+        len(objects),
+        plan.estimated_memory_bytes,
+        plan.memory_limit_bytes,
+        plan.overridden,
+    )
+    return plan
+
+
+def plan_shards(
+    objects: list[S3ObjectInfo], shard_target_mb: Optional[int] = None
+) -> list[list[S3ObjectInfo]]:
+    """
+    Reparte los archivos de un lote en shards de memoria estimada acotada.
+
+    Los archivos se asignan en el orden del listado a shards contiguos, de
+    modo que concatenar las salidas de los shards en orden equivale a
+    procesar el lote completo. Un archivo nunca se divide: si por sí solo
+    supera el objetivo, queda en un shard propio.
+
+    Args:
+        objects: Metadatos de los CSVs crudos del lote.
+        shard_target_mb: Memoria estimada objetivo por shard, en MB. Si es
+            None se usa FANOUT_SHARD_TARGET_MB.
+
+    Returns:
+        Lista de shards, cada uno con sus archivos.
+    """
+    if shard_target_mb is None:
+        shard_target_mb = settings.FANOUT_SHARD_TARGET_MB
+    target_bytes = shard_target_mb * 1024 * 1024
+
+    shards: list[list[S3ObjectInfo]] = []
+    current: list[S3ObjectInfo] = []
+    current_bytes = 0
+    for obj in objects:
+        estimated = estimate_memory_bytes(obj)
+        if current and current_bytes + estimated > target_bytes:
+            shards.append(current)
+            current, current_bytes = [], 0
+        current.append(obj)
+        current_bytes += estimated
+    if current:
+        shards.append(current)
+
+    logger.info(
+        "Lote repartido en %d shards (%d archivos, objetivo: %d MB por shard).",
+        len(shards),
+        len(objects),
+        shard_target_mb,
+    )
+    return shards
@@ -0,0 +1,223 @@
+"""
+Módulo de la dimensión de hoteles.
+
+Separa de cada registro procesado los atributos descriptivos del hotel
+(textos largos que se repiten en cada fila) en una tabla de dimensión
+deduplicada, y deja en la tabla de hechos una clave entera (`hotel_id`)
+junto con las columnas numéricas y de fecha.
+
+barrio se conserva en los hechos: es la primera clave de orden del layout
+agrupado, y como columna con codificación de diccionario ocupa poco. Así
+los filtros por barrio siguen descartando row groups por mínimo/máximo,
+algo que no se lograría con hotel_id, repartido en todo el rango del hash.
+
+El `hotel_id` se deriva del hash estable de link_detalle, por lo que la
+misma URL obtiene siempre el mismo identificador sin consultar la
+dimensión: lotes concurrentes y workers del modo distribuido asignan
+las mismas claves sin coordinarse.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from processors.transformations import TRANSFORMED_SCHEMA
+
+# Atributos del hotel que se mueven a la dimensión. Las columnas que
+# dependen de cada observación (como calificacion), las constantes
+# (ciudad) y la clave de agrupamiento (barrio) quedan en los hechos
+HOTEL_ATTRIBUTE_COLUMNS = [
+    "link_detalle",
+    "nombre_hotel",
+    "ubicacion",
+    "sub_barrio",
+]
+
+HOTEL_DIMENSION_SCHEMA = pa.schema(
+    [
+        ("hotel_id", pa.int64()),
+        *(TRANSFORMED_SCHEMA.field(column) for column in HOTEL_ATTRIBUTE_COLUMNS),
+    ]
+)
+
+FACT_SCHEMA = pa.schema(
+    [
+        ("hotel_id", pa.int64()),
+        *(
+            field
+            for field in TRANSFORMED_SCHEMA
+            if field.name not in HOTEL_ATTRIBUTE_COLUMNS
+        ),
+    ]
+)
+
+
+class HotelIdCollisionError(RuntimeError):
+    """Error lanzado cuando dos link_detalle distintos obtienen el mismo hotel_id."""
+
+
+def hotel_ids(links: pa.ChunkedArray | pa.Array) -> pa.Array:
+    """
+    Calcula el hotel_id de cada link_detalle.
+
+    Usa el hash de pandas (estable entre procesos y ejecuciones) truncado
+    a 63 bits para obtener enteros no negativos. Un link_detalle nulo
+    obtiene un hotel_id nulo.
+
+    Args:
+        links: Columna link_detalle.
+
+    Returns:
+        Array int64 con el hotel_id de cada fila.
+    """
+    values = links.to_pandas()
+    hashes = pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+    ids = (hashes & np.uint64(0x7FFF_FFFF_FFFF_FFFF)).astype(np.int64)
+    return pa.array(ids, type=pa.int64(), mask=values.isna().to_numpy())
+
+
+def fact_column(column: str) -> Optional[str]:
+    """
+    Traduce una columna del esquema transformado a la de la tabla de hechos.
+
+    link_detalle se corresponde uno a uno con hotel_id; el resto de los
+    atributos del hotel no tiene equivalente en los hechos.
+
+    Args:
+        column: Nombre de la columna en el esquema transformado.
+
+    Returns:
+        Nombre de la columna equivalente en FACT_SCHEMA, o None.
+    """
+    if column == "link_detalle":
+        return "hotel_id"
+    return column if column in FACT_SCHEMA.names else None
+
+
+def fact_sort_keys(sort_keys: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Traduce las claves de orden del layout a columnas de la tabla de hechos.
+
+    Los atributos que solo están en la dimensión se reemplazan por
+    hotel_id, que mantiene juntas las filas de cada hotel. Como hotel_id
+    es un hash, solo los filtros por un único hotel (link_detalle)
+    aprovechan ese orden; las columnas de los hechos, como barrio, se
+    conservan tal cual.
+
+    Args:
+        sort_keys: Claves de orden sobre el esquema transformado.
+
+    Returns:
+        Claves de orden sobre FACT_SCHEMA, sin repetidos.
+    """
+    keys = (
+        "hotel_id" if key in HOTEL_ATTRIBUTE_COLUMNS else key for key in sort_keys
+    )
+    return tuple(dict.fromkeys(keys))
+
+
+def split_hotels(table: pa.Table) -> tuple[pa.Table, pa.Table]:
+    """
+    Separa una tabla transformada en hechos y filas de la dimensión.
+
+    Args:
+        table: Tabla con TRANSFORMED_SCHEMA.
+
+    Returns:
+        Tupla con (hechos con FACT_SCHEMA, hoteles con HOTEL_DIMENSION_SCHEMA
+        deduplicados por hotel_id, conservando los últimos atributos vistos).
+    """
+    ids = hotel_ids(table["link_detalle"])
+    facts = pa.Table.from_arrays(
+        [ids, *(table[name] for name in FACT_SCHEMA.names[1:])], schema=FACT_SCHEMA
+    )
+    hotels = pa.Table.from_arrays(
+        [ids, *(table[name] for name in HOTEL_ATTRIBUTE_COLUMNS)],
+        schema=HOTEL_DIMENSION_SCHEMA,
+    ).filter(pc.is_valid(ids))
+    return facts, deduplicate_hotels(hotels)
+
+
+def deduplicate_hotels(hotels: pa.Table) -> pa.Table:
+    """Deja una fila por hotel_id, con los últimos atributos vistos."""
+    df = hotels.to_pandas().drop_duplicates(subset=["hotel_id"], keep="last")
+    return pa.Table.from_pandas(
+        df, schema=HOTEL_DIMENSION_SCHEMA, preserve_index=False
+    )
+
+
+def merge_dimension(
+    current: pd.DataFrame, hotels: pd.DataFrame
+) -> tuple[pd.DataFrame, int, int]:
+    """
+    Aplica los hoteles de un lote sobre la dimensión.
+
+    Los hoteles nuevos se insertan; los existentes toman los atributos del
+    lote si alguno cambió (se conserva solo el último valor).
+
+    Args:
+        current: Filas actuales de la dimensión.
+        hotels: Hoteles del lote, uno por hotel_id.
+
+    Returns:
+        Tupla con (nueva_dimension, hoteles_insertados, hoteles_actualizados).
+
+    Raises:
+        HotelIdCollisionError: Si un hotel_id existente corresponde a otro
+            link_detalle.
+    """
+    joined = hotels.merge(
+        current, on="hotel_id", how="left", suffixes=("", "_actual")
+    )
+    known = joined["link_detalle_actual"].notna()
+    collisions = known & (joined["link_detalle"] != joined["link_detalle_actual"])
+    if collisions.any():
+        raise HotelIdCollisionError(
+            f"hotel_id repetido para '{joined.loc[collisions, 'link_detalle'].iloc[0]}'."
+        )
+
+    changed = pd.Series(False, index=joined.index)
+    for column in HOTEL_ATTRIBUTE_COLUMNS[1:]:
+        new, old = joined[column], joined[f"{column}_actual"]
+        changed |= (new != old) & ~(new.isna() & old.isna())
+    inserted = int((~known).sum())
+    updated = int((known & changed).sum())
+    if not inserted and not updated:
+        return current, 0, 0
+
+    changes = hotels.loc[(~known | changed).to_numpy()]
+    kept = current.loc[~current["hotel_id"].isin(changes["hotel_id"])]
+    dimension = changes if kept.empty else pd.concat([kept, changes])
+    return dimension.sort_values("hotel_id", ignore_index=True), inserted, updated
+
+
+def denormalize(facts: pa.Table, hotels: pa.Table) -> pa.Table:
+    """
+    Agrega a los hechos los atributos del hotel de cada fila.
+
+    Args:
+        facts: Tabla con hotel_id y columnas de hechos.
+        hotels: Filas de la dimensión (HOTEL_DIMENSION_SCHEMA) que cubren
+            los hotel_id de los hechos.
+
+    Returns:
+        Tabla con las columnas de los hechos (sin hotel_id) más las de
+        HOTEL_ATTRIBUTE_COLUMNS, en el orden de TRANSFORMED_SCHEMA y con las
+        filas en el orden de los hechos. Los hoteles que no están en la
+        dimensión quedan con atributos nulos.
+    """
+    positions = pc.index_in(facts["hotel_id"], value_set=hotels["hotel_id"])
+    attributes = hotels.take(positions)
+    columns = {name: facts[name] for name in facts.column_names if name != "hotel_id"}
+    columns.update({name: attributes[name] for name in HOTEL_ATTRIBUTE_COLUMNS})
+    return pa.table(
+        {name: columns[name] for name in TRANSFORMED_SCHEMA.names if name in columns}
+    )
+
+
+def empty_dimension() -> pd.DataFrame:
+    """Devuelve una dimensión vacía con las columnas de HOTEL_DIMENSION_SCHEMA."""
+    return HOTEL_DIMENSION_SCHEMA.empty_table().to_pandas()
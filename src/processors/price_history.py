@@ -0,0 +1,173 @@
+"""
+Módulo de la tabla histórica de precios por hotel y ventana de estadía.
+
+La tabla guarda, para cada clave (link_detalle, checkin_date,
+checkout_date), una fila por cada precio observado con su período de
+vigencia [valid_from, valid_to). La fila vigente es la que tiene
+valid_to nulo, por lo que "último precio por hotel y estadía" y
+"historial de cambios de precio" se responden sin releer los lotes.
+
+Las filas vigentes y las cerradas se guardan por separado. Las vigentes
+(una por clave) se dividen por mes de estadía y buckets por hash de
+link_detalle, y cada lote reescribe solo los buckets de las claves que
+contiene; las cerradas solo se agregan, en un archivo por lote, por lo
+que el costo de actualizar no crece con el historial acumulado.
+
+Como las filas cerradas no se reescriben, cada fila vigente guarda en
+history_from el inicio del historial de su clave: una observación fuera
+de orden solo puede agregarse antes de ese inicio sin superponerse con
+períodos ya cerrados.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+# Clave de la tabla histórica
+KEY_COLUMNS = ["link_detalle", "checkin_date", "checkout_date"]
+
+# Columnas de procesados necesarias para actualizar la tabla
+OBSERVATION_COLUMNS = [
+    *KEY_COLUMNS,
+    "nombre_hotel",
+    "barrio",
+    "precio_final",
+    "precio_por_noche",
+]
+
+PRICE_HISTORY_SCHEMA = pa.schema(
+    [
+        ("link_detalle", pa.string()),
+        ("checkin_date", pa.timestamp("us")),
+        ("checkout_date", pa.timestamp("us")),
+        ("nombre_hotel", pa.string()),
+        ("barrio", pa.string()),
+        ("precio_final", pa.float64()),
+        ("precio_por_noche", pa.float64()),
+        ("valid_from", pa.timestamp("us")),
+        ("valid_to", pa.timestamp("us")),
+        ("lote", pa.string()),
+        # Inicio del historial de la clave, solo en las filas vigentes
+        ("history_from", pa.timestamp("us")),
+    ]
+)
+
+
+def prepare_observations(
+    processed: pa.Table, observed_at: datetime, batch_name: str
+) -> pd.DataFrame:
+    """
+    Construye las observaciones de precio de un lote procesado.
+
+    Si una clave aparece más de una vez en el lote, se conserva la última.
+
+    Args:
+        processed: Tabla con los registros válidos del lote.
+        observed_at: Momento de la observación (fecha de ingesta del lote).
+        batch_name: Nombre del lote.
+
+    Returns:
+        DataFrame con una fila por clave y las columnas de OBSERVATION_COLUMNS
+        más valid_from y lote.
+    """
+    df = processed.select(OBSERVATION_COLUMNS).to_pandas()
+    df = df.dropna(subset=["link_detalle"])
+    df = df.drop_duplicates(subset=KEY_COLUMNS, keep="last").reset_index(drop=True)
+    df["valid_from"] = pd.Timestamp(observed_at)
+    df["lote"] = batch_name
+    return df
+
+
+def merge_bucket(
+    current: pd.DataFrame, observations: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame, int, int]:
+    """
+    Aplica las observaciones de un lote sobre las filas vigentes de un bucket.
+
+    Por cada clave observada:
+        - Si no tiene fila vigente, se inserta como vigente.
+        - Si la observación es posterior a la vigente y el precio cambió,
+          la vigente se cierra (valid_to = momento de la observación) y la
+          observación pasa a ser la vigente.
+        - Si la observación es anterior a todo el historial de la clave
+          (lote fuera de orden o recarga histórica), se agrega como fila
+          cerrada hasta el inicio del historial, que pasa a ser el suyo.
+        - Si la observación cae dentro del historial ya cerrado, se
+          descarta: ocuparía un período que cubre otra fila cerrada.
+        - Si la vigente proviene del mismo lote (lote reprocesado), el
+          precio no cambió o la observación ya inicia el historial, no se
+          modifica.
+
+    Args:
+        current: Filas vigentes del bucket (esquema PRICE_HISTORY_SCHEMA,
+            una por clave y con valid_to nulo).
+        observations: Observaciones del lote que caen en el bucket.
+
+    Returns:
+        Tupla con (nuevas_filas_vigentes, filas_cerradas, filas_insertadas,
+        observaciones_descartadas). Las filas cerradas son las que pasan al
+        historial: las vigentes reemplazadas y las observaciones fuera de
+        orden. Si no hay cambios, las filas vigentes son `current`.
+    """
+    observed_at = observations["valid_from"].iloc[0]
+    joined = observations.merge(
+        current[[*KEY_COLUMNS, "precio_final", "valid_from", "lote", "history_from"]],
+        on=KEY_COLUMNS,
+        how="left",
+        suffixes=("", "_vigente"),
+    )
+
+    is_new = joined["valid_from_vigente"].isna()
+    known = ~is_new & (joined["lote"] != joined["lote_vigente"])
+    is_late = known & (joined["valid_from"] < joined["valid_from_vigente"])
+    is_earliest = is_late & (joined["valid_from"] < joined["history_from"])
+    discarded = int((is_late & (joined["valid_from"] > joined["history_from"])).sum())
+    changed = (
+        known
+        & ~is_late
+        & (joined["precio_final"] != joined["precio_final_vigente"])
+    )
+
+    late = joined.loc[is_earliest, observations.columns].assign(
+        valid_to=joined.loc[is_earliest, "history_from"], history_from=pd.NaT
+    )
+    inserts = joined.loc[is_new | changed, observations.columns].assign(
+        valid_to=pd.NaT,
+        history_from=joined.loc[is_new | changed, "history_from"].fillna(
+            observed_at
+        ),
+    )
+    if inserts.empty and late.empty:
+        return current, empty_state(), 0, discarded
+
+    current_keys = pd.MultiIndex.from_frame(current[KEY_COLUMNS])
+    is_replaced = current_keys.isin(
+        pd.MultiIndex.from_frame(joined.loc[changed, KEY_COLUMNS])
+    )
+    closed = current.loc[is_replaced].assign(valid_to=observed_at, history_from=pd.NaT)
+
+    kept = current.loc[~is_replaced].copy()
+    is_extended = current_keys[~is_replaced].isin(
+        pd.MultiIndex.from_frame(joined.loc[is_earliest, KEY_COLUMNS])
+    )
+    kept.loc[is_extended, "history_from"] = observed_at
+
+    new_current = pd.concat([frame for frame in (kept, inserts) if not frame.empty])
+    parts = [frame for frame in (closed, late) if not frame.empty]
+    closed = pd.concat(parts) if parts else empty_state()
+    return (
+        new_current[PRICE_HISTORY_SCHEMA.names].sort_values(
+            KEY_COLUMNS, ignore_index=True
+        ),
+        closed[PRICE_HISTORY_SCHEMA.names].sort_values(
+            [*KEY_COLUMNS, "valid_from"], ignore_index=True
+        ),
+        len(inserts),
+        discarded,
+    )
+
+
+def empty_state() -> pd.DataFrame:
+    """Devuelve un estado vacío con las columnas de la tabla histórica."""
+    return PRICE_HISTORY_SCHEMA.empty_table().to_pandas()
@@ -0,0 +1,128 @@
+"""
+Módulo de spill a almacenamiento efímero en formato Arrow IPC.
+
+Permite procesar lotes más grandes que la memoria de la Lambda: los chunks
+transformados se escriben en un archivo Arrow IPC dentro de /tmp (hasta
+10 GB de almacenamiento efímero) y luego se releen mediante memory mapping,
+de modo que los datos se leen directamente desde las páginas del archivo
+sin copiarse al heap del proceso.
+"""
+
+import logging
+import os
+import tempfile
+from types import TracebackType
+from typing import Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from processors.transformations import TRANSFORMED_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+
+class ArrowSpillFile:
+    """
+    Archivo temporal Arrow IPC para volcar y releer tablas transformadas.
+
+    Se utiliza como context manager: al salir se elimina el directorio
+    temporal con todo su contenido.
+    """
+
+    def __init__(
+        self, directory: str, schema: pa.Schema = TRANSFORMED_SCHEMA
+    ) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory(dir=directory, prefix="spill-")
+        self._schema = schema
+        self.path = os.path.join(self._tmpdir.name, "batch.arrow")
+        self._sink: Optional[pa.NativeFile] = None
+        self._writer: Optional[pa.ipc.RecordBatchFileWriter] = None
+        self.rows_written = 0
+
+    def __enter__(self) -> "ArrowSpillFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._close_writer()
+        self._tmpdir.cleanup()
+
+    def write(self, table: pa.Table) -> None:
+        """
+        Agrega una tabla al archivo de spill.
+
+        Args:
+            table: Tabla Arrow con el esquema del archivo.
+        """
+        if self._writer is None:
+            self._sink = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self._schema)
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+
+    def iter_batches(self) -> Iterator[pa.Table]:
+        """
+        Relee el contenido del spill mediante memory mapping.
+
+        Cierra la escritura (si sigue abierta) y entrega cada record batch
+        como una tabla cuyos buffers apuntan al archivo mapeado en memoria.
+
+        Yields:
+            Tablas Arrow, una por cada chunk escrito.
+        """
+        self._close_writer()
+        if self.rows_written == 0:
+            return
+
+        logger.info(
+            "Releyendo spill '%s' (%d filas, %d bytes) mediante memory mapping.",
+            self.path,
+            self.rows_written,
+            os.path.getsize(self.path),
+        )
+        with pa.memory_map(self.path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield pa.Table.from_batches([reader.get_batch(index)])
+
+    def iter_sorted_batches(
+        self, sort_keys: tuple[str, ...], batch_rows: int
+    ) -> Iterator[pa.Table]:
+        """
+        Relee el contenido del spill ordenado globalmente por las claves dadas.
+
+        Solo se materializan en memoria los índices de ordenamiento y una
+        tabla de `batch_rows` filas a la vez; el resto de los datos se
+        lee desde el archivo mapeado en memoria.
+
+        Args:
+            sort_keys: Columnas por las que se ordena (ascendente).
+            batch_rows: Cantidad de filas de cada tabla entregada.
+
+        Yields:
+            Tablas Arrow ordenadas de hasta `batch_rows` filas.
+        """
+        self._close_writer()
+        if self.rows_written == 0:
+            return
+
+        with pa.memory_map(self.path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+            indices = pc.sort_indices(
+                table, sort_keys=[(key, "ascending") for key in sort_keys]
+            )
+            for start in range(0, table.num_rows, batch_rows):
+                yield table.take(indices[start : start + batch_rows])
+
+    def _close_writer(self) -> None:
+        """Cierra el writer IPC y el archivo subyacente si están abiertos."""
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+            self._sink = None
@@ -3,6 +3,30 @@ Modulo de transformaciones de datos especificas para hoteles de Booking.com.
 """
 
 import pandas as pd
+import pyarrow as pa
+
+# Esquema de los datos transformados. Fija los tipos de salida para que
+# lotes procesados en varios chunks produzcan un único Parquet homogéneo.
+TRANSFORMED_SCHEMA = pa.schema(
+    [
+        ("nombre_hotel", pa.string()),
+        ("ubicacion", pa.string()),
+        ("checkin_date", pa.timestamp("us")),
+        ("checkout_date", pa.timestamp("us")),
+        ("precio_inicial", pa.float64()),
+        ("precio_impuesto", pa.float64()),
+        ("precio_final", pa.float64()),
+        ("calificacion", pa.string()),
+        ("puntaje", pa.float64()),
+        ("cantidad_reviews", pa.float64()),
+        ("link_detalle", pa.string()),
+        ("noches", pa.int64()),
+        ("precio_por_noche", pa.float64()),
+        ("barrio", pa.string()),
+        ("sub_barrio", pa.string()),
+        ("ciudad", pa.string()),
+    ]
+)
 
 
 def apply_transformations(df: pd.DataFrame) -> pd.DataFrame:
@@ -57,3 +81,26 @@ def _extraer_sub_barrio(ubicacion: pd.Series) -> pd.Series:
     Ejemplo: 'Palermo, Buenos Aires (Palermo Soho)' -> 'Palermo Soho'
     """
     return ubicacion.str.extract(r"\(([^)]+)\)", expand=False).fillna("")
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convierte un DataFrame transformado a una tabla Arrow con TRANSFORMED_SCHEMA.
+
+    La salida tiene exactamente las columnas del esquema: las columnas
+    adicionales del CSV se descartan, de modo que todos los chunks, shards
+    y lotes compartan el mismo esquema.
+
+    Args:
+        df: DataFrame devuelto por apply_transformations.
+
+    Returns:
+        Tabla Arrow con TRANSFORMED_SCHEMA.
+
+    Raises:
+        ValueError: Si falta alguna columna del esquema.
+    """
+    missing = [name for name in TRANSFORMED_SCHEMA.names if name not in df.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas del esquema transformado: {missing}.")
+    return pa.Table.from_pandas(df, schema=TRANSFORMED_SCHEMA, preserve_index=False)
@@ -0,0 +1,197 @@
+"""
+Servicio del catálogo de lotes procesados.
+
+Mantiene, dentro de cada partición de procesados, un archivo JSON lines
+con una entrada por lote: claves de salida, cantidad de registros y bytes
+de procesados y rechazados, ETags de los archivos fuente y mínimo/máximo
+de columnas relevantes. Permite descubrir y podar lotes sin listar S3 ni
+abrir los footers de los Parquet.
+"""
+
+import json
+import logging
+import math
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Optional
+
+from config import settings
+from services.s3_service import (
+    ConditionalWriteConflictError,
+    S3ObjectInfo,
+    S3Service,
+    update_object,
+)
+from utils.partition_utils import build_catalog_key
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogConflictError(ConditionalWriteConflictError):
+    """Error lanzado cuando no se pudo registrar un lote por escrituras concurrentes."""
+
+
+class CatalogService:
+    """Lectura y registro de entradas del catálogo de lotes por partición."""
+
+    def __init__(self, s3: S3Service) -> None:
+        self._s3 = s3
+
+    def register(self, bucket: str, ingestion_date: datetime, entry: dict) -> None:
+        """Agrega (o reemplaza) la entrada de un lote en el catálogo de su partición.
+
+        S3 no permite agregar contenido a un objeto, por lo que el catálogo se
+        reescribe con una escritura condicional sobre su ETag. Si otro lote
+        de la misma partición lo modificó en el medio, se relee y reintenta
+        con backoff. Registrar dos veces el mismo lote reemplaza su entrada
+        anterior.
+
+        Args:
+            bucket: Nombre del bucket.
+            ingestion_date: Fecha de ingesta de la partición.
+            entry: Entrada del lote, construida con `build_catalog_entry`.
+
+        Raises:
+            CatalogConflictError: Si se agotan los reintentos.
+            ClientError: Si la lectura o escritura falla en S3.
+        """
+        key = build_catalog_key(
+            settings.PROCESSED_PREFIX, ingestion_date, settings.CATALOG_FILENAME
+        )
+
+        def merge(content: Optional[bytes]) -> bytes:
+            entries = _parse_entries(content) if content else []
+            entries = [e for e in entries if e["lote"] != entry["lote"]]
+            entries.append(entry)
+            return _serialize_entries(entries)
+
+        update_object(
+            self._s3,
+            bucket,
+            key,
+            merge,
+            settings.CATALOG_MAX_RETRIES,
+            conflict_error=CatalogConflictError,
+        )
+        logger.info("Lote '%s' registrado en el catálogo '%s'.", entry["lote"], key)
+
+    def read_partition(self, bucket: str, ingestion_date: datetime) -> list[dict]:
+        """Lee las entradas del catálogo de una partición.
+
+        Args:
+            bucket: Nombre del bucket.
+            ingestion_date: Fecha de ingesta de la partición.
+
+        Returns:
+            Lista de entradas del catálogo (vacía si la partición no tiene catálogo).
+        """
+        key = build_catalog_key(
+            settings.PROCESSED_PREFIX, ingestion_date, settings.CATALOG_FILENAME
+        )
+        current = self._s3.get_object_with_etag(bucket, key)
+        return _parse_entries(current[0]) if current else []
+
+
+def build_catalog_entry(
+    batch_name: str,
+    ingestion_date: datetime,
+    source_objects: list[S3ObjectInfo],
+    outputs: dict[str, dict[str, Any]],
+) -> dict:
+    """
+    Construye la entrada de catálogo de un lote.
+
+    Args:
+        batch_name: Nombre del lote.
+        ingestion_date: Fecha de ingesta del lote.
+        source_objects: Metadatos de los CSVs crudos leídos.
+        outputs: Salidas del lote por nombre ("procesados", "rechazados", ...),
+            cada una con "clave", "bytes" y opcionalmente "registros" y
+            "min_max" ({columna: (mínimo, máximo)}).
+
+    Returns:
+        Diccionario serializable a JSON con la entrada del lote.
+    """
+    entry: dict[str, Any] = {
+        "lote": batch_name,
+        "ingestion_date": ingestion_date.strftime("%Y-%m-%d"),
+        "registrado_en": datetime.now(timezone.utc).isoformat(),
+        "archivos_fuente": [
+            {"clave": obj.key, "etag": obj.etag, "bytes": obj.size}
+            for obj in source_objects
+        ],
+    }
+    for name, output in outputs.items():
+        entry[name] = dict(output)
+        if "min_max" in output:
+            entry[name]["min_max"] = {
+                column: [_to_json_value(low), _to_json_value(high)]
+                for column, (low, high) in output["min_max"].items()
+            }
+    return entry
+
+
+def prune_entries(
+    entries: Iterable[dict],
+    column: str,
+    lower: Optional[Any] = None,
+    upper: Optional[Any] = None,
+    output: str = "procesados",
+) -> list[dict]:
+    """
+    Filtra las entradas cuyos rangos de `column` pueden contener [lower, upper].
+
+    Las entradas sin estadísticas para la columna (por ejemplo, salidas sin
+    registros) se descartan, ya que no pueden contener filas que cumplan.
+    Un extremo nulo (valor no finito al registrar) se considera abierto.
+
+    Args:
+        entries: Entradas del catálogo.
+        column: Columna con estadísticas mínimo/máximo.
+        lower: Límite inferior inclusivo, o None para no acotar.
+        upper: Límite superior inclusivo, o None para no acotar.
+        output: Salida del lote sobre la que se evalúa ("procesados" o "rechazados").
+
+    Returns:
+        Lista de entradas que no pueden descartarse.
+    """
+    lower, upper = _to_json_value(lower), _to_json_value(upper)
+    selected = []
+    for entry in entries:
+        bounds = entry.get(output, {}).get("min_max", {}).get(column)
+        if bounds is None:
+            continue
+        low, high = bounds
+        if lower is not None and high is not None and high < lower:
+            continue
+        if upper is not None and low is not None and low > upper:
+            continue
+        selected.append(entry)
+    return selected
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convierte fechas a texto ISO 8601 comparable y los float no finitos a None.
+
+    JSON no admite infinitos ni NaN (por ejemplo, el precio_por_noche de
+    una estadía de 0 noches); se registran como null, es decir, sin cota.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).isoformat()
+    return value
+
+
+def _parse_entries(content: bytes) -> list[dict]:
+    """Parsea el contenido JSON lines de un catálogo."""
+    return [json.loads(line) for line in content.decode("utf-8").splitlines() if line]
+
+
+def _serialize_entries(entries: list[dict]) -> bytes:
+    """Serializa las entradas de un catálogo como JSON lines."""
+    return "".join(
+        json.dumps(entry, ensure_ascii=False, allow_nan=False) + "\n"
+        for entry in entries
+    ).encode("utf-8")
@@ -0,0 +1,172 @@
+"""
+Servicio de la dimensión de hoteles.
+
+Mantiene en S3 la dimensión de hoteles como Parquet divididos en buckets
+por hash de hotel_id (`bucket=NNNNN/data.parquet` bajo
+HOTEL_DIMENSION_PREFIX), con una fila por hotel_id. Cada lote agrega los
+hoteles nuevos y actualiza los atributos que cambiaron, y solo reescribe
+los buckets con cambios: una vez conocidos los hoteles, la mayoría de los
+lotes solo lee la dimensión.
+"""
+
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import settings
+from processors.hotel_dimension import (
+    HOTEL_DIMENSION_SCHEMA,
+    empty_dimension,
+    merge_dimension,
+)
+from services.s3_service import (
+    ConditionalWriteConflictError,
+    S3Service,
+    update_object,
+)
+from utils.partition_utils import assign_buckets, build_bucket_key
+
+logger = logging.getLogger(__name__)
+
+
+class HotelDimensionConflictError(ConditionalWriteConflictError):
+    """Error lanzado cuando escrituras concurrentes impiden actualizar la dimensión."""
+
+
+@dataclass(frozen=True)
+class HotelDimensionUpdate:
+    """
+    Resumen de la actualización de la dimensión de hoteles con un lote.
+    """
+
+    hotels: int
+    inserted: int
+    updated: int
+
+
+class HotelDimensionService:
+    """Actualización incremental de la dimensión de hoteles."""
+
+    def __init__(self, s3: S3Service) -> None:
+        self._s3 = s3
+
+    def upsert(
+        self, bucket: str, hotels: pa.Table, batch_name: str
+    ) -> HotelDimensionUpdate:
+        """
+        Aplica los hoteles de un lote sobre la dimensión.
+
+        Cada bucket afectado se reescribe con una escritura condicional sobre
+        su ETag; si otro lote lo modificó en el medio, se relee y reintenta
+        con backoff. Como el hotel_id depende solo de link_detalle,
+        reintentar no cambia las claves ya escritas en los hechos.
+
+        Args:
+            bucket: Nombre del bucket de S3.
+            hotels: Hoteles del lote (uno por hotel_id, con HOTEL_DIMENSION_SCHEMA).
+            batch_name: Nombre del lote.
+
+        Returns:
+            HotelDimensionUpdate con el resumen de la actualización.
+
+        Raises:
+            HotelDimensionConflictError: Si se agotan los reintentos de un bucket.
+            HotelIdCollisionError: Si un hotel_id corresponde a otro link_detalle.
+            ClientError: Si la lectura o escritura falla en S3.
+        """
+        batch_hotels = hotels.to_pandas()
+        buckets = assign_buckets(
+            batch_hotels["hotel_id"], settings.HOTEL_DIMENSION_BUCKETS
+        )
+
+        inserted = updated = 0
+        for bucket_index, group in batch_hotels.groupby(buckets, sort=True):
+            bucket_inserted, bucket_updated = self._upsert_bucket(
+                bucket, int(bucket_index), group.reset_index(drop=True)
+            )
+            inserted += bucket_inserted
+            updated += bucket_updated
+
+        update = HotelDimensionUpdate(
+            hotels=len(batch_hotels), inserted=inserted, updated=updated
+        )
+        logger.info(
+            "Dimensión de hoteles actualizada con el lote '%s': %d hoteles, "
+            "%d nuevos, %d actualizados.",
+            batch_name,
+            update.hotels,
+            update.inserted,
+            update.updated,
+        )
+        return update
+
+    def read(self, bucket: str) -> pd.DataFrame:
+        """
+        Lee la dimensión de hoteles completa.
+
+        Args:
+            bucket: Nombre del bucket de S3.
+
+        Returns:
+            DataFrame con una fila por hotel_id (vacío si no existe).
+        """
+        parts = []
+        for bucket_index in range(settings.HOTEL_DIMENSION_BUCKETS):
+            current = self._s3.get_object_with_etag(
+                bucket, build_bucket_key(settings.HOTEL_DIMENSION_PREFIX, bucket_index)
+            )
+            if current:
+                parts.append(_read_dimension(current[0]))
+        if not parts:
+            return empty_dimension()
+        return pd.concat(parts, ignore_index=True)
+
+    def _upsert_bucket(
+        self, bucket: str, bucket_index: int, hotels: pd.DataFrame
+    ) -> tuple[int, int]:
+        """Lee, combina y reescribe condicionalmente un bucket de la dimensión.
+
+        Returns:
+            Tupla con (hoteles_insertados, hoteles_actualizados) del intento
+            que se escribió.
+        """
+        result = (0, 0)
+
+        def merge(content: Optional[bytes]) -> Optional[bytes]:
+            nonlocal result
+            dimension = _read_dimension(content) if content else empty_dimension()
+            new_dimension, inserted, updated = merge_dimension(dimension, hotels)
+            result = (inserted, updated)
+            if not inserted and not updated:
+                return None
+            return _serialize_dimension(new_dimension)
+
+        update_object(
+            self._s3,
+            bucket,
+            build_bucket_key(settings.HOTEL_DIMENSION_PREFIX, bucket_index),
+            merge,
+            settings.HOTEL_DIMENSION_MAX_RETRIES,
+            conflict_error=HotelDimensionConflictError,
+        )
+        return result
+
+
+def _read_dimension(content: bytes) -> pd.DataFrame:
+    """Lee el Parquet de un bucket de la dimensión."""
+    return pq.read_table(BytesIO(content), schema=HOTEL_DIMENSION_SCHEMA).to_pandas()
+
+
+def _serialize_dimension(dimension: pd.DataFrame) -> bytes:
+    """Serializa un bucket de la dimensión como Parquet con su esquema."""
+    table = pa.Table.from_pandas(
+        dimension, schema=HOTEL_DIMENSION_SCHEMA, preserve_index=False
+    )
+    buffer = BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
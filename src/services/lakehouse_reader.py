@@ -0,0 +1,528 @@
+"""
+Lector del lakehouse de hoteles procesados.
+
+Permite consultar los Parquet de `processed/` por rango de fechas de
+ingesta, con proyección de columnas y filtros por fila:
+
+    - Poda de particiones: solo se listan los prefijos
+      `ingestion_date=YYYY-MM-DD/` dentro del rango pedido.
+    - Predicate pushdown: se leen los footers de cada archivo mediante
+      lecturas por rango y se descartan los row groups cuyas estadísticas
+      mínimo/máximo no pueden cumplir los filtros. Para filtros por
+      igualdad ("==" e "in") se consultan además los bloom filters de las
+      columnas que los tengan.
+    - Caché local: el final de cada archivo (footer), sus column chunks
+      y sus bloom filters se descargan y guardan completos en disco,
+      identificados por bucket, clave, ETag y rango, de modo que lecturas
+      parciales de un mismo bloque comparten la entrada y un objeto
+      reescrito nunca se sirve desde una entrada obsoleta.
+    - Hechos de la dimensión de hoteles: los archivos escritos con
+      FACT_SCHEMA se completan con los atributos de la dimensión, y los
+      filtros sobre esos atributos se traducen a un filtro por hotel_id
+      antes de evaluar los row groups. Una partición puede mezclar
+      archivos de ambos esquemas.
+"""
+
+import bisect
+import io
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import settings
+from processors.hotel_dimension import (
+    HOTEL_ATTRIBUTE_COLUMNS,
+    HOTEL_DIMENSION_SCHEMA,
+    denormalize,
+)
+from services.hotel_dimension_service import HotelDimensionService
+from services.s3_service import S3ObjectInfo, S3Service
+from utils.disk_cache import DiskCache
+from utils.parquet_bloom import may_contain, read_bloom_filter
+
+logger = logging.getLogger(__name__)
+
+# Bytes finales de cada archivo que se descargan juntos para leer el
+# footer (el mismo tamaño que pyarrow pide en su primera lectura)
+_FOOTER_BLOCK_BYTES = 64 * 1024
+
+# Distancia máxima entre dos rangos faltantes para descargarlos con un
+# único GET (el mismo límite que usa pyarrow al agrupar lecturas)
+_MAX_HOLE_BYTES = 8 * 1024
+
+# Filtro por fila: (columna, operador, valor). Operadores soportados:
+# "==", "!=", "<", "<=", ">", ">=" e "in" (valor iterable).
+RowFilter = tuple[str, str, Any]
+
+_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in")
+
+
+class LakehouseReader:
+    """Consulta de datos procesados con poda de particiones y row groups."""
+
+    def __init__(
+        self,
+        s3: S3Service,
+        bucket: str,
+        base_prefix: str = settings.PROCESSED_PREFIX,
+        cache: Optional[DiskCache] = None,
+    ) -> None:
+        self._s3 = s3
+        self._bucket = bucket
+        self._base_prefix = base_prefix
+        self._cache = cache or DiskCache(
+            settings.READER_CACHE_DIR, settings.READER_CACHE_MAX_BYTES
+        )
+        self._hotels: Optional[pa.Table] = None
+        self.row_groups_read = 0
+        self.row_groups_skipped = 0
+        self.bloom_filter_skips = 0
+
+    def read(
+        self,
+        start_date: date,
+        end_date: date,
+        columns: Optional[list[str]] = None,
+        filters: Optional[list[RowFilter]] = None,
+    ) -> pd.DataFrame:
+        """
+        Lee los registros procesados de un rango de fechas de ingesta.
+
+        Los registros se devuelven con las columnas del esquema transformado,
+        también los de archivos de hechos (completados con la dimensión de
+        hoteles). Los contadores de row groups (`row_groups_read`,
+        `row_groups_skipped` y `bloom_filter_skips`) corresponden a la
+        última lectura.
+
+        Args:
+            start_date: Primera fecha de ingesta (inclusive).
+            end_date: Última fecha de ingesta (inclusive).
+            columns: Columnas a devolver. None devuelve todas.
+            filters: Filtros por fila combinados con AND.
+
+        Returns:
+            DataFrame con los registros que cumplen los filtros.
+
+        Raises:
+            ValueError: Si algún filtro usa un operador no soportado.
+        """
+        filters = filters or []
+        for _, operator, _ in filters:
+            if operator not in _OPERATORS:
+                raise ValueError(f"Operador de filtro no soportado: '{operator}'.")
+
+        # La dimensión se lee, a lo sumo una vez, al encontrar hechos
+        self._hotels = None
+        self.row_groups_read = 0
+        self.row_groups_skipped = 0
+        self.bloom_filter_skips = 0
+        tables = []
+        for obj in self._list_partition_files(start_date, end_date):
+            table = self._read_file(obj, columns, filters)
+            if table is not None:
+                tables.append(table)
+
+        logger.info(
+            "Lectura del lakehouse: %d row groups leídos, %d descartados "
+            "(%d por bloom filters). Caché: %d aciertos, %d fallos.",
+            self.row_groups_read,
+            self.row_groups_skipped,
+            self.bloom_filter_skips,
+            self._cache.hits,
+            self._cache.misses,
+        )
+
+        if not tables:
+            return pd.DataFrame(columns=columns or [])
+        return pa.concat_tables(tables).to_pandas()
+
+    def _list_partition_files(
+        self, start_date: date, end_date: date
+    ) -> list[S3ObjectInfo]:
+        """Lista los Parquet de las particiones dentro del rango de fechas."""
+        files = []
+        day = start_date
+        while day <= end_date:
+            prefix = f"{self._base_prefix}ingestion_date={day.strftime('%Y-%m-%d')}/"
+            files.extend(
+                obj
+                for obj in self._s3.list_objects_metadata(self._bucket, prefix)
+                if obj.key.endswith(".parquet")
+            )
+            day += timedelta(days=1)
+        return files
+
+    def _read_file(
+        self,
+        obj: S3ObjectInfo,
+        columns: Optional[list[str]],
+        filters: list[RowFilter],
+    ) -> Optional[pa.Table]:
+        """Lee de un archivo solo los row groups que pueden cumplir los filtros."""
+        source = _S3RangeFile(self._s3, self._bucket, obj, self._cache)
+        parquet_file = pq.ParquetFile(source)
+        source.set_blocks(parquet_file.metadata)
+        if _is_fact_file(parquet_file.schema_arrow):
+            return self._read_fact_file(source, parquet_file, columns, filters)
+        return self._read_row_groups(source, parquet_file, columns, filters)
+
+    def _read_fact_file(
+        self,
+        source: "_S3RangeFile",
+        parquet_file: pq.ParquetFile,
+        columns: Optional[list[str]],
+        filters: list[RowFilter],
+    ) -> Optional[pa.Table]:
+        """Lee un archivo de hechos y le agrega los atributos de la dimensión.
+
+        Los filtros sobre atributos del hotel se evalúan sobre la dimensión
+        y se reemplazan por un filtro "in" sobre hotel_id, que aprovecha las
+        estadísticas y los bloom filters de los hechos.
+        """
+        hotels = self._hotel_dimension()
+        fact_filters = [f for f in filters if f[0] not in HOTEL_ATTRIBUTE_COLUMNS]
+        hotel_filters = [f for f in filters if f[0] in HOTEL_ATTRIBUTE_COLUMNS]
+        if hotel_filters:
+            matching = hotels.filter(_build_expression(hotel_filters))
+            fact_filters.append(("hotel_id", "in", matching["hotel_id"].to_pylist()))
+
+        fact_columns = None
+        if columns is not None:
+            fact_columns = [
+                *(column for column in columns if column not in HOTEL_ATTRIBUTE_COLUMNS),
+                "hotel_id",
+            ]
+
+        table = self._read_row_groups(source, parquet_file, fact_columns, fact_filters)
+        if table is None:
+            return None
+        table = denormalize(table, hotels)
+        return table if columns is None else table.select(columns)
+
+    def _hotel_dimension(self) -> pa.Table:
+        """Devuelve la dimensión de hoteles, leyéndola la primera vez."""
+        if self._hotels is None:
+            self._hotels = pa.Table.from_pandas(
+                HotelDimensionService(self._s3).read(self._bucket),
+                schema=HOTEL_DIMENSION_SCHEMA,
+                preserve_index=False,
+            )
+        return self._hotels
+
+    def _read_row_groups(
+        self,
+        source: "_S3RangeFile",
+        parquet_file: pq.ParquetFile,
+        columns: Optional[list[str]],
+        filters: list[RowFilter],
+    ) -> Optional[pa.Table]:
+        """Lee los row groups de un archivo que pueden cumplir los filtros."""
+        metadata = parquet_file.metadata
+
+        selected = [
+            index
+            for index in range(metadata.num_row_groups)
+            if _row_group_may_match(metadata.row_group(index), filters)
+            and self._bloom_filters_may_match(
+                source, metadata.row_group(index), filters
+            )
+        ]
+        self.row_groups_read += len(selected)
+        self.row_groups_skipped += metadata.num_row_groups - len(selected)
+        if not selected:
+            return None
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys([*columns, *(f[0] for f in filters)]))
+
+        table = parquet_file.read_row_groups(selected, columns=read_columns)
+        if filters:
+            table = table.filter(_build_expression(filters))
+        if columns is not None:
+            table = table.select(columns)
+        return table
+
+    def _bloom_filters_may_match(
+        self,
+        source: "_S3RangeFile",
+        row_group: pq.RowGroupMetaData,
+        filters: list[RowFilter],
+    ) -> bool:
+        """Evalúa los filtros por igualdad contra los bloom filters del row group."""
+        equality_filters = [f for f in filters if f[1] in ("==", "in")]
+        if not equality_filters:
+            return True
+
+        columns = {
+            row_group.column(index).path_in_schema: row_group.column(index)
+            for index in range(row_group.num_columns)
+        }
+        for column, operator, value in equality_filters:
+            chunk = columns.get(column)
+            if chunk is None or not chunk.bloom_filter_length:
+                continue
+            source.seek(chunk.bloom_filter_offset)
+            bitset = read_bloom_filter(source.read(chunk.bloom_filter_length))
+            if bitset is None:
+                continue
+            values = value if operator == "in" else [value]
+            if not any(may_contain(bitset, v, chunk.physical_type) for v in values):
+                self.bloom_filter_skips += 1
+                return False
+        return True
+
+
+class _S3RangeFile(io.RawIOBase):
+    """
+    Archivo de solo lectura sobre un objeto de S3 servido por lecturas por rango.
+
+    Las lecturas se resuelven por bloques: los últimos _FOOTER_BLOCK_BYTES
+    del archivo y, una vez conocida la metadata, cada column chunk y cada
+    bloom filter. Un bloque se descarga completo (los faltantes cercanos,
+    con un único GET por rango) y se guarda en la caché en disco
+    (identificado por bucket, clave, ETag y rango), por lo que las lecturas
+    parciales de un mismo bloque, en cualquier posición, usan una única
+    entrada. Los rangos fuera de todo bloque se descargan sin guardarse.
+    """
+
+    def __init__(
+        self, s3: S3Service, bucket: str, obj: S3ObjectInfo, cache: DiskCache
+    ) -> None:
+        self._s3 = s3
+        self._bucket = bucket
+        self._obj = obj
+        self._cache = cache
+        self._position = 0
+        self._tail_start = max(obj.size - _FOOTER_BLOCK_BYTES, 0)
+        self._starts: list[int] = [self._tail_start]
+        self._ends: list[int] = [obj.size]
+        self._last_block: Optional[tuple[int, bytes]] = None
+
+    def set_blocks(self, metadata: pq.FileMetaData) -> None:
+        """Define los bloques del archivo a partir de su metadata.
+
+        Los rangos que se superponen con el bloque del footer se recortan
+        hasta su inicio, ya que ese tramo se sirve desde el footer.
+        """
+        blocks = {(self._tail_start, self._obj.size)}
+        for start, end in _metadata_ranges(metadata):
+            end = min(end, self._tail_start)
+            if start < end:
+                blocks.add((start, end))
+
+        ordered = sorted(blocks)
+        self._starts = [start for start, _ in ordered]
+        self._ends = [end for _, end in ordered]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = self._obj.size + offset
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._obj.size - self._position
+        end = min(self._position + max(size, 0), self._obj.size)
+        if self._position >= end:
+            return b""
+
+        segments = self._segments(self._position, end)
+        contents: dict[int, bytes] = {}
+        missing = []
+        for segment in segments:
+            content = self._cached_block(*segment[:2]) if segment[2] else None
+            if content is None:
+                missing.append(segment)
+            else:
+                contents[segment[0]] = content
+
+        # Los segmentos faltantes cercanos se descargan con un único GET,
+        # respetando las lecturas que pyarrow agrupa
+        for run in _coalesce(missing):
+            run_start, run_end = run[0][0], run[-1][1]
+            data = self._s3.get_object_range(
+                self._bucket, self._obj.key, run_start, run_end - run_start
+            )
+            for start, stop, is_block in run:
+                content = data[start - run_start : stop - run_start]
+                if is_block:
+                    self._cache.put(self._block_key(start, stop), content)
+                    self._last_block = (start, content)
+                contents[start] = content
+
+        parts = []
+        for segment_start, segment_end, _ in segments:
+            offset = max(self._position, segment_start) - segment_start
+            length = min(end, segment_end) - segment_start - offset
+            parts.append(contents[segment_start][offset : offset + length])
+        self._position = end
+        return b"".join(parts)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def _segments(self, start: int, end: int) -> list[tuple[int, int, bool]]:
+        """Divide un rango en bloques completos y tramos fuera de todo bloque.
+
+        Returns:
+            Lista contigua de (inicio, fin, es_bloque). Los bloques se
+            devuelven completos aunque el rango cubra solo una parte.
+        """
+        index = bisect.bisect_right(self._starts, start) - 1
+        if index < 0 or start >= self._ends[index]:
+            index += 1
+        segments = []
+        position = start
+        while position < end:
+            if index < len(self._starts) and self._starts[index] <= position:
+                segments.append((self._starts[index], self._ends[index], True))
+                position = self._ends[index]
+                index += 1
+                continue
+            gap_end = end
+            if index < len(self._starts):
+                gap_end = min(end, self._starts[index])
+            segments.append((position, gap_end, False))
+            position = gap_end
+        return segments
+
+    def _cached_block(self, start: int, end: int) -> Optional[bytes]:
+        """Devuelve un bloque desde memoria o desde la caché en disco, si está."""
+        if self._last_block is not None and self._last_block[0] == start:
+            return self._last_block[1]
+        data = self._cache.get(self._block_key(start, end))
+        if data is not None:
+            self._last_block = (start, data)
+        return data
+
+    def _block_key(self, start: int, end: int) -> str:
+        """Clave de caché de un bloque del archivo."""
+        return f"{self._bucket}/{self._obj.key}@{self._obj.etag}:{start}+{end - start}"
+
+
+def _coalesce(
+    segments: list[tuple[int, int, bool]],
+) -> list[list[tuple[int, int, bool]]]:
+    """Agrupa segmentos ordenados separados por a lo sumo _MAX_HOLE_BYTES."""
+    runs: list[list[tuple[int, int, bool]]] = []
+    for segment in segments:
+        if runs and segment[0] - runs[-1][-1][1] <= _MAX_HOLE_BYTES:
+            runs[-1].append(segment)
+        else:
+            runs.append([segment])
+    return runs
+
+
+def _metadata_ranges(metadata: pq.FileMetaData) -> list[tuple[int, int]]:
+    """Rangos (inicio, fin) de los column chunks y bloom filters de un Parquet."""
+    ranges = []
+    for group_index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group_index)
+        for column_index in range(row_group.num_columns):
+            chunk = row_group.column(column_index)
+            start = chunk.data_page_offset
+            if chunk.has_dictionary_page:
+                start = min(start, chunk.dictionary_page_offset)
+            ranges.append((start, start + chunk.total_compressed_size))
+            if chunk.bloom_filter_length:
+                bloom_start = chunk.bloom_filter_offset
+                ranges.append((bloom_start, bloom_start + chunk.bloom_filter_length))
+    return ranges
+
+
+def _is_fact_file(schema: pa.Schema) -> bool:
+    """Indica si un Parquet de procesados es de hechos (FACT_SCHEMA)."""
+    return "hotel_id" in schema.names and "link_detalle" not in schema.names
+
+
+def _row_group_may_match(
+    row_group: pq.RowGroupMetaData, filters: list[RowFilter]
+) -> bool:
+    """Evalúa los filtros contra las estadísticas mínimo/máximo de un row group."""
+    if row_group.num_rows == 0:
+        return False
+
+    statistics = {}
+    for index in range(row_group.num_columns):
+        column = row_group.column(index)
+        if column.statistics is not None and column.statistics.has_min_max:
+            statistics[column.path_in_schema] = column.statistics
+
+    for column, operator, value in filters:
+        stats = statistics.get(column)
+        if stats is None:
+            # Sin estadísticas no es posible descartar el row group
+            continue
+        low, high = stats.min, stats.max
+        if operator == "in":
+            values = [_align(v, low) for v in value]
+            if not any(low <= v <= high for v in values):
+                return False
+            continue
+        value = _align(value, low)
+        if operator == "==" and not low <= value <= high:
+            return False
+        if operator == "!=" and low == high == value:
+            return False
+        if operator == "<" and not low < value:
+            return False
+        if operator == "<=" and not low <= value:
+            return False
+        if operator == ">" and not high > value:
+            return False
+        if operator == ">=" and not high >= value:
+            return False
+    return True
+
+
+def _build_expression(filters: list[RowFilter]) -> ds.Expression:
+    """Construye la expresión Arrow equivalente a los filtros (combinados con AND)."""
+    expression = None
+    for column, operator, value in filters:
+        field = pc.field(column)
+        if operator == "in":
+            condition = field.isin(list(value))
+        elif operator == "==":
+            condition = field == value
+        elif operator == "!=":
+            condition = field != value
+        elif operator == "<":
+            condition = field < value
+        elif operator == "<=":
+            condition = field <= value
+        elif operator == ">":
+            condition = field > value
+        else:
+            condition = field >= value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _align(value: Any, reference: Any) -> Any:
+    """Adapta fechas del filtro al tipo de la estadística para poder compararlas."""
+    if isinstance(reference, datetime) and isinstance(value, date):
+        if not isinstance(value, datetime):
+            return datetime(value.year, value.month, value.day)
+    return value
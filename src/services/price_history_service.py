@@ -0,0 +1,288 @@
+"""
+Servicio de la tabla histórica de precios.
+
+Mantiene en S3 la tabla histórica en dos partes:
+
+- Filas vigentes, divididas por mes de estadía y buckets por hash de
+  link_detalle (`current/checkin_month=YYYY-MM/bucket=NNNNN/data.parquet`).
+  Cada lote solo reescribe, con escrituras condicionales, los buckets de
+  las claves que contiene, y un bucket guarda solo una fila por clave.
+- Filas cerradas, que solo se agregan: un Parquet por lote en la
+  partición de su fecha de ingesta (`closed/ingestion_date=.../<lote>.parquet`).
+
+Así el costo de la actualización depende del tamaño del lote y no del
+tamaño del historial.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import settings
+from processors.price_history import (
+    KEY_COLUMNS,
+    PRICE_HISTORY_SCHEMA,
+    empty_state,
+    merge_bucket,
+    prepare_observations,
+)
+from services.s3_service import (
+    ConditionalWriteConflictError,
+    S3Service,
+    update_object,
+)
+from utils.partition_utils import (
+    assign_buckets,
+    build_bucket_key,
+    build_partitioned_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PriceHistoryConflictError(ConditionalWriteConflictError):
+    """Error lanzado cuando escrituras concurrentes impiden actualizar un bucket."""
+
+
+@dataclass(frozen=True)
+class PriceHistoryUpdate:
+    """
+    Resumen de la actualización de la tabla histórica con un lote.
+    """
+
+    observations: int
+    buckets_touched: int
+    buckets_rewritten: int
+    inserted: int
+    closed: int
+    discarded: int
+
+
+class PriceHistoryService:
+    """Actualización incremental de la tabla histórica de precios."""
+
+    def __init__(self, s3: S3Service) -> None:
+        self._s3 = s3
+
+    def upsert(
+        self,
+        bucket: str,
+        processed: pa.Table,
+        observed_at: datetime,
+        batch_name: str,
+    ) -> PriceHistoryUpdate:
+        """
+        Aplica los precios de un lote procesado sobre la tabla histórica.
+
+        Los buckets de filas vigentes afectados se actualizan de a uno, en
+        orden, con una escritura condicional sobre su ETag; si otro lote lo
+        modificó en el medio, se relee y reintenta con backoff. Recorrerlos
+        en el mismo orden hace que los lotes concurrentes avancen uno
+        detrás de otro en lugar de chocar en todos los buckets a la vez.
+        Las filas cerradas del lote se escriben al final en el archivo del
+        lote; reprocesar el lote las combina con las ya escritas sin
+        duplicarlas. Las observaciones fuera de orden que caen dentro del
+        historial ya cerrado se descartan (ver `merge_bucket`).
+
+        Args:
+            bucket: Nombre del bucket de S3.
+            processed: Tabla con los registros válidos del lote (al menos
+                las columnas de OBSERVATION_COLUMNS).
+            observed_at: Momento de la observación (fecha de ingesta del lote).
+            batch_name: Nombre del lote.
+
+        Returns:
+            PriceHistoryUpdate con el resumen de la actualización.
+
+        Raises:
+            PriceHistoryConflictError: Si se agotan los reintentos de un bucket.
+            ClientError: Si la lectura o escritura falla en S3.
+        """
+        observations = prepare_observations(processed, observed_at, batch_name)
+        months = observations["checkin_date"].dt.strftime("%Y-%m")
+        buckets = assign_buckets(
+            observations["link_detalle"], settings.PRICE_HISTORY_BUCKETS
+        )
+
+        rewritten = inserted = discarded = 0
+        closed_parts = []
+        for (month, bucket_index), group in observations.groupby(
+            [months, buckets], sort=True
+        ):
+            written, bucket_inserted, bucket_closed, bucket_discarded = (
+                self._upsert_bucket(
+                    bucket, month, int(bucket_index), group.reset_index(drop=True)
+                )
+            )
+            rewritten += written
+            inserted += bucket_inserted
+            discarded += bucket_discarded
+            if not bucket_closed.empty:
+                closed_parts.append(bucket_closed)
+
+        closed = pd.concat(closed_parts, ignore_index=True) if closed_parts else None
+        if closed is not None:
+            self._append_closed(bucket, observed_at, batch_name, closed)
+
+        update = PriceHistoryUpdate(
+            observations=len(observations),
+            buckets_touched=observations.groupby([months, buckets]).ngroups,
+            buckets_rewritten=rewritten,
+            inserted=inserted,
+            closed=0 if closed is None else len(closed),
+            discarded=discarded,
+        )
+        logger.info(
+            "Historial de precios actualizado con el lote '%s': %d observaciones, "
+            "%d buckets reescritos de %d afectados, %d filas vigentes nuevas, "
+            "%d cerradas.",
+            batch_name,
+            update.observations,
+            update.buckets_rewritten,
+            update.buckets_touched,
+            update.inserted,
+            update.closed,
+        )
+        if discarded:
+            logger.warning(
+                "Lote '%s': %d observaciones fuera de orden descartadas por caer "
+                "dentro del historial de precios ya cerrado.",
+                batch_name,
+                discarded,
+            )
+        return update
+
+    def read_current(
+        self, bucket: str, checkin_month: str, bucket_index: int
+    ) -> pd.DataFrame:
+        """
+        Lee las filas vigentes de un bucket de la tabla histórica.
+
+        Args:
+            bucket: Nombre del bucket de S3.
+            checkin_month: Mes de estadía ("YYYY-MM").
+            bucket_index: Número de bucket.
+
+        Returns:
+            DataFrame con las filas vigentes del bucket (vacío si no existe).
+        """
+        key = _current_key(checkin_month, bucket_index)
+        current = self._s3.get_object_with_etag(bucket, key)
+        return _read_state(current[0]) if current else empty_state()
+
+    def read_closed(
+        self, bucket: str, observed_at: datetime, batch_name: str
+    ) -> pd.DataFrame:
+        """
+        Lee las filas cerradas por un lote.
+
+        Args:
+            bucket: Nombre del bucket de S3.
+            observed_at: Momento de la observación (fecha de ingesta del lote).
+            batch_name: Nombre del lote.
+
+        Returns:
+            DataFrame con las filas cerradas del lote (vacío si no cerró ninguna).
+        """
+        key = _closed_key(observed_at, batch_name)
+        current = self._s3.get_object_with_etag(bucket, key)
+        return _read_state(current[0]) if current else empty_state()
+
+    def _upsert_bucket(
+        self,
+        bucket: str,
+        checkin_month: str,
+        bucket_index: int,
+        observations: pd.DataFrame,
+    ) -> tuple[bool, int, pd.DataFrame, int]:
+        """Actualiza condicionalmente las filas vigentes de un bucket.
+
+        Returns:
+            Tupla con (reescrito, filas_vigentes_insertadas, filas_cerradas,
+            observaciones_descartadas) del último intento.
+        """
+        result: tuple[int, pd.DataFrame, int] = (0, empty_state(), 0)
+
+        def merge(content: Optional[bytes]) -> Optional[bytes]:
+            nonlocal result
+            current = _read_state(content) if content else empty_state()
+            new_current, closed, inserted, discarded = merge_bucket(
+                current, observations
+            )
+            result = (inserted, closed, discarded)
+            if new_current is current:
+                return None
+            return _serialize_state(new_current)
+
+        written = update_object(
+            self._s3,
+            bucket,
+            _current_key(checkin_month, bucket_index),
+            merge,
+            settings.PRICE_HISTORY_MAX_RETRIES,
+            conflict_error=PriceHistoryConflictError,
+        )
+        return (written, *result)
+
+    def _append_closed(
+        self,
+        bucket: str,
+        observed_at: datetime,
+        batch_name: str,
+        closed: pd.DataFrame,
+    ) -> None:
+        """Agrega las filas cerradas de un lote a su archivo, sin duplicarlas."""
+
+        def merge(content: Optional[bytes]) -> bytes:
+            rows = closed if not content else pd.concat([_read_state(content), closed])
+            rows = rows.drop_duplicates(
+                subset=[*KEY_COLUMNS, "valid_from", "lote"], keep="last"
+            )
+            return _serialize_state(
+                rows.sort_values([*KEY_COLUMNS, "valid_from"], ignore_index=True)
+            )
+
+        update_object(
+            self._s3,
+            bucket,
+            _closed_key(observed_at, batch_name),
+            merge,
+            settings.PRICE_HISTORY_MAX_RETRIES,
+            conflict_error=PriceHistoryConflictError,
+        )
+
+
+def _current_key(checkin_month: str, bucket_index: int) -> str:
+    """Clave del Parquet de filas vigentes de un mes de estadía y bucket."""
+    return build_bucket_key(
+        f"{settings.PRICE_HISTORY_PREFIX}current/checkin_month={checkin_month}/",
+        bucket_index,
+    )
+
+
+def _closed_key(observed_at: datetime, batch_name: str) -> str:
+    """Clave del Parquet de filas cerradas de un lote."""
+    return build_partitioned_key(
+        f"{settings.PRICE_HISTORY_PREFIX}closed/", observed_at, batch_name
+    )
+
+
+def _read_state(content: bytes) -> pd.DataFrame:
+    """Lee un Parquet de la tabla histórica."""
+    return pq.read_table(BytesIO(content), schema=PRICE_HISTORY_SCHEMA).to_pandas()
+
+
+def _serialize_state(state: pd.DataFrame) -> bytes:
+    """Serializa filas de la tabla histórica como Parquet con su esquema."""
+    table = pa.Table.from_pandas(
+        state, schema=PRICE_HISTORY_SCHEMA, preserve_index=False
+    )
+    buffer = BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
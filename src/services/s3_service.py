@@ -6,36 +6,226 @@ en buckets de S3 utilizando boto3.
 """
 
 import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Optional
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError
 
+from config import settings
+from utils.disk_cache import DiskCache
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class S3ObjectInfo:
+    """Metadatos de un objeto devueltos por el listado de S3."""
+
+    key: str
+    size: int
+    etag: str
+
+
 class S3Service:
-    """Cliente simplificado para operaciones comunes sobre Amazon S3."""
+    """Cliente simplificado para operaciones comunes sobre Amazon S3.
+
+    Opcionalmente utiliza una caché en disco de lectura (read-through) para
+    `get_object` y `get_object_stream`. Las entradas se identifican por
+    bucket, clave y ETag, y antes de servir una entrada se revalida con un
+    GET condicional (IfNoneMatch), salvo que el llamador ya conozca el ETag
+    vigente por un listado reciente.
+    """
 
-    def __init__(self) -> None:
-        self._client = boto3.client("s3")
+    def __init__(
+        self, cache: Optional[DiskCache] = None, client: Optional[Any] = None
+    ) -> None:
+        """
+        Args:
+            cache: Caché en disco de objetos leídos. None deshabilita la caché.
+            client: Cliente de S3 a utilizar (por ejemplo, un sustituto local
+                para pruebas de carga). None crea un cliente de boto3.
+        """
+        self._client = client or boto3.client("s3")
+        self._cache = cache
+        self._stats_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
-    def get_object(self, bucket: str, key: str) -> bytes:
+    def get_object(self, bucket: str, key: str, etag: Optional[str] = None) -> bytes:
         """Descarga el contenido de un objeto de S3 como bytes.
 
         Args:
             bucket: Nombre del bucket.
             key: Clave (ruta) del objeto dentro del bucket.
+            etag: ETag vigente del objeto, si se conoce por un listado reciente.
 
         Returns:
             Contenido del objeto en bytes.
 
+        Raises:
+            ClientError: Si la operación de lectura falla en S3.
+        """
+        if self._cache is not None:
+            stream, _ = self.get_object_stream(bucket, key, etag)
+            with stream:
+                return stream.read()
+        try:
+            response = self._client.get_object(Bucket=bucket, Key=key)
+            return response["Body"].read()
+        except ClientError:
+            logger.error(
+                "Error al descargar objeto. Bucket: '%s', Key: '%s'.",
+                bucket,
+                key,
+                exc_info=True,
+            )
+            raise
+
+    def get_object_stream(
+        self, bucket: str, key: str, etag: Optional[str] = None
+    ) -> tuple[BinaryIO, int]:
+        """Abre un objeto de S3 como stream de lectura sin descargarlo completo.
+
+        Con caché habilitada, el objeto se sirve desde disco si la entrada
+        sigue vigente; si no, se lee de S3 y se copia a la caché a medida
+        que el llamador lo consume (salvo que exceda el tamaño de la caché).
+
+        Args:
+            bucket: Nombre del bucket.
+            key: Clave (ruta) del objeto dentro del bucket.
+            etag: ETag vigente del objeto, si se conoce por un listado reciente.
+                Permite servir la entrada en caché sin revalidarla.
+
+        Returns:
+            Tupla con (stream_del_contenido, tamaño_en_bytes).
+
         Raises:
             ClientError: Si la operación de lectura falla en S3.
         """
         try:
+            if self._cache is not None:
+                return self._get_cached_stream(bucket, key, etag)
             response = self._client.get_object(Bucket=bucket, Key=key)
+            return response["Body"], response["ContentLength"]
+        except ClientError:
+            logger.error(
+                "Error al descargar objeto. Bucket: '%s', Key: '%s'.",
+                bucket,
+                key,
+                exc_info=True,
+            )
+            raise
+
+    def _get_cached_stream(
+        self, bucket: str, key: str, etag: Optional[str]
+    ) -> tuple[BinaryIO, int]:
+        """Resuelve una lectura contra la caché en disco, revalidando con S3."""
+        cached_etag = self._cache.get(_etag_cache_key(bucket, key))
+        known_etag = etag or (cached_etag.decode("utf-8") if cached_etag else None)
+
+        request = {"Bucket": bucket, "Key": key}
+        if known_etag is not None and self._cache.contains(
+            _object_cache_key(bucket, key, known_etag)
+        ):
+            if etag is not None:
+                # El listado ya garantiza que la entrada está vigente
+                cached = self._open_cache_hit(bucket, key, known_etag)
+                if cached is not None:
+                    return cached
+            request["IfNoneMatch"] = known_etag
+
+        try:
+            response = self._client.get_object(**request)
+        except ClientError as e:
+            if _error_code(e) not in ("304", "NotModified"):
+                raise
+            cached = self._open_cache_hit(bucket, key, known_etag)
+            if cached is not None:
+                return cached
+            # La entrada se desalojó entre la validación y la lectura
+            response = self._client.get_object(Bucket=bucket, Key=key)
+
+        with self._stats_lock:
+            self.cache_misses += 1
+        size = response["ContentLength"]
+        if size > self._cache.max_bytes:
+            return response["Body"], size
+        new_etag = response["ETag"]
+        stream = self._cache.put_stream(
+            _object_cache_key(bucket, key, new_etag), response["Body"], size
+        )
+        self._cache.put(_etag_cache_key(bucket, key), new_etag.encode("utf-8"))
+        return stream, size
+
+    def _open_cache_hit(
+        self, bucket: str, key: str, etag: str
+    ) -> Optional[tuple[BinaryIO, int]]:
+        """Abre una entrada vigente de la caché y registra el acierto."""
+        stream = self._cache.open(_object_cache_key(bucket, key, etag))
+        if stream is None:
+            return None
+        with self._stats_lock:
+            self.cache_hits += 1
+        size = os.fstat(stream.fileno()).st_size
+        return stream, size
+
+    def get_object_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        """Descarga un rango de bytes de un objeto de S3.
+
+        Args:
+            bucket: Nombre del bucket.
+            key: Clave (ruta) del objeto dentro del bucket.
+            start: Posición del primer byte a leer.
+            length: Cantidad de bytes a leer.
+
+        Returns:
+            Contenido del rango solicitado.
+
+        Raises:
+            ClientError: Si la operación de lectura falla en S3.
+        """
+        try:
+            response = self._client.get_object(
+                Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}"
+            )
             return response["Body"].read()
         except ClientError:
+            logger.error(
+                "Error al descargar rango de objeto. Bucket: '%s', Key: '%s'.",
+                bucket,
+                key,
+                exc_info=True,
+            )
+            raise
+
+    def get_object_with_etag(
+        self, bucket: str, key: str
+    ) -> Optional[tuple[bytes, str]]:
+        """Descarga un objeto junto con su ETag, si existe.
+
+        Args:
+            bucket: Nombre del bucket.
+            key: Clave (ruta) del objeto dentro del bucket.
+
+        Returns:
+            Tupla con (contenido, etag), o None si el objeto no existe.
+
+        Raises:
+            ClientError: Si la operación de lectura falla en S3.
+        """
+        try:
+            response = self._client.get_object(Bucket=bucket, Key=key)
+            return response["Body"].read(), response["ETag"]
+        except ClientError as e:
+            # NoSuchKey es el caso esperado cuando el objeto no existe
+            if _error_code(e) in ("NoSuchKey", "404"):
+                return None
             logger.error(
                 "Error al descargar objeto. Bucket: '%s', Key: '%s'.",
                 bucket,
@@ -44,20 +234,68 @@ class S3Service:
             )
             raise
 
-    def put_object(self, bucket: str, key: str, body: bytes) -> None:
+    def put_object(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
         """Sube un objeto al bucket de S3.
 
+        Admite escrituras condicionales: con `if_match` solo se sobrescribe
+        el objeto si su ETag actual coincide, y con `if_none_match="*"` solo
+        se crea si todavía no existe.
+
         Args:
             bucket: Nombre del bucket.
             key: Clave (ruta) de destino del objeto.
             body: Contenido del objeto en bytes.
+            if_match: ETag esperado del objeto existente.
+            if_none_match: "*" para exigir que el objeto no exista.
+
+        Raises:
+            ClientError: Si la operación de escritura falla en S3 o no se
+                cumple la condición de escritura.
+        """
+        conditions = {}
+        if if_match is not None:
+            conditions["IfMatch"] = if_match
+        if if_none_match is not None:
+            conditions["IfNoneMatch"] = if_none_match
+        try:
+            self._client.put_object(Bucket=bucket, Key=key, Body=body, **conditions)
+        except ClientError as e:
+            # Una condición no cumplida la resuelve quien pidió la escritura
+            if is_precondition_failure(e):
+                raise
+            logger.error(
+                "Error al subir objeto. Bucket: '%s', Key: '%s'.",
+                bucket,
+                key,
+                exc_info=True,
+            )
+            raise
+
+    def upload_fileobj(self, bucket: str, key: str, fileobj: BinaryIO) -> None:
+        """Sube un objeto al bucket de S3 leyendo su contenido desde un stream.
+
+        Para archivos grandes la subida se realiza en partes (multipart),
+        sin cargar el contenido completo en memoria.
+
+        Args:
+            bucket: Nombre del bucket.
+            key: Clave (ruta) de destino del objeto.
+            fileobj: Stream de lectura posicionado al inicio del contenido.
 
         Raises:
             ClientError: Si la operación de escritura falla en S3.
+            S3UploadFailedError: Si falla alguna de las partes de la subida.
         """
         try:
-            self._client.put_object(Bucket=bucket, Key=key, Body=body)
-        except ClientError:
+            self._client.upload_fileobj(fileobj, bucket, key)
+        except (ClientError, S3UploadFailedError):
             logger.error(
                 "Error al subir objeto. Bucket: '%s', Key: '%s'.",
                 bucket,
@@ -66,6 +304,59 @@ class S3Service:
             )
             raise
 
+    def download_fileobj(self, bucket: str, key: str, fileobj: BinaryIO) -> None:
+        """Descarga un objeto del bucket de S3 escribiéndolo en un stream.
+
+        Para objetos grandes la descarga se realiza en partes, sin cargar
+        el contenido completo en memoria.
+
+        Args:
+            bucket: Nombre del bucket.
+            key: Clave (ruta) del objeto.
+            fileobj: Stream de escritura donde se vuelca el contenido.
+
+        Raises:
+            ClientError: Si la operación de lectura falla en S3.
+        """
+        try:
+            self._client.download_fileobj(bucket, key, fileobj)
+        except ClientError:
+            logger.error(
+                "Error al descargar objeto. Bucket: '%s', Key: '%s'.",
+                bucket,
+                key,
+                exc_info=True,
+            )
+            raise
+
+    def delete_objects(self, bucket: str, keys: list[str]) -> None:
+        """Elimina objetos del bucket de S3, en lotes de hasta 1000 claves.
+
+        Args:
+            bucket: Nombre del bucket.
+            keys: Claves de los objetos a eliminar.
+
+        Raises:
+            ClientError: Si la operación de borrado falla en S3.
+        """
+        try:
+            for start in range(0, len(keys), 1000):
+                self._client.delete_objects(
+                    Bucket=bucket,
+                    Delete={
+                        "Objects": [{"Key": key} for key in keys[start : start + 1000]],
+                        "Quiet": True,
+                    },
+                )
+        except ClientError:
+            logger.error(
+                "Error al eliminar objetos. Bucket: '%s', Keys: %d.",
+                bucket,
+                len(keys),
+                exc_info=True,
+            )
+            raise
+
     def list_objects(self, bucket: str, prefix: str) -> list[str]:
         """Lista las claves de objetos que coinciden con un prefijo.
 
@@ -91,6 +382,38 @@ class S3Service:
             )
             raise
 
+    def list_objects_metadata(self, bucket: str, prefix: str) -> list[S3ObjectInfo]:
+        """Lista los objetos bajo un prefijo junto con su tamaño y ETag.
+
+        A diferencia de `list_objects`, recorre todas las páginas del listado
+        y conserva los metadatos que S3 ya devuelve para cada objeto.
+
+        Args:
+            bucket: Nombre del bucket.
+            prefix: Prefijo para filtrar objetos.
+
+        Returns:
+            Lista de S3ObjectInfo encontrados bajo el prefijo dado.
+
+        Raises:
+            ClientError: Si la operación de listado falla en S3.
+        """
+        try:
+            paginator = self._client.get_paginator("list_objects_v2")
+            return [
+                S3ObjectInfo(key=obj["Key"], size=obj["Size"], etag=obj["ETag"])
+                for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+                for obj in page.get("Contents", [])
+            ]
+        except ClientError:
+            logger.error(
+                "Error al listar objetos. Bucket: '%s', Prefix: '%s'.",
+                bucket,
+                prefix,
+                exc_info=True,
+            )
+            raise
+
     def object_exists(self, bucket: str, key: str) -> bool:
         """Verifica si un objeto existe en el bucket.
 
@@ -106,8 +429,7 @@ class S3Service:
             return True
         except ClientError as e:
             # 404 es el caso esperado cuando el objeto no existe
-            error_code = e.response.get("Error", {}).get("Code", "")
-            if error_code == "404":
+            if _error_code(e) == "404":
                 return False
             logger.error(
                 "Error al verificar existencia del objeto. Bucket: '%s', Key: '%s'.",
@@ -116,3 +438,110 @@ class S3Service:
                 exc_info=True,
             )
             raise
+
+
+class ConditionalWriteConflictError(RuntimeError):
+    """Error lanzado cuando se agotan los reintentos de una escritura condicional."""
+
+
+def update_object(
+    s3: S3Service,
+    bucket: str,
+    key: str,
+    merge: Callable[[Optional[bytes]], Optional[bytes]],
+    max_retries: int,
+    conflict_error: type[ConditionalWriteConflictError] = ConditionalWriteConflictError,
+) -> bool:
+    """Actualiza un objeto compartido con lectura, combinación y escritura condicional.
+
+    Lee el objeto con su ETag, obtiene el nuevo contenido con `merge` y lo
+    escribe solo si nadie lo modificó en el medio (IfMatch, o IfNoneMatch
+    si todavía no existía). Ante un conflicto espera un tiempo aleatorio
+    con crecimiento exponencial (backoff con jitter) y reintenta desde la
+    lectura, de modo que los escritores concurrentes se desincronicen.
+
+    Args:
+        s3: Servicio de S3.
+        bucket: Nombre del bucket.
+        key: Clave del objeto compartido.
+        merge: Recibe el contenido actual (None si no existe) y devuelve el
+            nuevo contenido, o None si no hay cambios que escribir. Puede
+            invocarse más de una vez, una por intento.
+        max_retries: Cantidad máxima de intentos.
+        conflict_error: Subclase de error a lanzar si se agotan los intentos.
+
+    Returns:
+        True si se escribió el objeto, False si `merge` no produjo cambios.
+
+    Raises:
+        ConditionalWriteConflictError: Si se agotan los intentos (o la
+            subclase indicada en `conflict_error`).
+        ClientError: Si la lectura o escritura falla en S3.
+    """
+    for attempt in range(1, max_retries + 1):
+        current = s3.get_object_with_etag(bucket, key)
+        body = merge(current[0] if current else None)
+        if body is None:
+            return False
+
+        try:
+            s3.put_object(
+                bucket,
+                key,
+                body,
+                if_match=current[1] if current else None,
+                if_none_match=None if current else "*",
+            )
+            return True
+        except ClientError as e:
+            if not is_precondition_failure(e):
+                raise
+            logger.warning(
+                "Objeto '%s' modificado concurrentemente (intento %d/%d).",
+                key,
+                attempt,
+                max_retries,
+            )
+            if attempt < max_retries:
+                time.sleep(_backoff_seconds(attempt))
+
+    raise conflict_error(
+        f"No se pudo actualizar '{key}' tras {max_retries} intentos "
+        "por escrituras concurrentes."
+    )
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Espera antes del siguiente intento: exponencial acotada con jitter completo."""
+    ceiling = min(
+        settings.CONDITIONAL_WRITE_BACKOFF_MAX_MS,
+        settings.CONDITIONAL_WRITE_BACKOFF_BASE_MS * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling) / 1000
+
+
+def is_precondition_failure(error: ClientError) -> bool:
+    """Indica si el error corresponde a una escritura condicional no cumplida.
+
+    Args:
+        error: Error devuelto por boto3.
+
+    Returns:
+        True si S3 rechazó la escritura por su condición (IfMatch/IfNoneMatch).
+    """
+    return _error_code(error) in ("PreconditionFailed", "ConditionalRequestConflict")
+
+
+def _error_code(error: ClientError) -> str:
+    """Extrae el código de error de una respuesta de S3."""
+    return error.response.get("Error", {}).get("Code", "")
+
+
+def _object_cache_key(bucket: str, key: str, etag: str) -> str:
+    """Clave de caché del contenido de una versión (ETag) de un objeto."""
+    return f"s3://{bucket}/{key}@{etag}"
+
+
+def _etag_cache_key(bucket: str, key: str) -> str:
+    """Clave de caché del último ETag conocido de un objeto."""
+    return f"etag:s3://{bucket}/{key}"
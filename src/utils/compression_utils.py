@@ -0,0 +1,111 @@
+"""
+Módulo utilitario para la lectura de CSVs crudos comprimidos.
+
+Permite detectar la compresión de un objeto a partir de su extensión y
+descomprimirlo como stream, sin materializar en memoria ni la versión
+comprimida ni la descomprimida del archivo completo.
+"""
+
+import io
+from typing import BinaryIO, Optional
+
+import pyarrow as pa
+
+# Extensiones aceptadas para archivos crudos y el codec de pyarrow asociado.
+# None indica que el archivo no está comprimido.
+CSV_EXTENSIONS: dict[str, Optional[str]] = {
+    ".csv": None,
+    ".csv.gz": "gzip",
+    ".csv.zst": "zstd",
+}
+
+
+def is_csv_key(key: str) -> bool:
+    """
+    Indica si la clave corresponde a un CSV crudo (comprimido o no).
+
+    Args:
+        key: Clave (ruta) del objeto en S3.
+
+    Returns:
+        True si la extensión de la clave está soportada, False en caso contrario.
+    """
+    return any(key.endswith(extension) for extension in CSV_EXTENSIONS)
+
+
+def detect_compression(key: str) -> Optional[str]:
+    """
+    Determina el codec de compresión de un CSV crudo a partir de su extensión.
+
+    Args:
+        key: Clave (ruta) del objeto en S3.
+
+    Returns:
+        Nombre del codec ("gzip", "zstd") o None si el archivo no está comprimido.
+
+    Raises:
+        ValueError: Si la clave no tiene una extensión de CSV soportada.
+    """
+    for extension, compression in CSV_EXTENSIONS.items():
+        if extension != ".csv" and key.endswith(extension):
+            return compression
+    if key.endswith(".csv"):
+        return None
+    raise ValueError(f"Extensión no soportada para el objeto '{key}'.")
+
+
+class CountingReader(io.RawIOBase):
+    """
+    Envoltorio de solo lectura que contabiliza los bytes entregados.
+
+    Se utiliza para medir el tamaño descomprimido de un archivo mientras
+    el parser de CSV lo consume, sin necesidad de bufferizarlo.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._stream.read()
+        else:
+            data = self._stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def open_decompressed_stream(
+    stream: BinaryIO, compression: Optional[str]
+) -> CountingReader:
+    """
+    Abre un stream de lectura descomprimido sobre un stream de bytes crudo.
+
+    La descompresión se realiza de forma incremental a medida que se lee,
+    por lo que el consumo de memoria no depende del tamaño del archivo.
+
+    Args:
+        stream: Stream de bytes de origen (por ejemplo, el Body de S3).
+        compression: Codec de compresión o None si no está comprimido.
+
+    Returns:
+        Lector que entrega los bytes descomprimidos y contabiliza su tamaño.
+    """
+    if compression is None:
+        return CountingReader(stream)
+
+    raw = pa.PythonFile(stream, mode="r")
+    return CountingReader(pa.CompressedInputStream(raw, compression))
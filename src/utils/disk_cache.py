@@ -0,0 +1,320 @@
+"""
+Módulo utilitario con una caché en disco local acotada por tamaño.
+
+Pensada para el almacenamiento efímero de Lambda (/tmp), que persiste
+entre invocaciones de un mismo contenedor "caliente". Las entradas se
+desalojan con política LRU cuando el total supera el máximo configurado.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sufijo de los archivos temporales de entradas a medio escribir. El
+# prefijo es el pid del proceso que las escribe
+_TMP_SUFFIX = ".tmp"
+
+
+class DiskCache:
+    """
+    Caché clave/valor de bytes persistida en un directorio local.
+
+    Las claves son textos arbitrarios; cada entrada se guarda en un archivo
+    cuyo nombre es el hash de la clave. Es segura para uso concurrente
+    desde varios hilos de un mismo proceso.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing_entries()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Obtiene el contenido asociado a una clave.
+
+        Args:
+            key: Clave de la entrada.
+
+        Returns:
+            Contenido en bytes, o None si la clave no está en caché.
+        """
+        file_name = self._file_name(key)
+        data = None
+        with self._lock:
+            if file_name in self._entries:
+                try:
+                    with open(os.path.join(self._directory, file_name), "rb") as file:
+                        data = file.read()
+                    self._entries.move_to_end(file_name)
+                except FileNotFoundError:
+                    # El archivo fue eliminado por fuera; se trata como ausencia
+                    self._forget(file_name)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """
+        Abre para lectura la entrada asociada a una clave.
+
+        Útil para entradas grandes que se consumen como stream. El archivo
+        abierto sigue siendo legible aunque la entrada se desaloje después.
+
+        Args:
+            key: Clave de la entrada.
+
+        Returns:
+            Archivo abierto en modo binario, o None si la clave no está en caché.
+        """
+        file_name = self._file_name(key)
+        file = None
+        with self._lock:
+            if file_name in self._entries:
+                try:
+                    file = open(os.path.join(self._directory, file_name), "rb")
+                    self._entries.move_to_end(file_name)
+                except FileNotFoundError:
+                    # El archivo fue eliminado por fuera; se trata como ausencia
+                    self._forget(file_name)
+            if file is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return file
+
+    def contains(self, key: str) -> bool:
+        """
+        Indica si una clave está en caché sin afectar contadores ni el orden LRU.
+
+        Args:
+            key: Clave de la entrada.
+
+        Returns:
+            True si la entrada existe.
+        """
+        with self._lock:
+            return self._file_name(key) in self._entries
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Guarda contenido en caché, desalojando entradas antiguas si es necesario.
+
+        El archivo se escribe primero con un nombre temporal y luego se mueve
+        atómicamente, por lo que nunca se lee una entrada a medio escribir.
+
+        Args:
+            key: Clave de la entrada.
+            data: Contenido a guardar.
+        """
+        if len(data) > self._max_bytes:
+            return
+        file, tmp_path = self._open_tmp()
+        with file:
+            file.write(data)
+        self._commit(self._file_name(key), tmp_path, len(data))
+
+    def put_stream(
+        self, key: str, stream: BinaryIO, size: Optional[int] = None
+    ) -> BinaryIO:
+        """
+        Envuelve un stream para guardar en caché su contenido mientras se lee.
+
+        Cada bloque leído se copia también a un archivo temporal, por lo que
+        el llamador consume el contenido sin esperar a que se descargue
+        completo. La entrada se registra recién cuando el stream se lee
+        hasta el final; si se cierra antes o el contenido excede el tamaño
+        máximo de la caché, el archivo temporal se descarta.
+
+        Args:
+            key: Clave de la entrada.
+            stream: Stream de lectura con el contenido.
+            size: Tamaño del contenido, si se conoce. Si excede el máximo de
+                la caché, el stream se devuelve sin copiarlo a disco.
+
+        Returns:
+            Stream de lectura con el contenido.
+        """
+        if size is not None and size > self._max_bytes:
+            return stream
+        file, tmp_path = self._open_tmp()
+        return _CachingReader(self, self._file_name(key), stream, file, tmp_path, size)
+
+    @property
+    def max_bytes(self) -> int:
+        """Tamaño máximo en bytes de la caché."""
+        return self._max_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        """Tamaño total en bytes de las entradas en caché."""
+        return self._total_bytes
+
+    def _open_tmp(self) -> tuple[BinaryIO, str]:
+        """Crea un archivo temporal para una entrada, marcado con el pid actual."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._directory, prefix=f"{os.getpid()}-", suffix=_TMP_SUFFIX
+        )
+        return os.fdopen(fd, "wb"), tmp_path
+
+    def _evict(self) -> None:
+        """Desaloja las entradas menos usadas hasta respetar el tamaño máximo."""
+        while self._total_bytes > self._max_bytes and self._entries:
+            file_name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self._directory, file_name))
+            except FileNotFoundError:
+                pass
+            logger.debug("Entrada '%s' desalojada de la caché en disco.", file_name)
+
+    def _commit(self, file_name: str, tmp_path: str, size: int) -> None:
+        """Mueve un archivo temporal a su ubicación final y lo registra en el índice."""
+        with self._lock:
+            os.replace(tmp_path, os.path.join(self._directory, file_name))
+            self._forget(file_name)
+            self._entries[file_name] = size
+            self._total_bytes += size
+            self._evict()
+
+    def _forget(self, file_name: str) -> None:
+        """Quita una entrada del índice en memoria (sin borrar el archivo)."""
+        size = self._entries.pop(file_name, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _load_existing_entries(self) -> None:
+        """Reconstruye el índice con las entradas que ya existen en el directorio.
+
+        Los archivos temporales de procesos que ya terminaron se eliminan;
+        los de procesos en ejecución pueden estar escribiéndose y se
+        conservan.
+        """
+        existing = []
+        for file_name in os.listdir(self._directory):
+            path = os.path.join(self._directory, file_name)
+            try:
+                if file_name.endswith(_TMP_SUFFIX):
+                    if not _is_writer_alive(file_name):
+                        os.remove(path)
+                    continue
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Otro proceso la movió o desalojó mientras se listaba
+                continue
+            existing.append((stat.st_mtime, file_name, stat.st_size))
+        for _, file_name, size in sorted(existing):
+            self._entries[file_name] = size
+            self._total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class _CachingReader(io.RawIOBase):
+    """
+    Envoltorio de solo lectura que copia a la caché los bytes entregados.
+
+    Al llegar al final del stream registra la entrada en la caché; si el
+    contenido excede su tamaño máximo, o el stream se cierra antes del
+    final, descarta el archivo temporal.
+    """
+
+    def __init__(
+        self,
+        cache: DiskCache,
+        file_name: str,
+        stream: BinaryIO,
+        file: BinaryIO,
+        tmp_path: str,
+        expected_size: Optional[int],
+    ) -> None:
+        self._cache = cache
+        self._file_name = file_name
+        self._stream = stream
+        self._file: Optional[BinaryIO] = file
+        self._tmp_path = tmp_path
+        self._expected_size = expected_size
+        self._size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._stream.read()
+        else:
+            data = self._stream.read(size)
+        if self._file is None:
+            return data
+        self._size += len(data)
+        if self._size > self._cache.max_bytes:
+            self._discard()
+            return data
+        self._file.write(data)
+        # Una lectura completa, o vacía con tamaño pedido, indica el final
+        if size is None or size < 0 or (size > 0 and not data):
+            self._finish()
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            if self._file is not None:
+                self._discard()
+            self._stream.close()
+        super().close()
+
+    def _finish(self) -> None:
+        """Registra en la caché el contenido leído completo."""
+        file, self._file = self._file, None
+        file.close()
+        if self._expected_size is not None and self._size != self._expected_size:
+            os.remove(self._tmp_path)
+            return
+        self._cache._commit(self._file_name, self._tmp_path, self._size)
+
+    def _discard(self) -> None:
+        """Descarta el archivo temporal sin registrar la entrada."""
+        file, self._file = self._file, None
+        file.close()
+        os.remove(self._tmp_path)
+
+
+def _is_writer_alive(tmp_name: str) -> bool:
+    """Indica si el proceso que escribe un archivo temporal sigue en ejecución."""
+    pid = tmp_name.split("-", 1)[0]
+    if not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # El proceso existe, pero pertenece a otro usuario
+        return True
+    return True
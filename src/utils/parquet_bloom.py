@@ -0,0 +1,237 @@
+"""
+Módulo utilitario para consultar los bloom filters de archivos Parquet.
+
+pyarrow puede escribir bloom filters pero no expone una forma de
+consultarlos, por lo que este módulo implementa la lectura del formato
+estándar de Parquet (split block bloom filter con hash XXH64): decodifica
+el encabezado Thrift del filtro y evalúa si un valor puede estar presente.
+"""
+
+import struct
+from typing import Any, Optional
+
+_MASK_64 = (1 << 64) - 1
+_MASK_32 = (1 << 32) - 1
+
+_PRIME64_1 = 11400714785074694791
+_PRIME64_2 = 14029467366897019727
+_PRIME64_3 = 1609587929392839161
+_PRIME64_4 = 9650029242287828579
+_PRIME64_5 = 2870177450012600261
+
+# Constantes del split block bloom filter definidas por el formato Parquet
+_SALT = (
+    0x47B6137B,
+    0x44974D91,
+    0x8824AD5B,
+    0xA2B7289D,
+    0x705495C7,
+    0x2DF1424B,
+    0x9EFC4947,
+    0x5C6BFB31,
+)
+_BLOCK_BYTES = 32
+
+# Tipos del protocolo Thrift compacto usados por el encabezado del filtro
+_THRIFT_STOP = 0
+_THRIFT_I32 = 5
+_THRIFT_STRUCT = 12
+
+
+def read_bloom_filter(data: bytes) -> Optional[bytes]:
+    """
+    Extrae el bitset de un bloom filter serializado (encabezado + bitset).
+
+    Args:
+        data: Bytes del filtro tal como se guardan en el archivo Parquet.
+
+    Returns:
+        Bitset del filtro, o None si el encabezado no puede interpretarse.
+    """
+    try:
+        num_bytes, header_length = _parse_header(data)
+    except (IndexError, ValueError):
+        return None
+    bitset = data[header_length : header_length + num_bytes]
+    if num_bytes <= 0 or len(bitset) != num_bytes or num_bytes % _BLOCK_BYTES:
+        return None
+    return bitset
+
+
+def may_contain(bitset: bytes, value: Any, physical_type: str) -> bool:
+    """
+    Evalúa si un valor puede estar presente según un bloom filter.
+
+    Args:
+        bitset: Bitset del filtro, obtenido con `read_bloom_filter`.
+        value: Valor buscado.
+        physical_type: Tipo físico Parquet de la columna ("BYTE_ARRAY",
+            "INT32", "INT64" o "DOUBLE").
+
+    Returns:
+        False si el valor seguro no está; True si puede estar (o si el
+        tipo del valor no es soportado).
+    """
+    encoded = _plain_encode(value, physical_type)
+    if encoded is None:
+        return True
+
+    hash_value = xxh64(encoded)
+    num_blocks = len(bitset) // _BLOCK_BYTES
+    block = (((hash_value >> 32) * num_blocks) >> 32) * _BLOCK_BYTES
+    key = hash_value & _MASK_32
+    words = struct.unpack_from("<8I", bitset, block)
+    for word, salt in zip(words, _SALT):
+        bit = ((key * salt) & _MASK_32) >> 27
+        if not word & (1 << bit):
+            return False
+    return True
+
+
+def xxh64(data: bytes, seed: int = 0) -> int:
+    """
+    Calcula el hash XXH64 de un bloque de bytes.
+
+    Args:
+        data: Bytes a hashear.
+        seed: Semilla del hash (Parquet usa 0).
+
+    Returns:
+        Hash de 64 bits como entero sin signo.
+    """
+    length = len(data)
+    offset = 0
+
+    if length >= 32:
+        v1 = (seed + _PRIME64_1 + _PRIME64_2) & _MASK_64
+        v2 = (seed + _PRIME64_2) & _MASK_64
+        v3 = seed
+        v4 = (seed - _PRIME64_1) & _MASK_64
+        while offset + 32 <= length:
+            lanes = struct.unpack_from("<4Q", data, offset)
+            v1 = _round(v1, lanes[0])
+            v2 = _round(v2, lanes[1])
+            v3 = _round(v3, lanes[2])
+            v4 = _round(v4, lanes[3])
+            offset += 32
+        result = (
+            _rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)
+        ) & _MASK_64
+        for lane in (v1, v2, v3, v4):
+            result = _merge_round(result, lane)
+    else:
+        result = (seed + _PRIME64_5) & _MASK_64
+
+    result = (result + length) & _MASK_64
+
+    while offset + 8 <= length:
+        (lane,) = struct.unpack_from("<Q", data, offset)
+        result ^= _round(0, lane)
+        result = (_rotl(result, 27) * _PRIME64_1 + _PRIME64_4) & _MASK_64
+        offset += 8
+    if offset + 4 <= length:
+        (lane,) = struct.unpack_from("<I", data, offset)
+        result ^= (lane * _PRIME64_1) & _MASK_64
+        result = (_rotl(result, 23) * _PRIME64_2 + _PRIME64_3) & _MASK_64
+        offset += 4
+    while offset < length:
+        result ^= (data[offset] * _PRIME64_5) & _MASK_64
+        result = (_rotl(result, 11) * _PRIME64_1) & _MASK_64
+        offset += 1
+
+    result ^= result >> 33
+    result = (result * _PRIME64_2) & _MASK_64
+    result ^= result >> 29
+    result = (result * _PRIME64_3) & _MASK_64
+    result ^= result >> 32
+    return result
+
+
+def _rotl(value: int, bits: int) -> int:
+    return ((value << bits) | (value >> (64 - bits))) & _MASK_64
+
+
+def _round(accumulator: int, lane: int) -> int:
+    accumulator = (accumulator + lane * _PRIME64_2) & _MASK_64
+    return (_rotl(accumulator, 31) * _PRIME64_1) & _MASK_64
+
+
+def _merge_round(accumulator: int, lane: int) -> int:
+    accumulator ^= _round(0, lane)
+    return (accumulator * _PRIME64_1 + _PRIME64_4) & _MASK_64
+
+
+def _plain_encode(value: Any, physical_type: str) -> Optional[bytes]:
+    """Codifica un valor como lo hashea Parquet (codificación PLAIN, sin largo)."""
+    if physical_type == "BYTE_ARRAY" and isinstance(value, str):
+        return value.encode("utf-8")
+    if physical_type == "BYTE_ARRAY" and isinstance(value, bytes):
+        return value
+    if isinstance(value, bool):
+        return None
+    if physical_type == "INT32" and isinstance(value, int):
+        return struct.pack("<i", value)
+    if physical_type == "INT64" and isinstance(value, int):
+        return struct.pack("<q", value)
+    if physical_type == "DOUBLE" and isinstance(value, (int, float)):
+        return struct.pack("<d", float(value))
+    return None
+
+
+def _parse_header(data: bytes) -> tuple[int, int]:
+    """Lee el encabezado Thrift compacto y devuelve (numBytes, largo_encabezado)."""
+    num_bytes = -1
+    position = 0
+    field_id = 0
+    while True:
+        byte = data[position]
+        position += 1
+        field_type = byte & 0x0F
+        if field_type == _THRIFT_STOP:
+            return num_bytes, position
+        delta = byte >> 4
+        if delta:
+            field_id += delta
+        else:
+            raw, position = _read_varint(data, position)
+            field_id = (raw >> 1) ^ -(raw & 1)
+
+        if field_type == _THRIFT_I32:
+            raw, position = _read_varint(data, position)
+            if field_id == 1:
+                num_bytes = (raw >> 1) ^ -(raw & 1)
+        elif field_type == _THRIFT_STRUCT:
+            position = _skip_struct(data, position)
+        else:
+            raise ValueError(f"Tipo Thrift inesperado en el bloom filter: {field_type}")
+
+
+def _skip_struct(data: bytes, position: int) -> int:
+    """Saltea un struct Thrift compacto formado por structs vacíos o anidados."""
+    while True:
+        byte = data[position]
+        position += 1
+        field_type = byte & 0x0F
+        if field_type == _THRIFT_STOP:
+            return position
+        if not byte >> 4:
+            _, position = _read_varint(data, position)
+        if field_type == _THRIFT_STRUCT:
+            position = _skip_struct(data, position)
+        elif field_type == _THRIFT_I32:
+            _, position = _read_varint(data, position)
+        else:
+            raise ValueError(f"Tipo Thrift inesperado en el bloom filter: {field_type}")
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    """Lee un entero varint (ULEB128) y devuelve (valor, nueva_posición)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
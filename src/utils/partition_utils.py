@@ -3,10 +3,17 @@ Módulo utilitario para la construcción de claves particionadas en S3.
 """
 
 from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
 
 
 def build_partitioned_key(
-    base_prefix: str, ingestion_date: datetime, batch_name: str
+    base_prefix: str,
+    ingestion_date: datetime,
+    batch_name: str,
+    part: Optional[int] = None,
 ) -> str:
     """
     Construye la clave S3 particionada por fecha de ingestión.
@@ -19,9 +26,82 @@ def build_partitioned_key(
         base_prefix: Prefijo base en S3 (ej: "processed/", "rejected/").
         ingestion_date: Fecha y hora de la ingestión extraída del directorio fuente.
         batch_name: Nombre del lote de datos (se usa como nombre del archivo parquet).
+        part: Número de archivo, si la salida del lote se divide en varios
+            archivos. None genera un único `<batch_name>.parquet`.
 
     Returns:
         Clave S3 completa con la partición y el nombre del archivo parquet.
     """
     partition = ingestion_date.strftime("%Y-%m-%d")
-    return f"{base_prefix}ingestion_date={partition}/{batch_name}.parquet"
+    key = f"{base_prefix}ingestion_date={partition}/{batch_name}.parquet"
+    return key if part is None else build_part_key(key, part)
+
+
+def build_part_key(key: str, part: int) -> str:
+    """
+    Construye la clave de uno de los archivos de una salida dividida.
+
+    Args:
+        key: Clave de la salida como archivo único (ej: ".../lote.parquet").
+        part: Número de archivo.
+
+    Returns:
+        Clave con el número de archivo antes de la extensión
+        (ej: ".../lote-00003.parquet").
+    """
+    stem, extension = key.rsplit(".", 1)
+    return f"{stem}-{part:05d}.{extension}"
+
+
+def build_catalog_key(
+    base_prefix: str, ingestion_date: datetime, catalog_filename: str
+) -> str:
+    """
+    Construye la clave S3 del catálogo de lotes de una partición.
+
+    El catálogo se ubica dentro de la misma partición Hive-style que los
+    archivos parquet de los lotes. Su nombre debe comenzar con "_" para
+    que Athena y Glue lo ignoren al leer la partición.
+
+    Args:
+        base_prefix: Prefijo base en S3 (ej: "processed/").
+        ingestion_date: Fecha de ingestión de la partición.
+        catalog_filename: Nombre del archivo de catálogo (ej: "_catalog.jsonl").
+
+    Returns:
+        Clave S3 completa del catálogo de la partición.
+    """
+    partition = ingestion_date.strftime("%Y-%m-%d")
+    return f"{base_prefix}ingestion_date={partition}/{catalog_filename}"
+
+
+def build_bucket_key(base_prefix: str, bucket_index: int) -> str:
+    """
+    Construye la clave S3 de un bucket de una tabla dividida por hash.
+
+    Args:
+        base_prefix: Prefijo base de la tabla en S3 (ej: "price_history/").
+        bucket_index: Número de bucket.
+
+    Returns:
+        Clave S3 completa del Parquet del bucket.
+    """
+    return f"{base_prefix}bucket={bucket_index:05d}/data.parquet"
+
+
+def assign_buckets(values: pd.Series, num_buckets: int) -> np.ndarray:
+    """
+    Asigna cada valor a un bucket por hash.
+
+    Usa el hash de pandas, que es estable entre procesos y ejecuciones
+    (a diferencia de `hash()` de Python).
+
+    Args:
+        values: Serie de valores a distribuir (ej: link_detalle).
+        num_buckets: Cantidad de buckets.
+
+    Returns:
+        Array con el número de bucket de cada fila.
+    """
+    hashes = pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+    return (hashes % np.uint64(num_buckets)).astype(np.int64)
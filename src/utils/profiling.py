@@ -0,0 +1,187 @@
+"""
+Módulo utilitario de perfilado bajo demanda de invocaciones productivas.
+
+Permite envolver etapas del pipeline (la invocación completa o etapas
+como `apply_transformations` y `process_batch`) con cProfile y
+tracemalloc. Cuando el perfilado está desactivado se utiliza un perfilador
+nulo cuyas etapas son un `nullcontext` compartido, sin costo adicional.
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any, Iterable, Iterator, Optional, Protocol
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_NULL_STAGE = nullcontext()
+
+
+class StageProfiler(Protocol):
+    """Interfaz común de `Profiler` y del perfilador nulo."""
+
+    enabled: bool
+    stages: frozenset[str]
+
+    def stage(self, name: str) -> AbstractContextManager: ...
+
+    def render(self) -> dict[str, bytes]: ...
+
+
+class Profiler:
+    """
+    Perfilador por etapas con cProfile (CPU) y tracemalloc (asignaciones).
+
+    Una etapa puede ejecutarse varias veces (por ejemplo, una vez por
+    chunk); sus mediciones se acumulan. cProfile no admite perfiles
+    anidados, por lo que una etapa que se abre dentro de otra etapa
+    perfilada solo se mide con tracemalloc (la etapa externa ya incluye
+    su tiempo de CPU).
+    """
+
+    enabled = True
+
+    def __init__(self, stages: Iterable[str], top_n: int = 30) -> None:
+        self.stages = frozenset(stages)
+        self._top_n = top_n
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._allocations: dict[str, dict[str, list[int]]] = {}
+        self._active_cpu_stage: Optional[str] = None
+        self._started_tracemalloc = False
+
+    def stage(self, name: str) -> AbstractContextManager:
+        """
+        Devuelve el context manager que perfila una etapa, si fue solicitada.
+
+        Args:
+            name: Nombre de la etapa.
+
+        Returns:
+            Context manager que mide la etapa, o uno nulo si no fue solicitada.
+        """
+        if name not in self.stages:
+            return _NULL_STAGE
+        return self._profile_stage(name)
+
+    def render(self) -> dict[str, bytes]:
+        """
+        Genera los reportes de todas las etapas medidas y detiene tracemalloc.
+
+        Returns:
+            Diccionario {nombre_de_archivo: contenido} con, por etapa, el
+            perfil binario de cProfile (.prof), su resumen en texto y los
+            principales sitios de asignación de memoria.
+        """
+        outputs: dict[str, bytes] = {}
+        for name, profile in self._profiles.items():
+            outputs[f"{name}.prof"] = _dump_profile(profile)
+            summary = io.StringIO()
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self._top_n)
+            outputs[f"{name}_cpu.txt"] = summary.getvalue().encode("utf-8")
+
+        for name, allocations in self._allocations.items():
+            top = sorted(allocations.items(), key=lambda item: -item[1][0])
+            lines = [
+                f"{size / 1024:12.1f} KiB  {count:10d} bloques  {location}"
+                for location, (size, count) in top[: self._top_n]
+            ]
+            outputs[f"{name}_memoria.txt"] = "\n".join(lines).encode("utf-8")
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return outputs
+
+    @contextmanager
+    def _profile_stage(self, name: str) -> Iterator[None]:
+        """Mide una ejecución de la etapa y acumula sus resultados."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+
+        profile = None
+        if self._active_cpu_stage is None:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            self._active_cpu_stage = name
+            profile.enable()
+        else:
+            logger.debug(
+                "Etapa '%s' anidada en '%s': solo se mide memoria.",
+                name,
+                self._active_cpu_stage,
+            )
+
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._active_cpu_stage = None
+            after = tracemalloc.take_snapshot()
+            self._accumulate_allocations(name, after.compare_to(before, "lineno"))
+
+    def _accumulate_allocations(
+        self, name: str, differences: list[tracemalloc.StatisticDiff]
+    ) -> None:
+        """Suma las asignaciones netas por línea de código de una etapa."""
+        allocations = self._allocations.setdefault(name, {})
+        for diff in differences:
+            if diff.size_diff <= 0:
+                continue
+            location = str(diff.traceback[0])
+            size, count = allocations.get(location, [0, 0])
+            allocations[location] = [size + diff.size_diff, count + diff.count_diff]
+
+
+class _NullProfiler:
+    """Perfilador desactivado: todas sus etapas son un context manager nulo."""
+
+    enabled = False
+    stages: frozenset[str] = frozenset()
+
+    def stage(self, name: str) -> AbstractContextManager:
+        return _NULL_STAGE
+
+    def render(self) -> dict[str, bytes]:
+        return {}
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def build_profiler(event: dict[str, Any]) -> StageProfiler:
+    """
+    Construye el perfilador de una invocación según el evento y la configuración.
+
+    El evento puede incluir "profiling": true/false para activar o
+    desactivar el perfilado, o {"stages": [...]} para elegir las etapas.
+    Si no lo incluye, se usan PROFILING_ENABLED y PROFILING_STAGES.
+
+    Args:
+        event: Evento recibido por la Lambda.
+
+    Returns:
+        Perfilador activo, o NULL_PROFILER si el perfilado está desactivado.
+    """
+    flag = event.get("profiling", settings.PROFILING_ENABLED)
+    if not flag:
+        return NULL_PROFILER
+
+    stages = settings.PROFILING_STAGES
+    if isinstance(flag, dict) and flag.get("stages"):
+        stages = tuple(flag["stages"])
+    return Profiler(stages, top_n=settings.PROFILING_TOP_N)
+
+
+def _dump_profile(profile: cProfile.Profile) -> bytes:
+    """Serializa un perfil de cProfile en el formato binario de pstats."""
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
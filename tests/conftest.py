@@ -2,8 +2,52 @@
 Fixtures compartidas para los tests del pipeline de transformación de hoteles.
 """
 
+import hashlib
+
 import pandas as pd
 import pytest
+from botocore.exceptions import ClientError
+
+
+class ConditionalS3:
+    """Doble de S3Service que respeta las escrituras condicionales.
+
+    Rechaza con PreconditionFailed los PUT cuyo If-Match no coincide con el
+    ETag actual o cuyo If-None-Match="*" encuentra el objeto ya creado.
+    `conflicts_to_inject` fuerza ese rechazo en los próximos PUT para
+    simular escrituras concurrentes.
+    """
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.puts: list[str] = []
+        self.conflicts_to_inject = 0
+
+    def get_object_with_etag(self, bucket: str, key: str):
+        body = self.objects.get((bucket, key))
+        if body is None:
+            return None
+        return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+    def put_object(self, bucket, key, body, if_match=None, if_none_match=None):
+        current = self.get_object_with_etag(bucket, key)
+        conflict = (if_none_match == "*" and current is not None) or (
+            if_match is not None and (current is None or current[1] != if_match)
+        )
+        if self.conflicts_to_inject:
+            self.conflicts_to_inject -= 1
+            conflict = True
+        if conflict:
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        self.puts.append(key)
+        self.objects[(bucket, key)] = body
+
+
+@pytest.fixture
+def conditional_s3(monkeypatch: pytest.MonkeyPatch) -> ConditionalS3:
+    """S3 en memoria con escrituras condicionales y sin esperas entre reintentos."""
+    monkeypatch.setattr("services.s3_service.time.sleep", lambda seconds: None)
+    return ConditionalS3()
 
 
 @pytest.fixture
@@ -0,0 +1,119 @@
+"""
+Tests unitarios para el módulo de agregados parciales por barrio y fecha.
+"""
+
+from datetime import date
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytest_check as check
+
+from processors.aggregates import (
+    SKETCH_RELATIVE_ACCURACY,
+    compute_partial_aggregates,
+    merge_partial_aggregates,
+    summarize_aggregates,
+)
+from processors.batch_processor import BatchProcessor
+from processors.transformations import apply_transformations
+
+
+@pytest.fixture
+def transformed_df(raw_hotel_row: dict) -> pd.DataFrame:
+    """DataFrame transformado con tres hoteles en Palermo y uno en Recoleta."""
+    rows = []
+    for precio in (100000.0, 200000.0, 300000.0):
+        row = raw_hotel_row.copy()
+        row["precio_final"] = precio
+        rows.append(row)
+    recoleta = raw_hotel_row.copy()
+    recoleta["ubicacion"] = "Recoleta, Buenos Aires (Recoleta)"
+    recoleta["puntaje"] = "9.0"
+    rows.append(recoleta)
+    return apply_transformations(pd.DataFrame(rows))
+
+
+@pytest.mark.unit
+class TestComputePartialAggregates:
+    """Tests para el cálculo de agregados parciales de un lote."""
+
+    def test_partial_aggregates_should_have_one_row_per_barrio(
+        self, transformed_df: pd.DataFrame
+    ):
+        # Act
+        result = compute_partial_aggregates(transformed_df, date(2026, 2, 16))
+
+        # Assert
+        check.equal(sorted(result["barrio"]), ["Palermo", "Recoleta"])
+        check.equal(result["registros"].sum(), 4)
+
+    def test_partial_aggregates_should_compute_price_stats_when_batch_is_valid(
+        self, transformed_df: pd.DataFrame
+    ):
+        # Act
+        result = compute_partial_aggregates(transformed_df, date(2026, 2, 16))
+
+        # Assert: 2 noches por estadía -> precio por noche = precio_final / 2
+        palermo = result[result["barrio"] == "Palermo"].iloc[0]
+        check.equal(palermo["precio_por_noche_suma"], 300000.0)
+        check.equal(palermo["precio_por_noche_min"], 50000.0)
+        check.equal(palermo["precio_por_noche_max"], 150000.0)
+        check.equal(palermo["puntaje_registros"], 0)
+
+
+@pytest.mark.unit
+class TestMergePartialAggregates:
+    """Tests para la combinación de agregados en rollups."""
+
+    def test_merge_should_fold_batches_into_monthly_rollup(
+        self, transformed_df: pd.DataFrame
+    ):
+        # Arrange: dos lotes de días distintos del mismo mes
+        first = compute_partial_aggregates(transformed_df, date(2026, 2, 16))
+        second = compute_partial_aggregates(transformed_df, date(2026, 2, 17))
+
+        # Act
+        daily = merge_partial_aggregates([first, second], granularity="day")
+        monthly = merge_partial_aggregates([daily], granularity="month")
+
+        # Assert
+        check.equal(len(daily), 4)
+        check.equal(len(monthly), 2)
+        palermo = monthly[monthly["barrio"] == "Palermo"].iloc[0]
+        check.equal(palermo["ingestion_date"], date(2026, 2, 1))
+        check.equal(palermo["registros"], 6)
+        check.equal(sum(palermo["sketch_counts"]), 6)
+
+    def test_summary_median_should_be_within_sketch_accuracy(
+        self, transformed_df: pd.DataFrame
+    ):
+        # Arrange
+        partial = compute_partial_aggregates(transformed_df, date(2026, 2, 16))
+
+        # Act
+        summary = summarize_aggregates(merge_partial_aggregates([partial]))
+
+        # Assert: la mediana real de Palermo es 100000.0
+        palermo = summary[summary["barrio"] == "Palermo"].iloc[0]
+        check.less_equal(
+            abs(palermo["precio_por_noche_mediana"] - 100000.0) / 100000.0,
+            SKETCH_RELATIVE_ACCURACY,
+        )
+        check.equal(palermo["precio_por_noche_promedio"], 100000.0)
+        check.is_true(np.isnan(palermo["puntaje_promedio"]))
+
+    def test_merge_should_accept_aggregates_read_back_from_parquet(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange: agregados escritos por el BatchProcessor
+        result = BatchProcessor().process(raw_hotel_df_multiple, date(2026, 2, 16))
+        partial = pd.read_parquet(BytesIO(result.aggregates))
+
+        # Act
+        merged = merge_partial_aggregates([partial, partial])
+
+        # Assert
+        check.equal(sorted(merged["barrio"]), ["Palermo", "Recoleta"])
+        check.equal(merged["registros"].sum(), 4)
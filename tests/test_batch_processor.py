@@ -2,13 +2,16 @@
 Tests unitarios para el módulo de procesamiento por lotes de datos de hoteles.
 """
 
+import inspect
+from datetime import date
 from io import BytesIO
 
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 import pytest_check as check
 
-from processors.batch_processor import BatchProcessor
+from processors.batch_processor import BatchProcessor, OutputFiles, OutputLayout
 
 
 @pytest.fixture
@@ -235,3 +238,283 @@ class TestRejectionRules:
         rejected_df = pd.read_parquet(BytesIO(rejected_bytes))
         check.equal(len(processed_df), 2)
         check.equal(len(rejected_df), 2)
+
+
+@pytest.mark.unit
+class TestProcessStream:
+    """Tests para el procesamiento por chunks del BatchProcessor."""
+
+    def test_process_stream_should_match_in_memory_output_when_batch_is_chunked(
+        self, processor: BatchProcessor, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        ingestion_date = date(2026, 2, 16)
+        in_memory = processor.process(raw_hotel_df_multiple, ingestion_date)
+        processed_sink, rejected_sink = BytesIO(), BytesIO()
+
+        # Act
+        result = processor.process_stream(
+            raw_hotel_df_multiple, ingestion_date, processed_sink, rejected_sink
+        )
+
+        # Assert
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(processed_sink.getvalue())),
+            pd.read_parquet(BytesIO(in_memory.processed)),
+        )
+        check.equal(
+            len(pd.read_parquet(BytesIO(rejected_sink.getvalue()))),
+            len(pd.read_parquet(BytesIO(in_memory.rejected))),
+        )
+        check.equal(pd.read_parquet(BytesIO(result.aggregates))["registros"].sum(), 2)
+        check.equal(result.processed_stats.rows, 2)
+        check.equal(result.rejected_stats.rows, 0)
+
+    def test_process_stream_should_write_empty_parquet_when_all_rows_are_valid(
+        self, processor: BatchProcessor, raw_hotel_df: pd.DataFrame
+    ):
+        # Arrange
+        processed_sink, rejected_sink = BytesIO(), BytesIO()
+
+        # Act
+        processor.process_stream(
+            [raw_hotel_df], date(2026, 2, 16), processed_sink, rejected_sink
+        )
+
+        # Assert: el Parquet de rechazados es válido aunque no tenga filas
+        rejected_df = pd.read_parquet(BytesIO(rejected_sink.getvalue()))
+        check.equal(len(rejected_df), 0)
+        check.is_in("precio_por_noche", rejected_df.columns)
+
+
+@pytest.mark.unit
+class TestProcessSpilled:
+    """Tests para el procesamiento con spill a Arrow IPC del BatchProcessor."""
+
+    def test_process_spilled_should_match_stream_output_when_batch_is_spilled(
+        self,
+        processor: BatchProcessor,
+        raw_hotel_df_multiple: list[pd.DataFrame],
+        raw_hotel_df_invalid_precio: pd.DataFrame,
+        tmp_path,
+    ):
+        # Arrange
+        chunks = [*raw_hotel_df_multiple, raw_hotel_df_invalid_precio]
+        ingestion_date = date(2026, 2, 16)
+        expected_processed, expected_rejected = BytesIO(), BytesIO()
+        expected = processor.process_stream(
+            chunks, ingestion_date, expected_processed, expected_rejected
+        )
+        processed_sink, rejected_sink = BytesIO(), BytesIO()
+
+        # Act
+        result = processor.process_spilled(
+            chunks, ingestion_date, processed_sink, rejected_sink, str(tmp_path)
+        )
+
+        # Assert: misma salida y el spill se elimina al finalizar
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(processed_sink.getvalue())),
+            pd.read_parquet(BytesIO(expected_processed.getvalue())),
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(rejected_sink.getvalue())),
+            pd.read_parquet(BytesIO(expected_rejected.getvalue())),
+        )
+        check.equal(result, expected)
+        check.equal(list(tmp_path.iterdir()), [])
+
+
+@pytest.mark.unit
+class TestMergeParts:
+    """Tests para la combinación de salidas parciales de varios shards."""
+
+    def test_merge_parts_should_match_single_stream_output_when_shards_are_merged(
+        self,
+        processor: BatchProcessor,
+        raw_hotel_df_multiple: list[pd.DataFrame],
+        raw_hotel_df_invalid_precio: pd.DataFrame,
+    ):
+        # Arrange: un shard por DataFrame
+        chunks = [*raw_hotel_df_multiple, raw_hotel_df_invalid_precio]
+        ingestion_date = date(2026, 2, 16)
+        expected_processed, expected_rejected = BytesIO(), BytesIO()
+        expected = processor.process_stream(
+            chunks, ingestion_date, expected_processed, expected_rejected
+        )
+        parts = []
+        for chunk in chunks:
+            shard_processed, shard_rejected = BytesIO(), BytesIO()
+            shard = processor.process_stream(
+                [chunk], ingestion_date, shard_processed, shard_rejected
+            )
+            parts.append((shard_processed, shard_rejected, shard.aggregates))
+        processed_sink, rejected_sink = BytesIO(), BytesIO()
+
+        # Act
+        result = processor.merge_parts(
+            [BytesIO(processed.getvalue()) for processed, _, _ in parts],
+            [BytesIO(rejected.getvalue()) for _, rejected, _ in parts],
+            [pd.read_parquet(BytesIO(aggregates)) for _, _, aggregates in parts],
+            ingestion_date,
+            processed_sink,
+            rejected_sink,
+        )
+
+        # Assert
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(processed_sink.getvalue())),
+            pd.read_parquet(BytesIO(expected_processed.getvalue())),
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(rejected_sink.getvalue())),
+            pd.read_parquet(BytesIO(expected_rejected.getvalue())),
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(BytesIO(result.aggregates)),
+            pd.read_parquet(BytesIO(expected.aggregates)),
+        )
+        check.equal(result.processed_stats, expected.processed_stats)
+        check.equal(result.rejected_stats, expected.rejected_stats)
+
+
+@pytest.mark.unit
+class TestOutputLayout:
+    """Tests para el layout clusterizado de los Parquet de salida."""
+
+    def test_process_should_sort_rows_and_size_row_groups_when_layout_is_set(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        layout = OutputLayout(
+            sort_keys=("barrio", "precio_por_noche"),
+            row_group_rows=1,
+            bloom_filter_columns=("link_detalle",),
+        )
+        processor = BatchProcessor(layout=layout)
+
+        # Act
+        result = processor.process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Assert
+        parquet_file = pq.ParquetFile(BytesIO(result.processed))
+        processed_df = parquet_file.read().to_pandas()
+        expected_df = processed_df.sort_values(["barrio", "precio_por_noche"])
+        check.equal(processed_df.index.tolist(), expected_df.index.tolist())
+        check.equal(parquet_file.metadata.num_row_groups, len(processed_df))
+        row_group = parquet_file.metadata.row_group(0)
+        link_index = parquet_file.schema_arrow.get_field_index("link_detalle")
+        if "bloom_filter_options" in inspect.signature(pq.write_table).parameters:
+            check.is_true(row_group.column(link_index).bloom_filter_length)
+        check.equal(
+            row_group.sorting_columns[0].column_index,
+            parquet_file.schema_arrow.get_field_index("barrio"),
+        )
+
+    def test_process_spilled_should_sort_globally_when_layout_is_set(
+        self, raw_hotel_df_multiple: list[pd.DataFrame], tmp_path
+    ):
+        # Arrange: chunks en orden inverso al de las claves
+        processor = BatchProcessor(layout=OutputLayout(sort_keys=("precio_final",)))
+        chunks = sorted(
+            raw_hotel_df_multiple, key=lambda df: -df["precio_final"].min()
+        )
+        processed_sink, rejected_sink = BytesIO(), BytesIO()
+
+        # Act
+        processor.process_spilled(
+            chunks, date(2026, 2, 16), processed_sink, rejected_sink, str(tmp_path)
+        )
+
+        # Assert
+        precios = pd.read_parquet(BytesIO(processed_sink.getvalue()))["precio_final"]
+        check.is_true(precios.is_monotonic_increasing)
+
+
+def _collecting_output() -> tuple[OutputFiles, dict[int, bytes]]:
+    """Destino dividido que guarda en memoria los archivos publicados."""
+    published: dict[int, bytes] = {}
+
+    def publish_file(index: int, stream) -> None:
+        published[index] = stream.read()
+
+    return OutputFiles(BytesIO, publish_file), published
+
+
+@pytest.mark.unit
+class TestOutputFiles:
+    """Tests para la división de la salida en varios archivos."""
+
+    def test_process_stream_should_roll_over_files_when_target_size_is_reached(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange: cada row group supera el tamaño objetivo
+        layout = OutputLayout(row_group_rows=1, target_file_bytes=1)
+        expected = BatchProcessor().process(raw_hotel_df_multiple, date(2026, 2, 16))
+        processed_files, published = _collecting_output()
+
+        # Act
+        result = BatchProcessor(layout=layout).process_stream(
+            raw_hotel_df_multiple, date(2026, 2, 16), processed_files, BytesIO()
+        )
+
+        # Assert
+        check.equal(sorted(published), list(range(result.processed_stats.rows)))
+        combined = pd.concat(
+            [pd.read_parquet(BytesIO(published[index])) for index in sorted(published)],
+            ignore_index=True,
+        )
+        pd.testing.assert_frame_equal(
+            combined, pd.read_parquet(BytesIO(expected.processed))
+        )
+
+    def test_process_should_split_single_chunk_when_row_group_size_is_not_set(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange: un único chunk, sin row_group_rows en el layout
+        layout = OutputLayout(target_file_bytes=1)
+        processed_files, published = _collecting_output()
+        chunk = pd.concat(raw_hotel_df_multiple, ignore_index=True)
+
+        # Act
+        result = BatchProcessor(layout=layout).process_stream(
+            [chunk], date(2026, 2, 16), processed_files, BytesIO()
+        )
+
+        # Assert
+        check.equal(len(published), result.processed_stats.rows)
+        check.greater(len(published), 1)
+
+    def test_process_stream_should_keep_each_key_in_one_file_when_distributed(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        layout = OutputLayout(distribution_key="barrio", distribution_buckets=4)
+        processed_files, published = _collecting_output()
+
+        # Act
+        result = BatchProcessor(layout=layout).process_stream(
+            raw_hotel_df_multiple, date(2026, 2, 16), processed_files, BytesIO()
+        )
+
+        # Assert
+        frames = [pd.read_parquet(BytesIO(content)) for content in published.values()]
+        check.equal(sum(len(df) for df in frames), result.processed_stats.rows)
+        barrios = [barrio for df in frames for barrio in df["barrio"].unique()]
+        check.equal(len(barrios), len(set(barrios)))
+
+    def test_process_stream_should_publish_one_empty_file_when_output_has_no_rows(
+        self, raw_hotel_df: pd.DataFrame
+    ):
+        # Arrange
+        layout = OutputLayout(target_file_bytes=1)
+        rejected_files, published = _collecting_output()
+
+        # Act
+        BatchProcessor(layout=layout).process_stream(
+            [raw_hotel_df], date(2026, 2, 16), BytesIO(), rejected_files
+        )
+
+        # Assert
+        check.equal(list(published), [0])
+        check.equal(pq.ParquetFile(BytesIO(published[0])).metadata.num_rows, 0)
@@ -0,0 +1,152 @@
+"""
+Tests unitarios para el servicio del catálogo de lotes.
+"""
+
+from datetime import date, datetime
+
+import pytest
+import pytest_check as check
+
+from config import settings
+from conftest import ConditionalS3
+from services.catalog_service import (
+    CatalogConflictError,
+    CatalogService,
+    build_catalog_entry,
+    prune_entries,
+)
+from services.s3_service import S3ObjectInfo
+
+INGESTION_DT = datetime(2026, 2, 16, 12, 0, 0)
+
+
+def _entry(batch_name: str, precio_min: float, precio_max: float) -> dict:
+    return build_catalog_entry(
+        batch_name,
+        INGESTION_DT,
+        [S3ObjectInfo(key=f"raw/{batch_name}/a.csv", size=10, etag='"abc"')],
+        {
+            "procesados": {
+                "clave": f"processed/ingestion_date=2026-02-16/{batch_name}.parquet",
+                "registros": 3,
+                "bytes": 100,
+                "min_max": {
+                    "precio_final": (precio_min, precio_max),
+                    "checkin_date": (datetime(2026, 2, 16), datetime(2026, 3, 1)),
+                },
+            },
+        },
+    )
+
+
+@pytest.mark.unit
+class TestCatalogService:
+    """Tests para el registro y lectura de entradas del catálogo."""
+
+    def test_register_should_append_entries_when_batches_share_partition(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        catalog = CatalogService(conditional_s3)
+
+        # Act
+        catalog.register("bucket", INGESTION_DT, _entry("lote_a", 10.0, 20.0))
+        catalog.register("bucket", INGESTION_DT, _entry("lote_b", 30.0, 40.0))
+
+        # Assert
+        entries = catalog.read_partition("bucket", INGESTION_DT)
+        check.equal([e["lote"] for e in entries], ["lote_a", "lote_b"])
+        check.equal(
+            list(conditional_s3.objects),
+            [("bucket", "processed/ingestion_date=2026-02-16/_catalog.jsonl")],
+        )
+
+    def test_register_should_replace_entry_when_batch_is_reprocessed(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        catalog = CatalogService(conditional_s3)
+        catalog.register("bucket", INGESTION_DT, _entry("lote_a", 10.0, 20.0))
+
+        # Act
+        catalog.register("bucket", INGESTION_DT, _entry("lote_a", 15.0, 25.0))
+
+        # Assert
+        entries = catalog.read_partition("bucket", INGESTION_DT)
+        check.equal(len(entries), 1)
+        check.equal(entries[0]["procesados"]["min_max"]["precio_final"], [15.0, 25.0])
+
+    def test_register_should_retry_when_catalog_is_modified_concurrently(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        catalog = CatalogService(conditional_s3)
+        conditional_s3.conflicts_to_inject = 2
+
+        # Act
+        catalog.register("bucket", INGESTION_DT, _entry("lote_a", 10.0, 20.0))
+
+        # Assert
+        assert len(catalog.read_partition("bucket", INGESTION_DT)) == 1
+
+    def test_register_should_raise_when_retries_are_exhausted(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        catalog = CatalogService(conditional_s3)
+        conditional_s3.conflicts_to_inject = settings.CATALOG_MAX_RETRIES
+
+        # Act & Assert
+        with pytest.raises(CatalogConflictError):
+            catalog.register("bucket", INGESTION_DT, _entry("lote_a", 10.0, 20.0))
+        check.equal(conditional_s3.objects, {})
+
+    def test_register_should_write_null_bounds_when_stats_are_not_finite(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        catalog = CatalogService(conditional_s3)
+        entry = _entry("lote_a", 10.0, float("inf"))
+
+        # Act
+        catalog.register("bucket", INGESTION_DT, entry)
+
+        # Assert
+        (content,) = conditional_s3.objects.values()
+        check.is_not_in(b"Infinity", content)
+        entries = catalog.read_partition("bucket", INGESTION_DT)
+        check.equal(entries[0]["procesados"]["min_max"]["precio_final"], [10.0, None])
+        check.equal(len(prune_entries(entries, "precio_final", lower=1000.0)), 1)
+
+    def test_read_partition_should_return_empty_when_catalog_is_missing(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Act / Assert
+        assert CatalogService(conditional_s3).read_partition("bucket", INGESTION_DT) == []
+
+
+@pytest.mark.unit
+class TestPruneEntries:
+    """Tests para la poda de lotes a partir del catálogo."""
+
+    def test_prune_should_keep_only_overlapping_ranges(self):
+        # Arrange
+        entries = [_entry("lote_a", 10.0, 20.0), _entry("lote_b", 30.0, 40.0)]
+
+        # Act
+        result = prune_entries(entries, "precio_final", lower=25.0, upper=35.0)
+
+        # Assert
+        assert [e["lote"] for e in result] == ["lote_b"]
+
+    def test_prune_should_compare_dates_when_column_is_temporal(self):
+        # Arrange
+        entries = [_entry("lote_a", 10.0, 20.0)]
+
+        # Act
+        inside = prune_entries(entries, "checkin_date", lower=date(2026, 2, 20))
+        outside = prune_entries(entries, "checkin_date", lower=date(2026, 3, 2))
+
+        # Assert
+        check.equal(len(inside), 1)
+        check.equal(len(outside), 0)
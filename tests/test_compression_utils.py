@@ -0,0 +1,79 @@
+"""
+Tests unitarios para el módulo de lectura de CSVs comprimidos.
+"""
+
+import gzip
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+import pytest_check as check
+
+from utils.compression_utils import (
+    detect_compression,
+    is_csv_key,
+    open_decompressed_stream,
+)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, "zstd") as stream:
+        stream.write(data)
+    return sink.getvalue().to_pybytes()
+
+
+@pytest.fixture
+def raw_csv_bytes(raw_hotel_df: pd.DataFrame) -> bytes:
+    """Contenido CSV sin comprimir de una fila válida de hotel."""
+    return raw_hotel_df.to_csv(index=False).encode("utf-8")
+
+
+@pytest.mark.unit
+class TestDetectCompression:
+    """Tests para la detección de compresión por extensión."""
+
+    def test_detect_compression_should_return_codec_when_extension_is_supported(
+        self,
+    ):
+        # Arrange / Act / Assert
+        check.is_none(detect_compression("raw/ingestion_20260216_120000/a.csv"))
+        check.equal(detect_compression("raw/ingestion_20260216_120000/a.csv.gz"), "gzip")
+        check.equal(detect_compression("raw/ingestion_20260216_120000/a.csv.zst"), "zstd")
+
+    def test_detect_compression_should_raise_when_extension_is_unknown(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            detect_compression("raw/ingestion_20260216_120000/a.json")
+
+    def test_is_csv_key_should_accept_only_csv_variants(self):
+        # Act / Assert
+        check.is_true(is_csv_key("raw/a.csv"))
+        check.is_true(is_csv_key("raw/a.csv.gz"))
+        check.is_true(is_csv_key("raw/a.csv.zst"))
+        check.is_false(is_csv_key("raw/a.parquet"))
+
+
+@pytest.mark.unit
+class TestOpenDecompressedStream:
+    """Tests para la descompresión en streaming de CSVs crudos."""
+
+    @pytest.mark.parametrize(
+        ("compression", "compress"),
+        [(None, lambda data: data), ("gzip", gzip.compress), ("zstd", _zstd_compress)],
+    )
+    def test_stream_should_yield_original_csv_when_input_is_compressed(
+        self, raw_csv_bytes: bytes, raw_hotel_df: pd.DataFrame, compression, compress
+    ):
+        # Arrange
+        body = BytesIO(compress(raw_csv_bytes))
+
+        # Act
+        with open_decompressed_stream(body, compression) as stream:
+            result = pd.read_csv(stream)
+
+        # Assert
+        check.equal(stream.bytes_read, len(raw_csv_bytes))
+        check.equal(list(result.columns), list(raw_hotel_df.columns))
+        check.equal(len(result), 1)
@@ -0,0 +1,94 @@
+"""
+Tests unitarios para el planificador de ejecución de lotes.
+"""
+
+import pytest
+import pytest_check as check
+
+from processors.execution_planner import (
+    ExecutionStrategy,
+    plan_execution,
+    plan_shards,
+)
+from services.s3_service import S3ObjectInfo
+
+MB = 1024 * 1024
+
+
+def _csv(size: int, extension: str = ".csv") -> S3ObjectInfo:
+    return S3ObjectInfo(
+        key=f"raw/ingestion_20260216_120000/hoteles{extension}", size=size, etag='"x"'
+    )
+
+
+@pytest.mark.unit
+class TestPlanExecution:
+    """Tests para la función plan_execution."""
+
+    def test_plan_should_be_in_memory_when_batch_is_small(self):
+        # Act
+        plan = plan_execution([_csv(1 * MB), _csv(2 * MB)], memory_limit_mb=1024)
+
+        # Assert
+        check.equal(plan.strategy, ExecutionStrategy.IN_MEMORY)
+        check.equal(plan.input_bytes, 3 * MB)
+        check.is_false(plan.overridden)
+
+    def test_plan_should_be_chunked_when_batch_exceeds_in_memory_budget(self):
+        # Act
+        plan = plan_execution([_csv(200 * MB)], memory_limit_mb=1024)
+
+        # Assert
+        check.equal(plan.strategy, ExecutionStrategy.CHUNKED)
+
+    def test_plan_should_spill_when_batch_is_oversized(self):
+        # Act
+        plan = plan_execution([_csv(2048 * MB)], memory_limit_mb=1024)
+
+        # Assert
+        check.equal(plan.strategy, ExecutionStrategy.SPILL)
+
+    def test_plan_should_account_for_decompression_when_input_is_compressed(self):
+        # Arrange: mismo tamaño en S3, distinto tamaño en memoria
+        plain = plan_execution([_csv(50 * MB)], memory_limit_mb=1024)
+        compressed = plan_execution([_csv(50 * MB, ".csv.gz")], memory_limit_mb=1024)
+
+        # Assert
+        check.equal(plain.strategy, ExecutionStrategy.IN_MEMORY)
+        check.equal(compressed.strategy, ExecutionStrategy.CHUNKED)
+
+    def test_plan_should_use_override_when_provided(self):
+        # Act
+        plan = plan_execution([_csv(1 * MB)], memory_limit_mb=1024, override="spill")
+
+        # Assert
+        check.equal(plan.strategy, ExecutionStrategy.SPILL)
+        check.is_true(plan.overridden)
+
+    def test_plan_should_raise_when_override_is_unknown(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            plan_execution([_csv(1 * MB)], override="gpu")
+
+
+@pytest.mark.unit
+class TestPlanShards:
+    """Tests para la función plan_shards."""
+
+    def test_plan_shards_should_group_contiguous_files_within_target(self):
+        # Arrange: 10 MB de CSV equivalen a 60 MB estimados en memoria
+        objects = [_csv(10 * MB), _csv(10 * MB), _csv(10 * MB), _csv(1 * MB)]
+
+        # Act
+        shards = plan_shards(objects, shard_target_mb=128)
+
+        # Assert
+        check.equal([len(shard) for shard in shards], [2, 2])
+        check.equal([obj for shard in shards for obj in shard], objects)
+
+    def test_plan_shards_should_isolate_file_when_it_exceeds_target(self):
+        # Act
+        shards = plan_shards([_csv(1 * MB), _csv(100 * MB)], shard_target_mb=64)
+
+        # Assert
+        check.equal([len(shard) for shard in shards], [1, 1])
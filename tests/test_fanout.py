@@ -0,0 +1,255 @@
+"""
+Tests unitarios para el modo distribuido (coordinador, workers y reductor).
+"""
+
+import json
+import os
+import shutil
+from dataclasses import replace
+from io import BytesIO
+
+import pandas as pd
+import pytest
+import pytest_check as check
+
+import lambda_function
+from config import settings
+from local_fanout import run_fanout
+from services.hotel_dimension_service import (
+    HotelDimensionConflictError,
+    HotelDimensionService,
+)
+from services.s3_service import S3ObjectInfo
+
+BUCKET = "bucket"
+PREFIX = "raw/ingestion_20260216_120000/"
+
+
+class DirectoryS3:
+    """Doble de S3Service sobre un directorio local, compartible entre procesos."""
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self._root, bucket, key)
+
+    def list_objects_metadata(self, bucket: str, prefix: str) -> list[S3ObjectInfo]:
+        base = os.path.join(self._root, bucket)
+        objects = []
+        for directory, _, files in os.walk(base):
+            for name in files:
+                key = os.path.relpath(os.path.join(directory, name), base)
+                if key.startswith(prefix):
+                    size = os.path.getsize(os.path.join(directory, name))
+                    objects.append(S3ObjectInfo(key=key, size=size, etag=f'"{size}"'))
+        return sorted(objects, key=lambda obj: obj.key)
+
+    def get_object(self, bucket: str, key: str, etag=None) -> bytes:
+        with open(self._path(bucket, key), "rb") as file:
+            return file.read()
+
+    def get_object_stream(self, bucket: str, key: str, etag=None):
+        body = self.get_object(bucket, key)
+        return BytesIO(body), len(body)
+
+    def get_object_with_etag(self, bucket: str, key: str):
+        if not os.path.exists(self._path(bucket, key)):
+            return None
+        body = self.get_object(bucket, key)
+        return body, f'"{len(body)}"'
+
+    def put_object(self, bucket: str, key: str, body: bytes, **conditions) -> None:
+        os.makedirs(os.path.dirname(self._path(bucket, key)), exist_ok=True)
+        with open(self._path(bucket, key), "wb") as file:
+            file.write(body)
+
+    def upload_fileobj(self, bucket: str, key: str, fileobj) -> None:
+        self.put_object(bucket, key, fileobj.read())
+
+    def download_fileobj(self, bucket: str, key: str, fileobj) -> None:
+        with open(self._path(bucket, key), "rb") as file:
+            shutil.copyfileobj(file, fileobj)
+
+    def delete_objects(self, bucket: str, keys: list[str]) -> None:
+        for key in keys:
+            os.remove(self._path(bucket, key))
+
+
+def _install_s3(root: str) -> None:
+    """Inicializador de los procesos worker: usa el doble de S3 del test."""
+    lambda_function._s3_service = DirectoryS3(root)
+
+
+@pytest.fixture
+def s3(tmp_path, raw_hotel_df_multiple, raw_hotel_df_invalid_precio):
+    """Lote de tres CSVs y el S3Service del handler apuntando al doble."""
+    fake = DirectoryS3(str(tmp_path))
+    frames = [*raw_hotel_df_multiple, raw_hotel_df_invalid_precio]
+    for index, df in enumerate(frames):
+        fake.put_object(
+            BUCKET, f"{PREFIX}hoteles_{index}.csv", df.to_csv(index=False).encode()
+        )
+
+    previous = lambda_function._s3_service
+    lambda_function._s3_service = fake
+    yield fake
+    lambda_function._s3_service = previous
+
+
+def _event() -> dict:
+    return {
+        "Records": [
+            {
+                "s3": {
+                    "bucket": {"name": BUCKET},
+                    "object": {"key": f"{PREFIX}hoteles_0.csv"},
+                }
+            }
+        ]
+    }
+
+
+@pytest.mark.unit
+class TestFanout:
+    """Tests para el procesamiento distribuido de un lote."""
+
+    def test_coordinator_should_assign_one_shard_per_file_when_target_is_zero(self, s3):
+        # Act
+        response = lambda_function.coordinator_handler(
+            {**_event(), "shard_target_mb": 0}, None
+        )
+
+        # Assert
+        check.equal(len(response["workers"]), 3)
+        check.equal(
+            [worker["objects"][0]["key"] for worker in response["workers"]],
+            [f"{PREFIX}hoteles_{index}.csv" for index in range(3)],
+        )
+        check.equal(response["reducer"], {"bucket": BUCKET, "prefix": PREFIX})
+
+    def test_run_fanout_should_match_single_invocation_output(self, s3, tmp_path):
+        # Arrange
+        single = json.loads(lambda_function.lambda_handler(_event(), None)["body"])
+        expected = {
+            name: pd.read_parquet(BytesIO(s3.get_object(BUCKET, single[name])))
+            for name in ("clave_procesados", "clave_rechazados")
+        }
+
+        # Act
+        response = run_fanout(
+            {**_event(), "shard_target_mb": 0},
+            max_workers=2,
+            initializer=_install_s3,
+            initargs=(str(tmp_path),),
+        )
+
+        # Assert: mismas salidas finales y sin salidas parciales remanentes
+        body = json.loads(response["body"])
+        check.equal(body["shards"], 3)
+        for name, expected_df in expected.items():
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(BytesIO(s3.get_object(BUCKET, body[name]))),
+                expected_df,
+            )
+        check.equal(s3.list_objects_metadata(BUCKET, "fanout/"), [])
+        catalog = s3.get_object_with_etag(
+            BUCKET, "processed/ingestion_date=2026-02-16/_catalog.jsonl"
+        )
+        entry = json.loads(catalog[0].decode("utf-8").splitlines()[-1])
+        check.equal(len(entry["archivos_fuente"]), 3)
+
+
+@pytest.fixture
+def failing_dimension(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """Habilita la dimensión de hoteles y hace fallar su actualización."""
+
+    def configure(target_file_mb: int) -> str:
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+        monkeypatch.setattr(
+            lambda_function,
+            "settings",
+            replace(
+                settings,
+                HOTEL_DIMENSION_ENABLED=True,
+                OUTPUT_TARGET_FILE_MB=target_file_mb,
+                SPILL_DIR=str(spill_dir),
+            ),
+        )
+
+        def upsert(self, bucket, hotels, batch_name):
+            raise HotelDimensionConflictError("conflicto")
+
+        monkeypatch.setattr(HotelDimensionService, "upsert", upsert)
+        return str(spill_dir)
+
+    return configure
+
+
+@pytest.mark.unit
+class TestHotelDimensionPublishing:
+    """Tests para la publicación de hechos después de la dimensión de hoteles."""
+
+    @pytest.mark.parametrize("target_file_mb", [0, 1])
+    @pytest.mark.parametrize("strategy", ["in_memory", "chunked", "spill"])
+    def test_handler_should_not_publish_facts_when_dimension_upsert_fails(
+        self, s3, failing_dimension, target_file_mb: int, strategy: str
+    ):
+        # Arrange
+        spill_dir = failing_dimension(target_file_mb)
+
+        # Act
+        with pytest.raises(HotelDimensionConflictError):
+            lambda_function.lambda_handler(
+                {**_event(), "execution_strategy": strategy}, None
+            )
+
+        # Assert: ni hechos publicados ni archivos retenidos en disco
+        check.equal(s3.list_objects_metadata(BUCKET, "processed/"), [])
+        check.equal(os.listdir(spill_dir), [])
+
+    def test_handler_should_publish_facts_after_dimension_when_output_is_split(
+        self, s3, monkeypatch: pytest.MonkeyPatch, tmp_path
+    ):
+        # Arrange
+        monkeypatch.setattr(
+            lambda_function,
+            "settings",
+            replace(
+                settings,
+                HOTEL_DIMENSION_ENABLED=True,
+                OUTPUT_TARGET_FILE_MB=1,
+                SPILL_DIR=str(tmp_path),
+            ),
+        )
+
+        # Act
+        body = json.loads(lambda_function.lambda_handler(_event(), None)["body"])
+
+        # Assert
+        facts = pd.read_parquet(
+            BytesIO(s3.get_object(BUCKET, body["clave_procesados"]))
+        )
+        dimension = HotelDimensionService(s3).read(BUCKET)
+        check.is_true(set(facts["hotel_id"]) <= set(dimension["hotel_id"]))
+
+    @pytest.mark.parametrize("target_file_mb", [0, 1])
+    def test_reducer_should_not_publish_facts_when_dimension_upsert_fails(
+        self, s3, failing_dimension, tmp_path, target_file_mb: int
+    ):
+        # Arrange
+        spill_dir = failing_dimension(target_file_mb)
+
+        # Act
+        with pytest.raises(HotelDimensionConflictError):
+            run_fanout(
+                {**_event(), "shard_target_mb": 0},
+                max_workers=2,
+                initializer=_install_s3,
+                initargs=(str(tmp_path),),
+            )
+
+        # Assert
+        check.equal(s3.list_objects_metadata(BUCKET, "processed/"), [])
+        check.equal(os.listdir(spill_dir), [])
@@ -0,0 +1,236 @@
+"""
+Tests unitarios para la dimensión de hoteles.
+"""
+
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import pytest_check as check
+
+from config import settings
+from conftest import ConditionalS3
+from processors.batch_processor import BatchProcessor, OutputLayout
+from processors.hotel_dimension import (
+    FACT_SCHEMA,
+    HotelIdCollisionError,
+    empty_dimension,
+    hotel_ids,
+    merge_dimension,
+)
+from services.hotel_dimension_service import (
+    HotelDimensionConflictError,
+    HotelDimensionService,
+)
+
+
+def _hotels(names: dict[str, str]) -> pd.DataFrame:
+    """Hoteles de un lote con los nombres dados por link_detalle."""
+    links = list(names)
+    return pd.DataFrame(
+        {
+            "hotel_id": hotel_ids(pa.array(links)).to_pylist(),
+            "link_detalle": links,
+            "nombre_hotel": list(names.values()),
+            "ubicacion": "Palermo, Buenos Aires",
+            "sub_barrio": None,
+        }
+    )
+
+
+@pytest.mark.unit
+class TestHotelIds:
+    """Tests para el cálculo de hotel_id a partir de link_detalle."""
+
+    def test_hotel_ids_should_be_stable_non_negative_and_null_for_missing_links(self):
+        # Arrange
+        links = pa.array(["https://booking.com/a", "https://booking.com/b", None])
+
+        # Act
+        first = hotel_ids(links)
+        second = hotel_ids(pa.array(links.to_pylist()))
+
+        # Assert
+        check.equal(first.to_pylist(), second.to_pylist())
+        check.is_true(all(value >= 0 for value in first.to_pylist()[:2]))
+        check.not_equal(first[0], first[1])
+        check.is_none(first[2].as_py())
+
+
+@pytest.mark.unit
+class TestMergeDimension:
+    """Tests para la combinación de hoteles de un lote con la dimensión."""
+
+    def test_merge_dimension_should_insert_new_and_update_changed_hotels(self):
+        # Arrange
+        dimension, _, _ = merge_dimension(
+            empty_dimension(), _hotels({"a": "Hotel A", "b": "Hotel B"})
+        )
+
+        # Act
+        dimension, inserted, updated = merge_dimension(
+            dimension, _hotels({"a": "Hotel A", "b": "Hotel B2", "c": "Hotel C"})
+        )
+
+        # Assert
+        check.equal((inserted, updated), (1, 1))
+        check.equal(len(dimension), 3)
+        names = dict(zip(dimension["link_detalle"], dimension["nombre_hotel"]))
+        check.equal(names, {"a": "Hotel A", "b": "Hotel B2", "c": "Hotel C"})
+
+    def test_merge_dimension_should_return_same_dimension_when_nothing_changes(self):
+        # Arrange
+        dimension, _, _ = merge_dimension(empty_dimension(), _hotels({"a": "Hotel A"}))
+
+        # Act
+        new_dimension, inserted, updated = merge_dimension(
+            dimension, _hotels({"a": "Hotel A"})
+        )
+
+        # Assert
+        check.equal((inserted, updated), (0, 0))
+        check.is_(new_dimension, dimension)
+
+    def test_merge_dimension_should_raise_when_hotel_id_belongs_to_another_link(self):
+        # Arrange
+        dimension, _, _ = merge_dimension(empty_dimension(), _hotels({"a": "Hotel A"}))
+        colliding = _hotels({"b": "Hotel B"}).assign(
+            hotel_id=dimension["hotel_id"].iloc[0]
+        )
+
+        # Act & Assert
+        with pytest.raises(HotelIdCollisionError):
+            merge_dimension(dimension, colliding)
+
+
+@pytest.mark.unit
+class TestBatchProcessorHotelDimension:
+    """Tests para la separación de hechos y dimensión en el procesador."""
+
+    def test_process_should_write_facts_and_return_hotels_when_dimension_is_enabled(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        processor = BatchProcessor(hotel_dimension=True)
+        full = BatchProcessor().process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Act
+        result = processor.process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Assert
+        facts = pq.read_table(BytesIO(result.processed))
+        check.equal(facts.schema, FACT_SCHEMA)
+        check.is_in("calificacion", facts.column_names)
+        check.equal(result.processed_stats, full.processed_stats)
+        check.equal(result.aggregates, full.aggregates)
+        check.equal(
+            sorted(result.hotels["hotel_id"].to_pylist()),
+            sorted(facts["hotel_id"].to_pylist()),
+        )
+        rejected = pq.read_table(BytesIO(result.rejected))
+        check.is_in("link_detalle", rejected.column_names)
+
+    def test_process_should_keep_barrio_as_leading_sort_key_of_facts(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        layout = OutputLayout(sort_keys=("barrio", "checkin_date"))
+        processor = BatchProcessor(layout=layout, hotel_dimension=True)
+
+        # Act
+        result = processor.process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Assert
+        parquet_file = pq.ParquetFile(BytesIO(result.processed))
+        sorting = parquet_file.metadata.row_group(0).sorting_columns
+        names = [FACT_SCHEMA.names[column.column_index] for column in sorting]
+        check.equal(names, ["barrio", "checkin_date"])
+        barrios = parquet_file.read()["barrio"].to_pylist()
+        check.equal(barrios, sorted(barrios))
+
+    def test_process_should_sort_facts_by_hotel_id_when_sort_key_is_in_dimension(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange: nombre_hotel no existe en los hechos y se ordena por hotel_id
+        layout = OutputLayout(sort_keys=("nombre_hotel", "checkin_date"))
+        processor = BatchProcessor(layout=layout, hotel_dimension=True)
+
+        # Act
+        result = processor.process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Assert
+        parquet_file = pq.ParquetFile(BytesIO(result.processed))
+        sorting = parquet_file.metadata.row_group(0).sorting_columns
+        names = [FACT_SCHEMA.names[column.column_index] for column in sorting]
+        check.equal(names, ["hotel_id", "checkin_date"])
+        ids = parquet_file.read()["hotel_id"].to_pylist()
+        check.equal(ids, sorted(ids))
+
+    def test_processor_should_raise_when_distribution_key_is_not_a_fact_column(self):
+        # Arrange
+        layout = OutputLayout(distribution_key="nombre_hotel")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            BatchProcessor(layout=layout, hotel_dimension=True)
+
+
+@pytest.mark.unit
+class TestHotelDimensionService:
+    """Tests para la actualización incremental de la dimensión en S3."""
+
+    def test_upsert_should_rewrite_only_buckets_with_changes(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = HotelDimensionService(conditional_s3)
+        names = {f"https://booking.com/{i}": f"Hotel {i}" for i in range(50)}
+        first = pa.Table.from_pandas(_hotels(names), preserve_index=False)
+        service.upsert("bucket", first, "l1")
+        conditional_s3.puts.clear()
+        changed = {**names, "https://booking.com/7": "Hotel 7 renovado"}
+
+        # Act
+        repeated = service.upsert("bucket", first, "l2")
+        update = service.upsert(
+            "bucket", pa.Table.from_pandas(_hotels(changed), preserve_index=False), "l3"
+        )
+
+        # Assert
+        check.equal((repeated.inserted, repeated.updated), (0, 0))
+        check.equal((update.inserted, update.updated), (0, 1))
+        check.equal(len(conditional_s3.puts), 1)
+        dimension = service.read("bucket")
+        check.equal(len(dimension), 50)
+        renamed = dimension.set_index("link_detalle")["nombre_hotel"]
+        check.equal(renamed["https://booking.com/7"], "Hotel 7 renovado")
+
+    def test_upsert_should_retry_when_bucket_is_modified_concurrently(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = HotelDimensionService(conditional_s3)
+        hotels = pa.Table.from_pandas(_hotels({"a": "Hotel A"}), preserve_index=False)
+        conditional_s3.conflicts_to_inject = 2
+
+        # Act
+        update = service.upsert("bucket", hotels, "l1")
+
+        # Assert
+        check.equal(update.inserted, 1)
+        check.equal(service.read("bucket")["link_detalle"].tolist(), ["a"])
+
+    def test_upsert_should_raise_when_retries_are_exhausted(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = HotelDimensionService(conditional_s3)
+        hotels = pa.Table.from_pandas(_hotels({"a": "Hotel A"}), preserve_index=False)
+        conditional_s3.conflicts_to_inject = settings.HOTEL_DIMENSION_MAX_RETRIES
+
+        # Act & Assert
+        with pytest.raises(HotelDimensionConflictError):
+            service.upsert("bucket", hotels, "l1")
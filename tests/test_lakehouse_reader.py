@@ -0,0 +1,311 @@
+"""
+Tests unitarios para el lector del lakehouse.
+"""
+
+import inspect
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import pytest_check as check
+
+from processors.batch_processor import BatchProcessor, OutputLayout
+from processors.transformations import TRANSFORMED_SCHEMA
+from services.hotel_dimension_service import HotelDimensionService
+from services.lakehouse_reader import LakehouseReader
+from services.s3_service import S3ObjectInfo
+from utils.disk_cache import DiskCache
+
+
+class RangeS3:
+    """Doble de S3Service que registra las lecturas por rango."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.range_requests = 0
+        self.listed_prefixes: list[str] = []
+
+    def list_objects_metadata(self, bucket: str, prefix: str) -> list[S3ObjectInfo]:
+        self.listed_prefixes.append(prefix)
+        return [
+            S3ObjectInfo(key=key, size=len(body), etag=f'"{hash(body)}"')
+            for key, body in self.objects.items()
+            if key.startswith(prefix)
+        ]
+
+    def get_object_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        self.range_requests += 1
+        return self.objects[key][start : start + length]
+
+    def get_object_with_etag(self, bucket: str, key: str):
+        body = self.objects.get(key)
+        return None if body is None else (body, f'"{hash(body)}"')
+
+    def put_object(self, bucket, key, body, if_match=None, if_none_match=None):
+        self.objects[key] = body
+
+
+@pytest.fixture
+def s3() -> RangeS3:
+    """Dos particiones con el mismo archivo de 100 filas en row groups de 10."""
+    df = pd.DataFrame(
+        {
+            "barrio": ["Palermo"] * 50 + ["Recoleta"] * 50,
+            "precio_por_noche": [float(i) for i in range(100)],
+        }
+    )
+    buffer = BytesIO()
+    pq.write_table(pa.Table.from_pandas(df), buffer, row_group_size=10)
+
+    fake = RangeS3()
+    fake.objects["processed/ingestion_date=2026-02-16/lote_a.parquet"] = buffer.getvalue()
+    fake.objects["processed/ingestion_date=2026-02-20/lote_b.parquet"] = buffer.getvalue()
+    return fake
+
+
+@pytest.fixture
+def reader(s3: RangeS3, tmp_path) -> LakehouseReader:
+    return LakehouseReader(s3, "bucket", cache=DiskCache(str(tmp_path), 10**7))
+
+
+@pytest.mark.unit
+class TestLakehouseReader:
+    """Tests para la lectura con poda de particiones y row groups."""
+
+    def test_read_should_list_only_partitions_within_date_range(
+        self, reader: LakehouseReader, s3: RangeS3
+    ):
+        # Act
+        result = reader.read(date(2026, 2, 15), date(2026, 2, 17))
+
+        # Assert
+        check.equal(len(result), 100)
+        check.equal(len(s3.listed_prefixes), 3)
+        check.is_not_in("processed/ingestion_date=2026-02-20/", s3.listed_prefixes)
+
+    def test_read_should_skip_row_groups_when_statistics_exclude_filters(
+        self, reader: LakehouseReader
+    ):
+        # Act
+        result = reader.read(
+            date(2026, 2, 16),
+            date(2026, 2, 16),
+            columns=["precio_por_noche"],
+            filters=[("barrio", "==", "Recoleta"), ("precio_por_noche", "<", 65.0)],
+        )
+
+        # Assert: solo los row groups [50, 60) y [60, 70) pueden cumplir
+        check.equal(list(result.columns), ["precio_por_noche"])
+        check.equal(result["precio_por_noche"].tolist(), [float(i) for i in range(50, 65)])
+        check.equal(reader.row_groups_read, 2)
+        check.equal(reader.row_groups_skipped, 8)
+
+    def test_read_should_reset_row_group_counters_on_each_call(
+        self, reader: LakehouseReader
+    ):
+        # Arrange
+        filters = [("barrio", "==", "Recoleta")]
+        reader.read(date(2026, 2, 16), date(2026, 2, 16), filters=filters)
+
+        # Act
+        reader.read(date(2026, 2, 16), date(2026, 2, 16), filters=filters)
+
+        # Assert: solo los row groups de la segunda lectura
+        check.equal(reader.row_groups_read, 5)
+        check.equal(reader.row_groups_skipped, 5)
+
+    def test_read_should_use_local_cache_when_query_is_repeated(
+        self, reader: LakehouseReader, s3: RangeS3
+    ):
+        # Arrange
+        filters = [("barrio", "in", ["Palermo"])]
+        reader.read(date(2026, 2, 16), date(2026, 2, 16), filters=filters)
+        requests_after_first_read = s3.range_requests
+
+        # Act
+        result = reader.read(date(2026, 2, 16), date(2026, 2, 16), filters=filters)
+
+        # Assert
+        check.equal(len(result), 50)
+        check.equal(s3.range_requests, requests_after_first_read)
+
+    def test_read_should_raise_when_operator_is_unknown(self, reader: LakehouseReader):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            reader.read(date(2026, 2, 16), date(2026, 2, 16), filters=[("x", "~", 1)])
+
+    def test_read_should_cache_whole_column_chunks_when_reads_are_partial(
+        self, tmp_path
+    ):
+        # Arrange: archivo mayor que el bloque del footer, con dos columnas
+        table = pa.table(
+            {
+                "barrio": [f"barrio-{i // 1000:03d}" for i in range(50_000)],
+                "precio_por_noche": [float(i * 7919 % 50_000) for i in range(50_000)],
+            }
+        )
+        buffer = BytesIO()
+        pq.write_table(table, buffer, row_group_size=10_000)
+        s3 = RangeS3()
+        s3.objects["processed/ingestion_date=2026-02-16/lote.parquet"] = (
+            buffer.getvalue()
+        )
+        cache_dir = tmp_path / "cache"
+        reader = LakehouseReader(s3, "bucket", cache=DiskCache(str(cache_dir), 10**8))
+        reader.read(date(2026, 2, 16), date(2026, 2, 16), columns=["barrio"])
+        requests_after_first_read = s3.range_requests
+
+        # Act: otra proyección y luego una lectura ya cubierta por la caché
+        reader.read(date(2026, 2, 16), date(2026, 2, 16))
+        requests_after_second_read = s3.range_requests
+        reader.read(date(2026, 2, 16), date(2026, 2, 16), columns=["precio_por_noche"])
+
+        # Assert: una entrada por column chunk, más el footer
+        metadata = pq.ParquetFile(BytesIO(buffer.getvalue())).metadata
+        chunks = metadata.num_row_groups * metadata.num_columns
+        check.less_equal(len(list(cache_dir.iterdir())), chunks + 1)
+        check.less_equal(
+            requests_after_second_read - requests_after_first_read,
+            metadata.num_row_groups,
+        )
+        check.equal(s3.range_requests, requests_after_second_read)
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(
+    "bloom_filter_options" not in inspect.signature(pq.write_table).parameters,
+    reason="La versión de pyarrow no escribe bloom filters.",
+)
+class TestBloomFilterPushdown:
+    """Tests para el descarte de row groups mediante bloom filters."""
+
+    def test_read_should_skip_row_groups_when_bloom_filter_excludes_value(
+        self, tmp_path
+    ):
+        # Arrange: valores intercalados, por lo que mínimo/máximo no descartan
+        links = [f"link-{i % 10:02d}-{i // 10:02d}" for i in range(100)]
+        buffer = BytesIO()
+        pq.write_table(
+            pa.table({"link_detalle": links}),
+            buffer,
+            row_group_size=10,
+            bloom_filter_options={"link_detalle": {"ndv": 10, "fpp": 0.01}},
+        )
+        s3 = RangeS3()
+        s3.objects["processed/ingestion_date=2026-02-16/lote.parquet"] = (
+            buffer.getvalue()
+        )
+        reader = LakehouseReader(s3, "bucket", cache=DiskCache(str(tmp_path), 10**7))
+
+        # Act
+        result = reader.read(
+            date(2026, 2, 16),
+            date(2026, 2, 16),
+            filters=[("link_detalle", "==", "link-03-04")],
+        )
+
+        # Assert
+        check.equal(result["link_detalle"].tolist(), ["link-03-04"])
+        check.equal(reader.row_groups_read, 1)
+        check.equal(reader.bloom_filter_skips, 9)
+
+
+@pytest.fixture
+def mixed_s3(raw_hotel_df_multiple: list[pd.DataFrame]) -> RangeS3:
+    """Partición con un lote completo y otro de hechos, más la dimensión."""
+    full = BatchProcessor().process(raw_hotel_df_multiple, date(2026, 2, 16))
+    facts = BatchProcessor(hotel_dimension=True).process(
+        raw_hotel_df_multiple, date(2026, 2, 16)
+    )
+    fake = RangeS3()
+    fake.objects["processed/ingestion_date=2026-02-16/lote_a.parquet"] = full.processed
+    fake.objects["processed/ingestion_date=2026-02-16/lote_b.parquet"] = (
+        facts.processed
+    )
+    HotelDimensionService(fake).upsert("bucket", facts.hotels, "lote_b")
+    return fake
+
+
+@pytest.mark.unit
+class TestFactFiles:
+    """Tests para la lectura de hechos de la dimensión de hoteles."""
+
+    def test_read_should_join_dimension_when_partition_mixes_schemas(
+        self, mixed_s3: RangeS3, tmp_path
+    ):
+        # Arrange
+        reader = LakehouseReader(
+            mixed_s3, "bucket", cache=DiskCache(str(tmp_path), 10**7)
+        )
+
+        # Act
+        result = reader.read(date(2026, 2, 16), date(2026, 2, 16))
+
+        # Assert: las filas del lote de hechos son iguales a las del completo
+        check.equal(list(result.columns), TRANSFORMED_SCHEMA.names)
+        half = len(result) // 2
+        full, facts = result.iloc[:half], result.iloc[half:]
+        pd.testing.assert_frame_equal(
+            facts.sort_values("link_detalle", ignore_index=True),
+            full.sort_values("link_detalle", ignore_index=True),
+        )
+
+    def test_read_should_filter_fact_files_by_hotel_attributes(
+        self, mixed_s3: RangeS3, tmp_path
+    ):
+        # Arrange
+        reader = LakehouseReader(
+            mixed_s3, "bucket", cache=DiskCache(str(tmp_path), 10**7)
+        )
+
+        # Act
+        result = reader.read(
+            date(2026, 2, 16),
+            date(2026, 2, 16),
+            columns=["barrio", "precio_final"],
+            filters=[("nombre_hotel", "==", "Hotel B")],
+        )
+
+        # Assert: la misma fila de cada lote
+        check.equal(list(result.columns), ["barrio", "precio_final"])
+        check.equal(len(result), 2)
+        check.equal(result["barrio"].tolist(), ["Recoleta", "Recoleta"])
+
+    def test_read_should_skip_fact_row_groups_when_barrio_is_filtered(
+        self, raw_hotel_row: dict, tmp_path
+    ):
+        # Arrange: hechos agrupados por barrio en row groups de 10 filas
+        barrios = ["Belgrano", "Palermo", "Recoleta", "San Telmo", "Retiro"]
+        raw = pd.DataFrame(
+            [
+                {
+                    **raw_hotel_row,
+                    "ubicacion": f"{barrios[i % 5]}, Buenos Aires",
+                    "link_detalle": f"https://www.booking.com/hotel/ar/{i}.html",
+                }
+                for i in range(50)
+            ]
+        )
+        layout = OutputLayout(sort_keys=("barrio", "checkin_date"), row_group_rows=10)
+        result = BatchProcessor(layout=layout, hotel_dimension=True).process(
+            [raw], date(2026, 2, 16)
+        )
+        s3 = RangeS3()
+        s3.objects["processed/ingestion_date=2026-02-16/lote.parquet"] = (
+            result.processed
+        )
+        HotelDimensionService(s3).upsert("bucket", result.hotels, "lote")
+        reader = LakehouseReader(s3, "bucket", cache=DiskCache(str(tmp_path), 10**7))
+
+        # Act
+        table = reader.read(
+            date(2026, 2, 16), date(2026, 2, 16), filters=[("barrio", "==", "Retiro")]
+        )
+
+        # Assert
+        check.equal(len(table), 10)
+        check.equal(reader.row_groups_read, 1)
+        check.equal(reader.row_groups_skipped, 4)
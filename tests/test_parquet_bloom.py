@@ -0,0 +1,83 @@
+"""
+Tests unitarios para la consulta de bloom filters de Parquet.
+"""
+
+import inspect
+from io import BytesIO
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import pytest_check as check
+
+from utils.parquet_bloom import may_contain, read_bloom_filter, xxh64
+
+requires_bloom_filters = pytest.mark.skipif(
+    "bloom_filter_options" not in inspect.signature(pq.write_table).parameters,
+    reason="La versión de pyarrow no escribe bloom filters.",
+)
+
+
+def _bloom_filter(values: list) -> tuple[bytes, str]:
+    """Escribe un Parquet con bloom filter y devuelve su bitset y tipo físico."""
+    buffer = BytesIO()
+    pq.write_table(
+        pa.table({"valor": values}),
+        buffer,
+        bloom_filter_options={"valor": {"ndv": len(values), "fpp": 0.01}},
+    )
+    data = buffer.getvalue()
+    chunk = pq.ParquetFile(BytesIO(data)).metadata.row_group(0).column(0)
+    offset, length = chunk.bloom_filter_offset, chunk.bloom_filter_length
+    return read_bloom_filter(data[offset : offset + length]), chunk.physical_type
+
+
+@pytest.mark.unit
+class TestXxh64:
+    """Tests para el hash XXH64."""
+
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            (b"", 0xEF46DB3751D8E999),
+            (b"abc", 0x44BC2CF5AD770999),
+            (b"Nobody inspects the spammish repetition", 0xFBCEA83C8A378BF1),
+        ],
+    )
+    def test_xxh64_should_match_reference_values(self, data: bytes, expected: int):
+        # Act / Assert
+        check.equal(xxh64(data), expected)
+
+
+@pytest.mark.unit
+@requires_bloom_filters
+class TestMayContain:
+    """Tests para la evaluación de bloom filters escritos por pyarrow."""
+
+    def test_may_contain_should_accept_every_written_string(self):
+        # Arrange
+        links = [f"https://www.booking.com/hotel/ar/{i}.html" for i in range(500)]
+        bitset, physical_type = _bloom_filter(links)
+
+        # Act / Assert
+        check.is_true(all(may_contain(bitset, link, physical_type) for link in links))
+
+    def test_may_contain_should_reject_most_absent_values(self):
+        # Arrange
+        bitset, physical_type = _bloom_filter(list(range(500)))
+
+        # Act
+        false_positives = sum(
+            may_contain(bitset, value, physical_type) for value in range(500, 1500)
+        )
+
+        # Assert
+        check.equal(physical_type, "INT64")
+        check.less(false_positives, 50)
+
+    def test_may_contain_should_accept_value_when_type_is_not_supported(self):
+        # Arrange
+        bitset, physical_type = _bloom_filter(["a", "b"])
+
+        # Act / Assert
+        check.is_true(may_contain(bitset, 3.5, physical_type))
@@ -0,0 +1,274 @@
+"""
+Tests unitarios para la tabla histórica de precios.
+"""
+
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+import pytest_check as check
+
+from config import settings
+from conftest import ConditionalS3
+from processors.batch_processor import BatchProcessor
+from processors.price_history import (
+    OBSERVATION_COLUMNS,
+    empty_state,
+    merge_bucket,
+    prepare_observations,
+)
+from services.price_history_service import (
+    PriceHistoryConflictError,
+    PriceHistoryService,
+)
+from utils.partition_utils import assign_buckets
+
+FIRST_DT = datetime(2026, 2, 16, 12, 0, 0)
+SECOND_DT = datetime(2026, 2, 17, 12, 0, 0)
+THIRD_DT = datetime(2026, 2, 18, 12, 0, 0)
+
+
+def _processed(prices: dict[str, float]) -> pa.Table:
+    """Tabla de procesados con una estadía por hotel y los precios dados."""
+    return pa.Table.from_pandas(
+        pd.DataFrame(
+            {
+                "link_detalle": list(prices),
+                "checkin_date": pd.Timestamp("2026-03-01"),
+                "checkout_date": pd.Timestamp("2026-03-03"),
+                "nombre_hotel": [f"Hotel {link}" for link in prices],
+                "barrio": "Palermo",
+                "precio_final": list(prices.values()),
+                "precio_por_noche": [price / 2 for price in prices.values()],
+            }
+        )[OBSERVATION_COLUMNS],
+        preserve_index=False,
+    )
+
+
+@pytest.mark.unit
+class TestMergeBucket:
+    """Tests para la combinación de observaciones con las filas vigentes de un bucket."""
+
+    def test_merge_bucket_should_insert_current_rows_when_state_is_empty(self):
+        # Arrange
+        observations = prepare_observations(_processed({"a": 100.0}), FIRST_DT, "l1")
+
+        # Act
+        current, closed, inserted, _ = merge_bucket(empty_state(), observations)
+
+        # Assert
+        check.equal((inserted, len(closed)), (1, 0))
+        check.is_true(current["valid_to"].isna().all())
+        check.equal(current["valid_from"].iloc[0], pd.Timestamp(FIRST_DT))
+        check.equal(current["history_from"].iloc[0], pd.Timestamp(FIRST_DT))
+
+    def test_merge_bucket_should_close_current_row_when_price_changes(self):
+        # Arrange
+        current, _, _, _ = merge_bucket(
+            empty_state(),
+            prepare_observations(_processed({"a": 100.0, "b": 50.0}), FIRST_DT, "l1"),
+        )
+        observations = prepare_observations(
+            _processed({"a": 120.0, "b": 50.0}), SECOND_DT, "l2"
+        )
+
+        # Act
+        current, closed, inserted, _ = merge_bucket(current, observations)
+
+        # Assert: "a" pasa al historial con su precio anterior, "b" no cambia
+        check.equal((inserted, len(closed)), (1, 1))
+        check.equal(current["precio_final"].tolist(), [120.0, 50.0])
+        check.is_true(current["valid_to"].isna().all())
+        check.equal(closed["precio_final"].tolist(), [100.0])
+        check.equal(closed["valid_to"].iloc[0], pd.Timestamp(SECOND_DT))
+        check.equal(current["history_from"].iloc[0], pd.Timestamp(FIRST_DT))
+
+    def test_merge_bucket_should_add_closed_row_when_observation_precedes_history(
+        self,
+    ):
+        # Arrange
+        current, _, _, _ = merge_bucket(
+            empty_state(),
+            prepare_observations(_processed({"a": 100.0}), THIRD_DT, "l3"),
+        )
+        late = prepare_observations(_processed({"a": 90.0}), FIRST_DT, "l1")
+
+        # Act
+        new_current, closed, inserted, discarded = merge_bucket(current, late)
+
+        # Assert: la observación queda cerrada hasta la vigente, cuyo
+        # historial pasa a empezar en la observación
+        check.equal((inserted, discarded), (0, 0))
+        check.equal(new_current["precio_final"].tolist(), [100.0])
+        check.equal(new_current["valid_from"].iloc[0], pd.Timestamp(THIRD_DT))
+        check.equal(new_current["history_from"].iloc[0], pd.Timestamp(FIRST_DT))
+        check.equal(closed["precio_final"].tolist(), [90.0])
+        check.equal(closed["valid_from"].iloc[0], pd.Timestamp(FIRST_DT))
+        check.equal(closed["valid_to"].iloc[0], pd.Timestamp(THIRD_DT))
+
+    def test_merge_bucket_should_discard_observation_inside_closed_history(self):
+        # Arrange: "a" vale 100 desde FIRST_DT y 120 desde THIRD_DT, por lo que
+        # [FIRST_DT, THIRD_DT) ya está cerrado
+        current, _, _, _ = merge_bucket(
+            empty_state(),
+            prepare_observations(_processed({"a": 100.0}), FIRST_DT, "l1"),
+        )
+        current, _, _, _ = merge_bucket(
+            current, prepare_observations(_processed({"a": 120.0}), THIRD_DT, "l3")
+        )
+        late = prepare_observations(_processed({"a": 90.0}), SECOND_DT, "l2")
+
+        # Act
+        new_current, closed, inserted, discarded = merge_bucket(current, late)
+
+        # Assert: no se agrega un período superpuesto con [FIRST_DT, THIRD_DT)
+        check.equal((inserted, len(closed), discarded), (0, 0, 1))
+        check.is_(new_current, current)
+
+    def test_merge_bucket_should_ignore_observations_when_batch_is_reprocessed(self):
+        # Arrange
+        observations = prepare_observations(_processed({"a": 100.0}), FIRST_DT, "l1")
+        current, _, _, _ = merge_bucket(empty_state(), observations)
+        changed = prepare_observations(_processed({"a": 999.0}), FIRST_DT, "l1")
+
+        # Act
+        new_current, closed, inserted, discarded = merge_bucket(current, changed)
+
+        # Assert
+        check.equal((inserted, len(closed), discarded), (0, 0, 0))
+        check.is_(new_current, current)
+
+
+@pytest.mark.unit
+class TestAssignBuckets:
+    """Tests para la asignación de links a buckets."""
+
+    def test_assign_buckets_should_be_stable_and_within_range(self):
+        # Arrange
+        links = pd.Series([f"https://booking.com/{i}" for i in range(200)])
+
+        # Act
+        first = assign_buckets(links, 16)
+        second = assign_buckets(links.copy(), 16)
+
+        # Assert
+        check.equal(first.tolist(), second.tolist())
+        check.is_true(((first >= 0) & (first < 16)).all())
+        check.greater(len(set(first.tolist())), 8)
+
+
+@pytest.mark.unit
+class TestPriceHistoryService:
+    """Tests para la actualización incremental de la tabla histórica en S3."""
+
+    def test_upsert_should_rewrite_only_buckets_with_changes(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = PriceHistoryService(conditional_s3)
+        links = {f"https://booking.com/{i}": 100.0 for i in range(50)}
+        service.upsert("bucket", _processed(links), FIRST_DT, "l1")
+        conditional_s3.puts.clear()
+        changed_link = "https://booking.com/7"
+
+        # Act
+        update = service.upsert(
+            "bucket", _processed({**links, changed_link: 150.0}), SECOND_DT, "l2"
+        )
+
+        # Assert: se reescribe un bucket de vigentes y se agrega el archivo de cerradas
+        check.equal(update.buckets_rewritten, 1)
+        check.equal((update.inserted, update.closed), (1, 1))
+        check.equal(len(conditional_s3.puts), 2)
+        bucket_index = int(
+            assign_buckets(pd.Series([changed_link]), settings.PRICE_HISTORY_BUCKETS)[0]
+        )
+        current = service.read_current("bucket", "2026-03", bucket_index)
+        prices = current.set_index("link_detalle")["precio_final"]
+        check.equal(prices[changed_link], 150.0)
+        closed = service.read_closed("bucket", SECOND_DT, "l2")
+        check.equal(closed["link_detalle"].tolist(), [changed_link])
+        check.equal(closed["precio_final"].tolist(), [100.0])
+
+    def test_upsert_should_not_duplicate_closed_rows_when_batch_is_reprocessed(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = PriceHistoryService(conditional_s3)
+        service.upsert("bucket", _processed({"a": 100.0}), THIRD_DT, "l3")
+        late = _processed({"a": 90.0})
+        service.upsert("bucket", late, FIRST_DT, "l1")
+
+        # Act
+        service.upsert("bucket", late, FIRST_DT, "l1")
+
+        # Assert
+        closed = service.read_closed("bucket", FIRST_DT, "l1")
+        check.equal(closed["precio_final"].tolist(), [90.0])
+
+    def test_upsert_should_not_overlap_closed_history_when_observation_is_late(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange: el lote de THIRD_DT cierra el precio de FIRST_DT
+        service = PriceHistoryService(conditional_s3)
+        service.upsert("bucket", _processed({"a": 100.0}), FIRST_DT, "l1")
+        service.upsert("bucket", _processed({"a": 120.0}), THIRD_DT, "l3")
+
+        # Act
+        update = service.upsert("bucket", _processed({"a": 90.0}), SECOND_DT, "l2")
+
+        # Assert
+        check.equal((update.inserted, update.closed, update.discarded), (0, 0, 1))
+        check.is_true(service.read_closed("bucket", SECOND_DT, "l2").empty)
+        closed = service.read_closed("bucket", THIRD_DT, "l3")
+        check.equal(
+            closed[["valid_from", "valid_to"]].values.tolist(),
+            [[pd.Timestamp(FIRST_DT), pd.Timestamp(THIRD_DT)]],
+        )
+
+    def test_upsert_should_retry_when_bucket_is_modified_concurrently(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = PriceHistoryService(conditional_s3)
+        conditional_s3.conflicts_to_inject = 2
+
+        # Act
+        update = service.upsert("bucket", _processed({"a": 100.0}), FIRST_DT, "l1")
+
+        # Assert
+        check.equal(update.inserted, 1)
+        check.equal(len(conditional_s3.objects), 1)
+
+    def test_upsert_should_raise_when_retries_are_exhausted(
+        self, conditional_s3: ConditionalS3
+    ):
+        # Arrange
+        service = PriceHistoryService(conditional_s3)
+        conditional_s3.conflicts_to_inject = settings.PRICE_HISTORY_MAX_RETRIES
+
+        # Act & Assert
+        with pytest.raises(PriceHistoryConflictError):
+            service.upsert("bucket", _processed({"a": 100.0}), FIRST_DT, "l1")
+
+
+@pytest.mark.unit
+class TestBatchProcessorObservations:
+    """Tests para las observaciones de precios que devuelve el procesador."""
+
+    def test_process_should_return_observations_when_price_history_is_enabled(
+        self, raw_hotel_df_multiple: list[pd.DataFrame]
+    ):
+        # Arrange
+        processor = BatchProcessor(price_history=True, hotel_dimension=True)
+
+        # Act
+        result = processor.process(raw_hotel_df_multiple, date(2026, 2, 16))
+        without = BatchProcessor().process(raw_hotel_df_multiple, date(2026, 2, 16))
+
+        # Assert
+        check.equal(result.observations.column_names, OBSERVATION_COLUMNS)
+        check.equal(result.observations.num_rows, result.processed_stats.rows)
+        check.is_none(without.observations)
@@ -0,0 +1,86 @@
+"""
+Tests unitarios para el perfilado bajo demanda.
+"""
+
+import marshal
+import tracemalloc
+
+import pytest
+import pytest_check as check
+
+from processors.batch_processor import BatchProcessor
+from utils.profiling import NULL_PROFILER, Profiler, build_profiler
+
+
+@pytest.mark.unit
+class TestBuildProfiler:
+    """Tests para la construcción del perfilador de una invocación."""
+
+    def test_build_profiler_should_return_null_profiler_when_disabled(self):
+        # Act
+        profiler = build_profiler({"profiling": False})
+
+        # Assert
+        check.is_(profiler, NULL_PROFILER)
+        check.is_false(profiler.enabled)
+        check.equal(profiler.render(), {})
+
+    def test_build_profiler_should_use_stages_from_event(self):
+        # Act
+        profiler = build_profiler({"profiling": {"stages": ["process_batch"]}})
+
+        # Assert
+        check.is_true(profiler.enabled)
+        check.equal(profiler.stages, frozenset({"process_batch"}))
+
+
+@pytest.mark.unit
+class TestProfiler:
+    """Tests para la medición de etapas con cProfile y tracemalloc."""
+
+    def test_stage_should_not_measure_stages_not_requested(self):
+        # Arrange
+        profiler = Profiler(["invocation"])
+
+        # Act
+        with profiler.stage("process_batch"):
+            sum(range(100))
+
+        # Assert
+        check.equal(profiler.render(), {})
+
+    def test_render_should_include_cpu_and_memory_reports(self):
+        # Arrange
+        profiler = Profiler(["invocation"])
+
+        # Act
+        with profiler.stage("invocation"):
+            data = [str(i) for i in range(10_000)]
+        reports = profiler.render()
+
+        # Assert
+        check.equal(
+            set(reports),
+            {"invocation.prof", "invocation_cpu.txt", "invocation_memoria.txt"},
+        )
+        check.is_instance(marshal.loads(reports["invocation.prof"]), dict)
+        check.is_in(b"KiB", reports["invocation_memoria.txt"])
+        check.is_false(tracemalloc.is_tracing())
+        check.equal(len(data), 10_000)
+
+    def test_nested_stage_should_be_measured_without_cpu_profile(
+        self, raw_hotel_df_multiple
+    ):
+        # Arrange
+        profiler = Profiler(["invocation", "apply_transformations"])
+        processor = BatchProcessor(profiler=profiler)
+
+        # Act
+        with profiler.stage("invocation"):
+            processor.process_batch(raw_hotel_df_multiple)
+        reports = profiler.render()
+
+        # Assert
+        check.is_in("invocation.prof", reports)
+        check.is_in("apply_transformations_memoria.txt", reports)
+        check.is_not_in("apply_transformations.prof", reports)
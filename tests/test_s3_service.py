@@ -0,0 +1,196 @@
+"""
+Tests unitarios para la caché de lectura del servicio de S3.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+from io import BytesIO
+
+import pytest
+import pytest_check as check
+from botocore.exceptions import ClientError
+
+from services.s3_service import S3Service
+from utils.disk_cache import DiskCache
+
+
+class FakeS3Client:
+    """Doble del cliente boto3 de S3 que responde GETs condicionales."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.requests: list[dict] = []
+
+    def etag(self, key: str) -> str:
+        return f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
+
+    def get_object(self, Bucket: str, Key: str, IfNoneMatch: str | None = None):
+        self.requests.append({"Key": Key, "IfNoneMatch": IfNoneMatch})
+        if IfNoneMatch == self.etag(Key):
+            raise ClientError({"Error": {"Code": "304"}}, "GetObject")
+        body = self.objects[Key]
+        return {
+            "Body": BytesIO(body),
+            "ContentLength": len(body),
+            "ETag": self.etag(Key),
+        }
+
+
+@pytest.fixture
+def client() -> FakeS3Client:
+    fake = FakeS3Client()
+    fake.objects["raw/ingestion_20260216_120000/a.csv"] = b"a,b\n1,2\n"
+    return fake
+
+
+@pytest.fixture
+def service(client: FakeS3Client, tmp_path) -> S3Service:
+    s3 = S3Service(cache=DiskCache(str(tmp_path), max_bytes=10**6))
+    s3._client = client
+    return s3
+
+
+@pytest.mark.unit
+class TestS3ServiceCache:
+    """Tests para la caché read-through de get_object."""
+
+    def test_get_object_should_revalidate_with_etag_when_object_is_cached(
+        self, service: S3Service, client: FakeS3Client
+    ):
+        # Arrange
+        key = "raw/ingestion_20260216_120000/a.csv"
+        service.get_object("bucket", key)
+
+        # Act
+        content = service.get_object("bucket", key)
+
+        # Assert: la segunda lectura es un GET condicional respondido con 304
+        check.equal(content, b"a,b\n1,2\n")
+        check.equal(client.requests[1]["IfNoneMatch"], client.etag(key))
+        check.equal((service.cache_hits, service.cache_misses), (1, 1))
+
+    def test_get_object_should_download_again_when_object_changed(
+        self, service: S3Service, client: FakeS3Client
+    ):
+        # Arrange
+        key = "raw/ingestion_20260216_120000/a.csv"
+        service.get_object("bucket", key)
+        client.objects[key] = b"a,b\n3,4\n"
+
+        # Act
+        content = service.get_object("bucket", key)
+
+        # Assert
+        check.equal(content, b"a,b\n3,4\n")
+        check.equal((service.cache_hits, service.cache_misses), (0, 2))
+
+    def test_get_object_stream_should_skip_request_when_listing_etag_is_cached(
+        self, service: S3Service, client: FakeS3Client
+    ):
+        # Arrange
+        key = "raw/ingestion_20260216_120000/a.csv"
+        service.get_object("bucket", key)
+
+        # Act
+        stream, size = service.get_object_stream("bucket", key, etag=client.etag(key))
+        with stream:
+            content = stream.read()
+
+        # Assert: no se realizan nuevas solicitudes a S3
+        check.equal(content, b"a,b\n1,2\n")
+        check.equal(size, len(content))
+        check.equal(len(client.requests), 1)
+
+    def test_get_object_stream_should_cache_object_only_when_read_to_the_end(
+        self, service: S3Service, client: FakeS3Client, tmp_path
+    ):
+        # Arrange
+        key = "raw/ingestion_20260216_120000/a.csv"
+        stream, _ = service.get_object_stream("bucket", key)
+        with stream:
+            stream.read(3)
+
+        # Act: la segunda lectura se consume completa
+        stream, _ = service.get_object_stream("bucket", key)
+        with stream:
+            first = stream.read(3)
+            copying = any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+            rest = stream.read()
+
+        # Assert: el contenido se copia a medida que se lee, y la primera
+        # lectura, incompleta, no dejó entrada ni archivos temporales
+        check.equal(first + rest, b"a,b\n1,2\n")
+        check.is_true(copying)
+        check.equal(service.get_object("bucket", key), b"a,b\n1,2\n")
+        check.equal(service.cache_hits, 1)
+        check.is_false(any(name.endswith(".tmp") for name in os.listdir(tmp_path)))
+
+    def test_get_object_stream_should_not_cache_when_object_exceeds_max_bytes(
+        self, client: FakeS3Client, tmp_path
+    ):
+        # Arrange
+        key = "raw/ingestion_20260216_120000/a.csv"
+        service = S3Service(cache=DiskCache(str(tmp_path), max_bytes=4))
+        service._client = client
+
+        # Act
+        stream, size = service.get_object_stream("bucket", key)
+
+        # Assert: se devuelve el cuerpo de S3, sin escribirlo a disco
+        check.equal(size, len(client.objects[key]))
+        check.equal(os.listdir(tmp_path), [])
+        check.equal(stream.read(), client.objects[key])
+
+
+@pytest.mark.unit
+class TestDiskCache:
+    """Tests para la política de desalojo de la caché en disco."""
+
+    def test_put_should_evict_least_recently_used_when_size_is_exceeded(
+        self, tmp_path
+    ):
+        # Arrange
+        cache = DiskCache(str(tmp_path), max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+
+        # Act
+        cache.put("c", b"1234")
+
+        # Assert: "b" es la entrada menos usada
+        check.is_not_none(cache.get("a"))
+        check.is_none(cache.get("b"))
+        check.is_not_none(cache.get("c"))
+        check.less_equal(cache.total_bytes, 10)
+
+    def test_cache_should_reload_entries_when_directory_is_reused(self, tmp_path):
+        # Arrange: simula un nuevo proceso en un contenedor "caliente"
+        DiskCache(str(tmp_path), max_bytes=100).put("a", b"1234")
+
+        # Act
+        cache = DiskCache(str(tmp_path), max_bytes=100)
+
+        # Assert
+        assert cache.get("a") == b"1234"
+
+    def test_cache_should_remove_only_temporary_files_of_finished_processes(
+        self, tmp_path
+    ):
+        # Arrange: un temporal de un proceso terminado y otro de uno vivo
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        stale = tmp_path / f"{finished.pid}-abc.tmp"
+        in_progress = tmp_path / f"{os.getppid()}-def.tmp"
+        stale.write_bytes(b"12")
+        in_progress.write_bytes(b"34")
+
+        # Act
+        cache = DiskCache(str(tmp_path), max_bytes=100)
+
+        # Assert
+        check.is_false(stale.exists())
+        check.is_true(in_progress.exists())
+        check.equal(cache.total_bytes, 0)
@@ -6,7 +6,11 @@ import pandas as pd
 import pytest
 import pytest_check as check
 
-from processors.transformations import apply_transformations
+from processors.transformations import (
+    TRANSFORMED_SCHEMA,
+    apply_transformations,
+    to_arrow_table,
+)
 
 
 @pytest.mark.unit
@@ -223,3 +227,30 @@ class TestApplyTransformations:
         # Assert
         for col in expected_new_columns:
             check.is_in(col, result.columns)
+
+
+@pytest.mark.unit
+class TestToArrowTable:
+    """Tests para la conversión al esquema transformado."""
+
+    def test_to_arrow_table_should_drop_columns_outside_schema(
+        self, raw_hotel_df: pd.DataFrame
+    ):
+        # Arrange
+        df = apply_transformations(raw_hotel_df.assign(columna_extra="x"))
+
+        # Act
+        table = to_arrow_table(df)
+
+        # Assert
+        check.equal(table.schema, TRANSFORMED_SCHEMA)
+
+    def test_to_arrow_table_should_raise_when_schema_column_is_missing(
+        self, raw_hotel_df: pd.DataFrame
+    ):
+        # Arrange
+        df = apply_transformations(raw_hotel_df).drop(columns=["nombre_hotel"])
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="nombre_hotel"):
+            to_arrow_table(df)